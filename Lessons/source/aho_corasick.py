@@ -0,0 +1,159 @@
+#!python
+
+from functools import lru_cache
+
+# Most automatons kept by automaton(), the least recently used is dropped
+AUTOMATON_CACHE_SIZE = 32
+
+
+def _fold_case(text):
+    """Return text lowercased, or unchanged where lowercasing would change
+    its length (like 'İ'), so indexes into the result match indexes into
+    text."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(char.lower() if len(char.lower()) == 1 else char
+                   for char in text)
+
+
+class AhoCorasick(object):
+    """Automaton that finds every occurrence of many patterns in one pass over
+    a text. Patterns are stored in a trie; each node also has a failure link
+    to the node for the longest proper suffix of its string that is in the
+    trie, and an output link to the nearest such node that ends a pattern,
+    so a mismatch never moves backwards in the text and every match is
+    reported without looking at nodes that end no pattern."""
+
+    def __init__(self, patterns, ignore_case=False):
+        """Build the automaton for the given patterns, ignoring case when
+        matching if ignore_case is True.
+        Running time: O(m * a) for m total pattern characters, where a is the
+        number of failure links followed per character, amortized O(1).
+        Memory usage: O(m) trie nodes."""
+        self.ignore_case = ignore_case
+        self.transitions = [{}]  # Child node of each node by character
+        self.outputs = [None]  # Pattern that ends at each node, if any
+        self.patterns = []
+        for pattern in patterns:
+            if not pattern:
+                raise ValueError('patterns must not be empty')
+            key = _fold_case(pattern) if ignore_case else pattern
+            node = 0
+            for char in key:
+                child = self.transitions[node].get(char)
+                if child is None:
+                    child = len(self.transitions)
+                    self.transitions[node][char] = child
+                    self.transitions.append({})
+                    self.outputs.append(None)
+                node = child
+            if self.outputs[node] is None:
+                self.outputs[node] = pattern
+                self.patterns.append(pattern)
+        self._link()
+
+    def _link(self):
+        """Set the failure and output links of every node, breadth first so
+        the links of shorter strings are known before they're needed."""
+        transitions, outputs = self.transitions, self.outputs
+        self.failures = failures = [0] * len(transitions)
+        self.output_links = output_links = [0] * len(transitions)
+        queue = list(transitions[0].values())
+        for node in queue:  # Grows as children are added, breadth first
+            for char, child in transitions[node].items():
+                failure = failures[node]
+                while failure and char not in transitions[failure]:
+                    failure = failures[failure]
+                failure = transitions[failure].get(char, 0)
+                failures[child] = failure
+                output_links[child] = (failure if outputs[failure] is not None
+                                       else output_links[failure])
+                queue.append(child)
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def _scan(self, text, state, offset):
+        """Yield (state, (index, pattern)) for every match in text, starting
+        from the given automaton state, with indexes shifted by offset. The
+        state is yielded along with each match and (state, None) once after
+        the last character, so a caller can resume with the next chunk."""
+        transitions, failures = self.transitions, self.failures
+        outputs, output_links = self.outputs, self.output_links
+        if self.ignore_case:
+            text = _fold_case(text)
+        for index, char in enumerate(text, offset + 1):
+            while state and char not in transitions[state]:
+                state = failures[state]
+            state = transitions[state].get(char, 0)
+            node = state if outputs[state] is not None else output_links[state]
+            while node:
+                pattern = outputs[node]
+                yield state, (index - len(pattern), pattern)
+                node = output_links[node]
+        yield state, None
+
+    def search(self, text):
+        """Yield (index, pattern) for every occurrence of every pattern in
+        text, overlapping ones included, ordered by where they end (longest
+        first among those that end together).
+        Running time: O(n + k) for n characters and k matches.
+        Memory usage: O(1)."""
+        for _, match in self._scan(text, 0, 0):
+            if match is not None:
+                yield match
+
+    def find_all(self, text):
+        """Return a list of (index, pattern) for every match in text."""
+        return list(self.search(text))
+
+    def contains_any(self, text):
+        """Return True if any pattern occurs in text, stopping at the first."""
+        return next(self.search(text), None) is not None
+
+    def stream(self, chunks):
+        """Yield (index, pattern) for every match in the text made of the
+        given chunks (say, blocks read from a file), with indexes counted from
+        the start of the first chunk. Matches that span chunk boundaries are
+        found, since the automaton state carries over from chunk to chunk.
+        Running time: O(n + k) for n characters in all and k matches.
+        Memory usage: O(1) beyond the current chunk."""
+        state, offset = 0, 0
+        for chunk in chunks:
+            for state, match in self._scan(chunk, state, offset):
+                if match is not None:
+                    yield match
+            offset += len(chunk)
+
+
+@lru_cache(maxsize=AUTOMATON_CACHE_SIZE)
+def _cached_automaton(patterns, ignore_case):
+    return AhoCorasick(sorted(patterns), ignore_case)
+
+
+def automaton(patterns, ignore_case=False):
+    """Return an AhoCorasick automaton for the given patterns, reusing the
+    one built last time for the same set of patterns if it is still among the
+    AUTOMATON_CACHE_SIZE most recently used."""
+    return _cached_automaton(frozenset(patterns), ignore_case)
+
+
+def main():
+    """Read command-line arguments and find patterns in a text file."""
+    import sys
+    args = sys.argv[1:]  # Ignore script file name
+    if len(args) < 2:
+        script = sys.argv[0]
+        print('Usage: {} file pattern [pattern ...]'.format(script))
+        print('Prints the offset of every occurrence of every pattern in file')
+        print("\nExample: {} strings.py pattern text".format(script))
+        return
+    with open(args[0]) as text_file:
+        chunks = iter(lambda: text_file.read(2**16), '')
+        for index, pattern in automaton(args[1:]).stream(chunks):
+            print('{}\t{}'.format(index, pattern))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!python
+
+from aho_corasick import AhoCorasick, automaton
+import random
+import unittest
+
+
+def brute_force_matches(text, patterns):
+    """Return the set of (index, pattern) for every occurrence in text."""
+    return set((index, pattern) for pattern in patterns
+               for index in range(len(text) - len(pattern) + 1)
+               if text.startswith(pattern, index))
+
+
+class AhoCorasickTest(unittest.TestCase):
+
+    def test_search(self):
+        matcher = AhoCorasick(['he', 'she', 'his', 'hers'])
+        assert len(matcher) == 4
+        assert matcher.find_all('ushers') == [(1, 'she'), (2, 'he'),
+                                              (2, 'hers')]
+        assert matcher.find_all('') == []
+        assert matcher.find_all('xyz') == []
+
+    def test_overlapping_and_nested_patterns(self):
+        matcher = AhoCorasick(['a', 'aa', 'aaa'])
+        assert sorted(matcher.find_all('aaaa')) == sorted([
+            (0, 'a'), (1, 'a'), (2, 'a'), (3, 'a'),
+            (0, 'aa'), (1, 'aa'), (2, 'aa'), (0, 'aaa'), (1, 'aaa')])
+
+    def test_matches_brute_force(self):
+        rng = random.Random(1512)
+        for _ in range(50):
+            patterns = set(''.join(rng.choice('abc')
+                                   for _ in range(rng.randint(1, 5)))
+                           for _ in range(rng.randint(1, 20)))
+            text = ''.join(rng.choice('abcd') for _ in range(200))
+            matches = AhoCorasick(patterns).find_all(text)
+            assert len(matches) == len(set(matches))
+            assert set(matches) == brute_force_matches(text, patterns)
+            # Ordered by where the matches end
+            ends = [index + len(pattern) for index, pattern in matches]
+            assert ends == sorted(ends)
+
+    def test_duplicate_and_empty_patterns(self):
+        assert len(AhoCorasick(['lox', 'lox', 'bagel'])) == 2
+        assert AhoCorasick(['lox', 'lox']).find_all('lox') == [(0, 'lox')]
+        with self.assertRaises(ValueError):
+            AhoCorasick(['lox', ''])
+
+    def test_contains_any(self):
+        matcher = AhoCorasick(['cream', 'cheese'])
+        assert matcher.contains_any('bagel with cream cheese')
+        assert not matcher.contains_any('bagel with lox')
+
+    def test_ignore_case(self):
+        matcher = AhoCorasick(['Lox', 'BAGEL'], ignore_case=True)
+        assert matcher.find_all('bagel & LOX') == [(0, 'BAGEL'), (8, 'Lox')]
+        # Lowercasing 'İ' gives two characters, indexes must still line up
+        assert matcher.find_all('İ lox') == [(2, 'Lox')]
+
+    def test_stream(self):
+        patterns = ['abra', 'cad', 'bra c', 'a']
+        text = 'abra cadabra abracadabra ' * 20
+        matcher = AhoCorasick(patterns)
+        expected = matcher.find_all(text)
+        for size in [1, 2, 3, 7, 100, len(text)]:
+            chunks = [text[start:start + size]
+                      for start in range(0, len(text), size)]
+            assert list(matcher.stream(chunks)) == expected
+        assert list(matcher.stream([])) == []
+
+    def test_automaton_cache(self):
+        first = automaton(['lox', 'bagel', 'cream'])
+        assert automaton(('cream', 'lox', 'bagel', 'lox')) is first
+        assert automaton(['lox', 'bagel']) is not first
+        assert automaton(['lox', 'bagel', 'cream'], ignore_case=True) \
+            is not first
+
+
+if __name__ == '__main__':
+    unittest.main()
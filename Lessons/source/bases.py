@@ -1,78 +1,521 @@
 #!python
 
 import string
-from math import floor, log
+from fractions import Fraction
+from functools import lru_cache
+try:
+	import numpy
+except ImportError:  # NumPy is optional, only used by encode_array
+	numpy = None
 
 # A string of '01234...vwxyz'
 int_to_string = string.digits + string.ascii_lowercase
 
+# Digits of bases up to 64: '0123...xyzABC...XYZ_~', the first 62 are base62.
+# The last two are URL-safe and leave '-', '+' and '.' free for signs and points.
+alphabet64 = int_to_string + string.ascii_uppercase + '_~'
+
 # A dictionary of { '0': 0, '1': 1, ....., 'y': 34, 'z': 35 }
 string_to_int = { s: i for i, s in enumerate(int_to_string) }
 
+# Translation table from each byte of ASCII digits to its value, either case,
+# 255 for bytes that are not digits in any base
+digit_values = bytes(string_to_int.get(chr(byte).lower(), 255) for byte in range(256))
+
+# Numbers with more digits than this are split in halves and converted by
+# divide and conquer, which needs fewer big-number operations in all
+DIVIDE_AND_CONQUER_DIGITS = 300
+
+# Divisors longer than this many bits are divided by multiplying with their
+# reciprocal, found by Newton's method, which is faster than long division
+# from here on since multiplication is subquadratic: for a 2**16-bit divisor
+# 5ms instead of 9ms, for 2**20 bits 0.4s instead of 2.3s, and encoding a
+# 2**22-bit number in base 10 takes 10s instead of 18s
+NEWTON_DIVISION_BITS = 2**14
+
+# Digits after the point when encoding fractional numbers, unless given
+FRACTION_DIGITS = 16
+
+
+@lru_cache(maxsize=None)
+def _power(base: int, exponent: int) -> int:
+	""" Return base**exponent, cached since divide and conquer uses the same
+	few powers (exponents are powers of two) over and over. """
+	return base**exponent
+
+
+def _reciprocal(divisor: int) -> int:
+	""" Return 2**(2*n) // divisor for the n-bit divisor. Its top half bits
+	give the reciprocal to half the precision, recursively, which one step of
+	Newton's method doubles, leaving it off by a few, which are corrected.
+	Running time: O(M(n)) for M(n) the time to multiply n-bit numbers, as the
+	precision halves at each step down.
+	Memory usage: O(n) """
+	bits = divisor.bit_length()
+	if bits <= NEWTON_DIVISION_BITS:
+		return (1 << 2 * bits) // divisor
+	half = bits // 2 + 1
+	reciprocal = _reciprocal(divisor >> (bits - half)) << (bits - half)
+	reciprocal += reciprocal * ((1 << 2 * bits) - divisor * reciprocal) >> 2 * bits
+	remainder = (1 << 2 * bits) - divisor * reciprocal
+	while remainder < 0:
+		reciprocal -= 1
+		remainder += divisor
+	while remainder >= divisor:
+		reciprocal += 1
+		remainder -= divisor
+	return reciprocal
+
 
-def decode(digits: str, base: int) -> int:													# EXAMPLE:
+@lru_cache(maxsize=None)
+def _power_reciprocal(base: int, exponent: int) -> int:
+	""" Return _reciprocal(base**exponent), cached like _power. """
+	return _reciprocal(_power(base, exponent))
+
+
+def _divmod_power(number: int, base: int, exponent: int) -> tuple:
+	""" Return divmod(number, base**exponent) for number below the square of
+	base**exponent, by multiplying with its cached reciprocal (Barrett
+	reduction), which gives the quotient or up to 2 less. Divisors up to
+	NEWTON_DIVISION_BITS long are faster to divide by long division.
+	Running time: O(M(n)) for n-bit numbers, O(n^2) below NEWTON_DIVISION_BITS
+	Memory usage: O(n) """
+	divisor = _power(base, exponent)
+	bits = divisor.bit_length()
+	if bits <= NEWTON_DIVISION_BITS:
+		return divmod(number, divisor)
+	quotient = number * _power_reciprocal(base, exponent) >> 2 * bits
+	remainder = number - quotient * divisor
+	while remainder >= divisor:
+		quotient += 1
+		remainder -= divisor
+	return quotient, remainder
+
+
+@lru_cache(maxsize=None)
+def _digit_pairs(base: int, alphabet: str = int_to_string) -> list:
+	""" Return a table of the two digits of every number below base**2. """
+	return [alphabet[pair // base] + alphabet[pair % base] for pair in range(base * base)]
+
+
+def decode(digits: str, base: int) -> int:													# EXAMPLE (Horner's method):
 	""" Decode given digits in given base to number in base 10. """		#			digits = '1100', base = 2
-																																		#				
-	assert 2 <= base <= 36, 'base is out of range: {}'.format(base)		#	   index | digit | string_to_int[digit] | base**index | output
-																																		# 1)   0   |  '0'  |          0           |   2^0 = 1   |   0        
-	digits = digits.lower() # Ensure there are no capital letters     # 2)   1   |  '0'  |          0           |   2^1 = 2   |   0
-	output = 0 						 	# Initialize output integer as zero       # 3)   2   |  '1'  |          1           |   2^2 = 4   |   4
-																																		# 4)   3   |  '1'  |          1           |   2^3 = 8   |   12
-	for index, digit in enumerate(reversed(digits)):
-		output += string_to_int[digit] * (base**index)
+																																		#
+	assert 2 <= base <= 64, 'base is out of range: {}'.format(base)		#	   digit | value | output * base + value = output
+																																		# 1)  '1'  |   1   |      0 * 2 + 1       =   1
+	try:																															# 2)  '1'  |   1   |      1 * 2 + 1       =   3
+		values = digits.encode('ascii').translate(digit_values)					# 3)  '0'  |   0   |      3 * 2 + 0       =   6
+	except UnicodeEncodeError:																				# 4)  '0'  |   0   |      6 * 2 + 0       =   12
+		values = b'\xff'
+	if base > 36 or (values and max(values) >= base):
+		# Signs, points, bigger bases or invalid digits, which raise ValueError
+		return codec(base).decode(digits)
+
+	return _decode_values(values, base)
+
+
+def _decode_values(values: bytes, base: int) -> int:
+	""" Decode a bytes string of digit values in given base.
+	Running time: O(n^2) for n digits with Horner's method, which multiplies
+	the number so far by base once per digit; O(M(n) log n) by divide and
+	conquer, for M(n) the time to multiply n-digit numbers.
+	Memory usage: O(n) """
+	if len(values) > DIVIDE_AND_CONQUER_DIGITS:
+		# Split off the low digits, a power of two of them so powers repeat
+		low_length = 1 << ((len(values) - 1).bit_length() - 1)
+		high = _decode_values(values[:-low_length], base)
+		low = _decode_values(values[-low_length:], base)
+		return high * _power(base, low_length) + low
+
+	output = 0
+	for value in values:
+		output = output * base + value
 
 	return output
 
 
-def encode(number: int, base: int) -> str:
-	""" Encode given number in base 10 to digits in given base. """
+def encode(number: int, base: int, precision: int = None) -> str:
+	""" Encode given number in base 10 to digits in given base. Negative
+	numbers get a '-' sign, and numbers with a fractional part (floats,
+	Fractions and Decimals) get up to precision digits after the point. """
 
-	assert 2 <= base <= 36, 'base is out of range: {}'.format(base)
-	assert number >= 0, 'number is negative: {}'.format(number)
+	assert 2 <= base <= 64, 'base is out of range: {}'.format(base)
 
+	if type(number) is not int or number < 0 or base > 36:
+		return codec(base).encode(number, precision)
 	if number == 0:
 		return '0'
 
-	output = ''
-	largest_power = floor(log(number, base))
+	return _encode_digits(number, base)
 
-	# Count down from largest_power to 0
-	for i in range(largest_power, -1, -1):
 
-		if number >= base**i:
-			new_digit = number // (base**i)
-			number -= new_digit * (base**i)
-			output += int_to_string[new_digit]
+def _encode_digits(number: int, base: int, width: int = 0, alphabet: str = int_to_string) -> str:
+	""" Encode given positive number in given base, padded with zeros to
+	width digits. Small numbers are divided by base**2 repeatedly, each
+	remainder giving two digits from a lookup table; numbers with many digits
+	are split by divide and conquer around base**k for k a power of two at
+	least half their digits, with _divmod_power.
+	Running time: O(M(n) log n) for n digits, for M(n) the time to multiply
+	n-digit numbers, O(n^2) below NEWTON_DIVISION_BITS.
+	Memory usage: O(n) """
+	# At least the number of digits, at most width for the low halves
+	digits = -(-number.bit_length() // (base.bit_length() - 1))
+	if width:
+		digits = min(digits, width)
+	if digits > DIVIDE_AND_CONQUER_DIGITS:
+		# The number is below base**(2 * low_length), the square of the divisor,
+		# and at least the divisor once the estimate is no longer too high
+		low_length = 1 << ((digits - 1).bit_length() - 1)
+		while low_length > 1 and number < _power(base, low_length):
+			low_length >>= 1
+		high, low = _divmod_power(number, base, low_length)
+		return _encode_digits(high, base, max(width - low_length, 0), alphabet) + _encode_digits(low, base, low_length, alphabet)
 
-		else:
-			output += '0'
-		
-	return output
+	pairs = _digit_pairs(base, alphabet)
+	square = base * base
+	chunks = []
+
+	while number:
+		number, pair = divmod(number, square)
+		chunks.append(pairs[pair])
+
+	output = ''.join(reversed(chunks)).lstrip(alphabet[0])
+	return output.rjust(width, alphabet[0])
+
+
+class Codec(object):
+	""" Encoder and decoder for one base and alphabet of digits, with its
+	lookup tables built once, for converting many numbers. Numbers can be
+	negative, with a '-' sign, and have a fractional part after a '.',
+	unless the alphabet uses that character as a digit (like base64url).
+	Decoding ignores case if the alphabet has no letter in both cases. """
+
+	def __init__(self, base: int, alphabet: str = None, precision: int = FRACTION_DIGITS):
+		""" Build the tables for given base, whose digits are the first base
+		characters of alphabet (alphabet64 by default). precision is the most
+		digits after the point when encoding fractional numbers. """
+		if alphabet is None:
+			alphabet = alphabet64
+		alphabet = alphabet[:base]
+		if not 2 <= base <= 64:
+			raise ValueError('base is out of range: {}'.format(base))
+		if len(alphabet) < base:
+			raise ValueError('alphabet has fewer than {} digits: {!r}'.format(base, alphabet))
+		if len(set(alphabet)) < base:
+			raise ValueError('alphabet has repeated digits: {!r}'.format(alphabet))
+		if not alphabet.isascii() or not alphabet.isprintable():
+			raise ValueError('alphabet must be printable ASCII: {!r}'.format(alphabet))
+
+		self.base = base
+		self.alphabet = alphabet
+		self.precision = precision
+		# Signs and the point are those of '-', '+' and '.' that aren't digits,
+		# so the RFC 4648 base64 ('+/') and base64url ('-_') alphabets work
+		self.signs = ''.join(char for char in '-+' if char not in alphabet)
+		self.point = '' if '.' in alphabet else '.'
+		self.ignore_case = len(set(alphabet.lower())) == base
+		values = [255] * 256
+		for value, digit in enumerate(alphabet):
+			if self.ignore_case:
+				values[ord(digit.lower())] = values[ord(digit.upper())] = value
+			values[ord(digit)] = value
+		self.values = bytes(values)  # Translation table, 255 for non-digits
+		self.pairs = _digit_pairs(base, alphabet)
+
+	def __repr__(self):
+		return 'Codec({!r}, {!r})'.format(self.base, self.alphabet)
+
+	def encode(self, number, precision: int = None) -> str:
+		""" Return the digits of given number: an int, or a float, Fraction or
+		Decimal, whose fractional part is cut off (not rounded) after
+		precision digits, or the codec's precision if not given. """
+		if type(number) is int and 0 <= number and number.bit_length() <= 64:
+			# Short IDs: few enough digits for the pair table alone
+			if number == 0:
+				return self.alphabet[0]
+			pairs, square, chunks = self.pairs, self.base * self.base, []
+			while number:
+				number, pair = divmod(number, square)
+				chunks.append(pairs[pair])
+			return ''.join(reversed(chunks)).lstrip(self.alphabet[0])
+
+		sign = '-' if number < 0 else ''
+		if sign and '-' not in self.signs:
+			raise ValueError('no sign for negative numbers, alphabet has -: {!r}'.format(self.alphabet))
+		number = abs(Fraction(number)) if type(number) is not int else abs(number)
+		if type(number) is int:
+			return sign + (_encode_digits(number, self.base, 0, self.alphabet) or self.alphabet[0])
+
+		whole, remainder = divmod(number.numerator, number.denominator)
+		digits = _encode_digits(whole, self.base, 0, self.alphabet) or self.alphabet[0]
+		fraction = []
+		for _ in range(self.precision if precision is None else precision):
+			if not remainder:
+				break
+			digit, remainder = divmod(remainder * self.base, number.denominator)
+			fraction.append(self.alphabet[digit])
+		fraction = ''.join(fraction).rstrip(self.alphabet[0])
+		if fraction and not self.point:
+			raise ValueError('no point for fractional numbers, alphabet has .: {!r}'.format(self.alphabet))
+		if fraction:
+			digits += '.' + fraction
+		if digits == self.alphabet[0]:
+			sign = ''  # No negative zero
+		return sign + digits
+
+	def _values(self, digits: str) -> bytes:
+		""" Return the value of each of given digits, raising ValueError if
+		any isn't a digit of this codec. """
+		try:
+			values = digits.encode('ascii').translate(self.values)
+		except UnicodeEncodeError:
+			values = b'\xff'
+		if values and max(values) >= self.base:
+			raise ValueError('invalid digits for base {}: {!r}'.format(self.base, digits))
+		return values
+
+	def decode(self, digits: str):
+		""" Return the number given digits stand for: an int, or a Fraction
+		(exact) if they have a fractional part after a point. """
+		try:
+			values = digits.encode('ascii').translate(self.values)
+		except UnicodeEncodeError:
+			values = b'\xff'
+		if not values or max(values) < self.base:
+			return _decode_values(values, self.base)
+
+		sign = digits[:1] if digits[:1] and digits[:1] in self.signs else ''
+		body = digits[len(sign):]
+		whole, point, fraction = body.partition(self.point) if self.point else (body, '', '')
+		if not (whole or fraction):
+			raise ValueError('invalid digits for base {}: {!r}'.format(self.base, digits))
+		number = _decode_values(self._values(whole), self.base)
+		if point:
+			number += Fraction(_decode_values(self._values(fraction), self.base), _power(self.base, len(fraction)))
+		return -number if sign == '-' else number
+
+
+@lru_cache(maxsize=None)
+def codec(base: int) -> Codec:
+	""" Return the Codec for given base and the default alphabet, built once
+	and shared by every call with the same base. """
+	return Codec(base)
+
+
+# Codec for short IDs in base 62, digits 0-9, a-z and A-Z
+base62 = codec(62)
 
 
 def convert(digits: str, base1: int, base2: int) -> str:
 	""" Convert given digits in base1 to digits in base2. """
-	# Handle up to base 36 [0-9a-z]
-	assert 2 <= base1 <= 36, 'base1 is out of range: {}'.format(base1)
-	assert 2 <= base2 <= 36, 'base2 is out of range: {}'.format(base2)
-	
+	# Handle up to base 64 [0-9a-zA-Z_~]
+	assert 2 <= base1 <= 64, 'base1 is out of range: {}'.format(base1)
+	assert 2 <= base2 <= 64, 'base2 is out of range: {}'.format(base2)
+
+	if base1 > 36 or base2 > 36 or digits[:1] in ('-', '+') or '.' in digits:
+		return encode(decode(digits, base1), base2)
+	if base1 == base2:
+		# Nothing to convert, only check the digits are valid
+		if digits.lower().translate(_valid_digits(base1)):
+			raise ValueError('invalid digits for base {}: {!r}'.format(base1, digits))
+		return digits.lower().lstrip('0') or '0'
+	if base1 & (base1 - 1) == 0 and base2 & (base2 - 1) == 0:
+		return _regroup_bits(digits, base1, base2)
+
 	return encode(decode(digits, base1), base2)
 
 
+@lru_cache(maxsize=None)
+def _valid_digits(base: int) -> dict:
+	""" Return a str.translate table that deletes the digits of given base. """
+	return str.maketrans('', '', int_to_string[:base])
+
+
+@lru_cache(maxsize=None)
+def _bits_of_digits(base: int) -> dict:
+	""" Return a str.translate table from each digit of given power-of-two
+	base, either case, to its bits. """
+	width = base.bit_length() - 1
+	table = {}
+	for value, digit in enumerate(int_to_string[:base]):
+		table[ord(digit)] = table[ord(digit.upper())] = format(value, '0{}b'.format(width))
+	return table
+
+
+@lru_cache(maxsize=None)
+def _digits_of_bits(base: int) -> dict:
+	""" Return a dictionary from each group of bits to its digit in given
+	power-of-two base. """
+	width = base.bit_length() - 1
+	return { format(value, '0{}b'.format(width)): digit for value, digit in enumerate(int_to_string[:base]) }
+
+
+def _regroup_bits(digits: str, base1: int, base2: int) -> str:
+	""" Convert digits between power-of-two bases without big-number
+	arithmetic: every digit in base1 stands for a fixed group of bits, so
+	the digits are translated to one string of bits, which is cut into
+	groups for the digits of base2 from the right.
+	Running time: O(n) for n digits, string translation and table lookups.
+	Memory usage: O(n) for the string of bits. """
+	bits = digits.translate(_bits_of_digits(base1))
+	# Any character left that isn't a bit wasn't a digit of base1
+	if bits.count('0') + bits.count('1') != len(bits):
+		raise ValueError('invalid digits for base {}: {!r}'.format(base1, digits))
+	bits = bits.lstrip('0')
+	if not bits:
+		return '0'
+
+	width = base2.bit_length() - 1
+	if width == 1:
+		return bits
+	bits = bits.zfill(-(-len(bits) // width) * width)
+	table = _digits_of_bits(base2)
+	return ''.join([table[bits[start:start + width]] for start in range(0, len(bits), width)])
+
+
+def convert_many(numbers, base1: int, base2: int):
+	""" Convert each of the given digit strings in base1 to digits in base2,
+	yielding the results in order. Surrounding whitespace (like the newline
+	of a line read from a file) is ignored, and blank strings are skipped. """
+	assert 2 <= base1 <= 64, 'base1 is out of range: {}'.format(base1)
+	assert 2 <= base2 <= 64, 'base2 is out of range: {}'.format(base2)
+
+	for digits in numbers:
+		digits = digits.strip()
+		if digits:
+			yield convert(digits, base1, base2)
+
+
+def _convert_lines(lines: list, base1: int, base2: int, first_line: int = 1) -> tuple:
+	""" Convert a batch of lines, numbered from first_line, in a worker
+	process when converting with a pool. Return the results as one string of
+	lines, and a list of (line number, message) for the lines that aren't
+	valid digits. Blank lines are skipped. """
+	results, errors = [], []
+	for line_number, line in enumerate(lines, first_line):
+		digits = line.strip()
+		if not digits:
+			continue
+		try:
+			results.append(convert(digits, base1, base2) + '\n')
+		except ValueError as error:
+			errors.append((line_number, str(error)))
+	return ''.join(results), errors
+
+
+def convert_stream(input_file, output_file, base1: int, base2: int, workers: int = 1, batch_size: int = 10000, error_file=None) -> int:
+	""" Convert every number in input_file, one per line, from base1 to
+	base2 and write the results to output_file, one per line. Blank lines
+	are skipped, and each line that isn't a valid number is reported to
+	error_file (standard error by default) with its line number, without
+	stopping the conversion. Return the number of lines reported.
+	Lines are converted and written in batches of batch_size, so output is
+	buffered without holding the whole input in memory. With more than one
+	worker, batches are converted in a process pool, in order, falling back
+	to converting them here if no pool can be started. """
+	assert 2 <= base1 <= 64, 'base1 is out of range: {}'.format(base1)
+	assert 2 <= base2 <= 64, 'base2 is out of range: {}'.format(base2)
+	if error_file is None:
+		import sys
+		error_file = sys.stderr
+	from itertools import count, islice
+	batches = zip(count(1, batch_size), iter(lambda: list(islice(input_file, batch_size)), []))
+	num_errors = 0
+
+	def write(converted):
+		nonlocal num_errors
+		results, errors = converted
+		output_file.write(results)
+		for line_number, message in errors:
+			error_file.write('line {}: {}\n'.format(line_number, message))
+		num_errors += len(errors)
+
+	executor = None
+	if workers > 1:
+		from parallel_sort import process_pool_executor
+		executor = process_pool_executor()
+	if executor is None:
+		for first_line, lines in batches:
+			write(_convert_lines(lines, base1, base2, first_line))
+		return num_errors
+
+	# Keep only a few batches in flight, so memory stays bounded
+	from collections import deque
+	pending = deque()
+	with executor(workers) as pool:
+		for first_line, lines in batches:
+			pending.append(pool.submit(_convert_lines, lines, base1, base2, first_line))
+			if len(pending) > 2 * workers:
+				write(pending.popleft().result())
+		while pending:
+			write(pending.popleft().result())
+	return num_errors
+
+
+def encode_array(numbers, base: int, width: int = 0) -> list:
+	""" Encode each number in a NumPy array of non-negative fixed-width ints
+	(like int64 or uint64) to digits in given base, and return the list of
+	digit strings, padded with zeros to width digits if given. All numbers
+	are divided by base at once, one digit position of all numbers per step,
+	and digits are turned into characters by indexing a table.
+	Running time: O(n * w) vectorized steps for w digits, plus O(n) to build
+	the strings.
+	Memory usage: O(n * w) for the array of digits. """
+	assert 2 <= base <= 64, 'base is out of range: {}'.format(base)
+	if numpy is None:
+		raise ImportError('encode_array needs NumPy')
+
+	numbers = numpy.asarray(numbers)
+	if numbers.dtype.kind not in 'iu':
+		raise TypeError('encode_array needs an array of ints, not {}'.format(numbers.dtype))
+	if numbers.size and numbers.min() < 0:
+		raise ValueError('encode_array needs non-negative numbers')
+	numbers = numbers.astype(numpy.uint64).ravel()
+
+	largest = int(numbers.max()) if numbers.size else 0
+	digits = max(width, len(encode(largest, base)))
+	table = numpy.frombuffer(alphabet64.encode('ascii'), dtype=numpy.uint8)
+	characters = numpy.empty((numbers.size, digits), dtype=numpy.uint8)
+	remaining = numbers.copy()
+	for column in range(digits - 1, -1, -1):
+		characters[:, column] = table[remaining % base]
+		remaining //= base
+
+	encoded = characters.view('S{}'.format(digits)).ravel().tolist()
+	return [(number.decode('ascii').lstrip('0') or '0').rjust(width, '0') for number in encoded]
+
+
 def main():
 	"""Read command-line arguments and convert given digits between bases."""
 	import sys
 	args = sys.argv[1:]  # Ignore script file name
-	if len(args) == 3:
+	if len(args) == 3 and args[0] != '--stream':
 		digits = args[0]
 		base1 = int(args[1])
 		base2 = int(args[2])
 		# Convert given digits between bases
 		result = convert(digits, base1, base2)
 		print('{} in base {} is {} in base {}'.format(digits, base1, result, base2))
+	elif 3 <= len(args) <= 5 and args[0] == '--stream':
+		# Convert numbers line by line from a file or standard input
+		base1 = int(args[1])
+		base2 = int(args[2])
+		workers = int(args[4]) if len(args) == 5 else 1
+		output_file = open(sys.stdout.fileno(), 'w', buffering=2**20, closefd=False)
+		with output_file:
+			if len(args) >= 4 and args[3] != '-':
+				with open(args[3], buffering=2**20) as input_file:
+					num_errors = convert_stream(input_file, output_file, base1, base2, workers)
+			else:
+				num_errors = convert_stream(sys.stdin, output_file, base1, base2, workers)
+		if num_errors:
+			sys.exit(1)  # Invalid lines were reported on standard error
 	else:
 		print('Usage: {} digits base1 base2'.format(sys.argv[0]))
-		print('Converts digits from base1 to base2')
+		print('       {} --stream base1 base2 [input] [workers]'.format(sys.argv[0]))
+		print('Converts digits from base1 to base2, or with --stream every number')
+		print('in input (a file, or - or nothing for standard input), one per line,')
+		print('using a pool of worker processes if given more than one')
 
 
 if __name__ == '__main__':
@@ -1,6 +1,12 @@
 #!python
 
-from bases import decode, encode, convert
+from bases import (decode, encode, convert, convert_many, convert_stream,
+                   encode_array, Codec, codec, base62)
+from fractions import Fraction
+from pool_testing import RecordingPool
+import bases
+import io
+import random
 import unittest
 
 
@@ -265,5 +271,263 @@ class BasesConvertTest(unittest.TestCase):
         assert convert('1111101101110011', 2, 16) == 'fb73'
 
 
+class BasesLargeNumberTest(unittest.TestCase):
+
+    def test_decode_uppercase_and_invalid_digits(self):
+        assert decode('FACE', 16) == 64206
+        assert decode('', 10) == 0
+        with self.assertRaises(ValueError):
+            decode('102', 2)
+        with self.assertRaises(ValueError):
+            decode('g', 16)
+        with self.assertRaises(ValueError):
+            decode('1-1', 10)
+        with self.assertRaises(ValueError):
+            decode('١٢', 10)  # Arabic-Indic digits aren't digits here
+
+    def test_encode_large_powers(self):
+        # Floating point logarithms get the digit count wrong for these
+        assert encode(10**30, 10) == '1' + '0' * 30
+        assert encode(10**30 - 1, 10) == '9' * 30
+        assert encode(2**200, 2) == '1' + '0' * 200
+        assert encode(36**50 - 1, 36) == 'z' * 50
+
+    def test_round_trip_huge_numbers(self):
+        rng = random.Random(1512)
+        for base in [2, 3, 10, 16, 36]:
+            number = rng.getrandbits(20000)
+            digits = encode(number, base)
+            assert digits[0] != '0'
+            assert decode(digits, base) == number
+            assert decode('000' + digits, base) == number
+
+    def test_divide_and_conquer_matches_simple_conversion(self):
+        rng = random.Random(1415)
+        numbers = [rng.getrandbits(bits) for bits in range(1, 300, 7)]
+        numbers += [10**20, 2**64, 36**15]
+        threshold = bases.DIVIDE_AND_CONQUER_DIGITS
+        for base in [2, 7, 10, 36]:
+            simple = [encode(number, base) for number in numbers]
+            bases.DIVIDE_AND_CONQUER_DIGITS = 2
+            try:
+                assert [encode(number, base) for number in numbers] == simple
+                assert [decode(digits, base) for digits in simple] == numbers
+            finally:
+                bases.DIVIDE_AND_CONQUER_DIGITS = threshold
+
+    def test_newton_division_matches_long_division(self):
+        rng = random.Random(1618)
+        numbers = [rng.getrandbits(bits) for bits in range(1, 5000, 97)]
+        numbers += [10**1000, 10**1000 - 1, 7**2048, 2**4096 - 1]
+        bits = bases.NEWTON_DIVISION_BITS
+        for base in [3, 7, 10, 36]:
+            simple = [encode(number, base) for number in numbers]
+            bases.NEWTON_DIVISION_BITS = 16
+            try:
+                for _ in range(20):
+                    divisor = rng.getrandbits(rng.randint(1, 3000)) | 1
+                    reciprocal = (1 << 2 * divisor.bit_length()) // divisor
+                    assert bases._reciprocal(divisor) == reciprocal
+                assert [encode(number, base) for number in numbers] == simple
+            finally:
+                bases.NEWTON_DIVISION_BITS = bits
+
+
+class BasesFastPathTest(unittest.TestCase):
+
+    def test_convert_between_powers_of_two(self):
+        rng = random.Random(1512)
+        bases_of_two = [2, 4, 8, 16, 32]
+        for _ in range(500):
+            base1, base2 = rng.choice(bases_of_two), rng.choice(bases_of_two)
+            number = rng.getrandbits(rng.randint(0, 100))
+            digits = encode(number, base1)
+            assert convert(digits, base1, base2) == encode(number, base2)
+            assert convert('00' + digits.upper(), base1, base2) == \
+                encode(number, base2)
+        assert convert('0000', 2, 8) == '0'
+        assert convert('', 16, 2) == '0'
+        assert convert('7', 8, 32) == '7'
+        assert convert('777', 8, 16) == '1ff'
+
+    def test_convert_identical_bases(self):
+        assert convert('00FaCe', 16, 16) == 'face'
+        assert convert('000', 10, 10) == '0'
+        assert convert('z', 36, 36) == 'z'
+
+    def test_convert_invalid_digits(self):
+        for digits, base1, base2 in [('102', 2, 16), ('g', 16, 2),
+                                     ('8', 8, 8), ('1 1', 2, 4),
+                                     ('w', 32, 10), ('9', 8, 32)]:
+            with self.assertRaises(ValueError):
+                convert(digits, base1, base2)
+
+
+class BasesBatchTest(unittest.TestCase):
+
+    def test_convert_many(self):
+        numbers = ['101', '1111\n', ' 0 ', '11111111']
+        assert list(convert_many(numbers, 2, 16)) == ['5', 'f', '0', 'ff']
+        assert list(convert_many([], 2, 16)) == []
+        assert list(convert_many(['1', '\n', '', '10'], 2, 10)) == ['1', '2']
+
+    def test_convert_stream(self):
+        lines = ['{:x}\n'.format(number) for number in range(0, 5000, 7)]
+        expected = ''.join(str(number) + '\n' for number in range(0, 5000, 7))
+        for workers in [1, 2]:
+            output_file = io.StringIO()
+            # Falls back to converting serially where pools are unavailable
+            convert_stream(io.StringIO(''.join(lines)), output_file, 16, 10,
+                           workers=workers, batch_size=100)
+            assert output_file.getvalue() == expected
+        output_file = io.StringIO()
+        convert_stream(io.StringIO(''), output_file, 16, 10)
+        assert output_file.getvalue() == ''
+
+    def test_convert_stream_blank_and_invalid_lines(self):
+        lines = io.StringIO('ff\n\n10\nzz\n12\n  \n1g\n')
+        output_file, error_file = io.StringIO(), io.StringIO()
+        num_errors = convert_stream(lines, output_file, 16, 10, batch_size=2,
+                                    error_file=error_file)
+        assert num_errors == 2
+        assert output_file.getvalue() == '255\n16\n18\n'
+        errors = error_file.getvalue().splitlines()
+        assert len(errors) == 2
+        assert errors[0].startswith('line 4: ')
+        assert errors[1].startswith('line 7: ')
+
+    def test_convert_stream_in_worker_processes(self):
+        lines = io.StringIO('ff\n\n10\nzz\n12\n' * 3)
+        output_file, error_file = io.StringIO(), io.StringIO()
+        with RecordingPool() as calls:
+            num_errors = convert_stream(lines, output_file, 16, 10, workers=2,
+                                        batch_size=4, error_file=error_file)
+        # 15 lines in 4 batches, with the bad line numbers counted across them
+        assert [name for name, _ in calls] == ['_convert_lines'] * 4
+        assert [args[3] for _, args in calls] == [1, 5, 9, 13]
+        assert num_errors == 3
+        assert output_file.getvalue().split() == ['255', '16', '18'] * 3
+        assert [line.split(':')[0] for line in
+                error_file.getvalue().splitlines()] == [
+            'line 4', 'line 9', 'line 14']
+
+    @unittest.skipIf(bases.numpy is None, 'NumPy is not installed')
+    def test_encode_array(self):
+        numpy = bases.numpy
+        numbers = numpy.array([0, 1, 255, 2**63 - 1, 12345], dtype=numpy.int64)
+        assert encode_array(numbers, 16) == [
+            '0', '1', 'ff', '7fffffffffffffff', '3039']
+        assert encode_array(numbers[:3], 2, width=4) == [
+            '0000', '0001', '11111111']
+        assert encode_array(numpy.array([2**64 - 1], dtype=numpy.uint64),
+                            36) == [encode(2**64 - 1, 36)]
+        assert encode_array(numpy.array([], dtype=numpy.int64), 36) == []
+        rng = numpy.random.default_rng(1512)
+        numbers = rng.integers(0, 2**62, size=1000)
+        for base in [2, 10, 36]:
+            assert encode_array(numbers, base) == [
+                encode(int(number), base) for number in numbers]
+        with self.assertRaises(ValueError):
+            encode_array(numpy.array([-1]), 16)
+        with self.assertRaises(TypeError):
+            encode_array(numpy.array([1.5]), 16)
+        assert encode_array(numpy.array([61, 62, 3843]), 62) == [
+            'Z', '10', 'ZZ']
+
+
+class BasesExtendedTest(unittest.TestCase):
+
+    def test_negative_numbers(self):
+        assert encode(-255, 16) == '-ff'
+        assert decode('-ff', 16) == -255
+        assert decode('+ff', 16) == 255
+        assert convert('-11111111', 2, 16) == '-ff'
+        assert convert('-0', 10, 2) == '0'
+
+    def test_fractions(self):
+        assert encode(0.5, 2) == '0.1'
+        assert encode(-2.75, 2) == '-10.11'
+        assert encode(2.0, 10) == '2'
+        assert encode(0.1, 10) == '0.1'  # Cut off after 16 digits
+        assert encode(0.1, 10, precision=20) == '0.10000000000000000555'
+        assert encode(Fraction(1, 3), 3) == '0.1'
+        assert encode(Fraction(1, 3), 10, precision=5) == '0.33333'
+        assert encode(Fraction(-1, 1000), 10, precision=2) == '0'
+        assert decode('0.1', 2) == Fraction(1, 2)
+        assert decode('-10.11', 2) == -2.75
+        assert decode('.8', 16) == 0.5
+        assert decode('1.', 16) == 1
+        assert convert('10.8', 16, 2) == '10000.1'
+
+    def test_invalid_signs_and_points(self):
+        for digits in ['-', '+', '.', '-.', '1.2.3', '--1', '1-', '0x1f']:
+            with self.assertRaises(ValueError):
+                decode(digits, 16)
+
+    def test_base_62_and_64(self):
+        assert base62.encode(61) == 'Z'
+        assert base62.encode(62) == '10'
+        assert base62.decode('ZZ') == 3843
+        assert base62.decode('zz') == 2205  # Case matters above base 36
+        assert encode(2**64, 62) == base62.encode(2**64) == 'lYGhA16ahyg'
+        assert encode(63, 64) == '~'
+        assert encode(-4095, 64) == '-~~'
+        assert convert('zz', 36, 62) == 'kT'
+        rng = random.Random(1512)
+        for _ in range(200):
+            number = rng.getrandbits(rng.randint(1, 300))
+            for base in [37, 62, 64]:
+                assert decode(encode(number, base), base) == number
+
+    def test_custom_alphabet(self):
+        letters = Codec(16, 'ABCDEFGHIJKLMNOP')
+        assert letters.encode(255) == 'PP'
+        assert letters.decode('pp') == 255  # No letter in both cases
+        assert letters.decode('-P.I') == Fraction(-31, 2)
+        with self.assertRaises(ValueError):
+            letters.decode('PQ')
+        mixed = Codec(4, 'aAbB')
+        assert mixed.encode(7) == 'AB'
+        assert mixed.decode('AB') == 7
+        with self.assertRaises(ValueError):
+            mixed.decode('x')
+
+    def test_base64_alphabets(self):
+        import base64
+        letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+        standard = Codec(64, letters + '0123456789+/')
+        url = Codec(64, letters + '0123456789-_')
+        # Length divisible by 3 for no padding, first byte nonzero in its top
+        # bits for no leading zero digit
+        data = bytes(range(255, 0, -7)) * 3
+        number = int.from_bytes(data, 'big')
+        assert standard.encode(number) == base64.b64encode(data).decode()
+        assert url.encode(number) == base64.urlsafe_b64encode(data).decode()
+        for codec64 in [standard, url]:
+            for number in [0, 62, 63, 62 * 64 + 63, 2**200 + 12345]:
+                assert codec64.decode(codec64.encode(number)) == number
+        assert url.decode('-') == 62  # A digit, not a sign
+        assert url.decode('-.g') == Fraction(62 * 64 + 32, 64)
+        assert standard.decode('+') == 62
+        assert standard.decode('-B') == -1  # Not a digit, so a sign
+        with self.assertRaises(ValueError):
+            url.encode(-1)  # '-' is a digit, so negatives can't be written
+        assert Codec(11, '0123456789.').decode('1.') == 21
+        with self.assertRaises(ValueError):
+            Codec(11, '0123456789.').encode(0.5)
+
+    def test_invalid_codecs(self):
+        for base, alphabet in [(1, None), (65, None), (4, '01\n3'),
+                               (16, 'aabcdefghijklmno'), (4, '01é3'),
+                               (4, '012')]:
+            with self.assertRaises(ValueError):
+                Codec(base, alphabet)
+
+    def test_codecs_are_shared(self):
+        assert codec(62) is codec(62) is base62
+        assert codec(16).encode(255) == 'ff'
+        assert Codec(2, precision=3).encode(0.9375) == '0.111'
+
+
 if __name__ == '__main__':
     unittest.main()
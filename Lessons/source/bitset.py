@@ -0,0 +1,119 @@
+#!python
+
+
+class BitSet(object):
+    """Set of small non-negative integers stored as one bit per possible item.
+
+    The bits live in a single Python int, so the set algebra (|, &, -) runs
+    as word-level bitwise operations in C instead of one Python call per
+    element, and len() is a single popcount."""
+
+    def __init__(self, iterable=None):
+        """Initialize this bitset and add the given integers, if any."""
+        self.bits = 0
+        if iterable is not None:
+            self.update(iterable)
+
+    @classmethod
+    def _from_bits(cls, bits):
+        """Return a new bitset wrapping the given int of bits."""
+        bitset = cls()
+        bitset.bits = bits
+        return bitset
+
+    def __str__(self):
+        """Return a formatted string representation of this bitset."""
+        return '{' + ', '.join(str(item) for item in self) + '}'
+
+    def __repr__(self):
+        """Return a string representation of this bitset."""
+        return f"BitSet({self})"
+
+    def __contains__(self, item):
+        return self.contains(item)
+
+    def __len__(self):
+        return self.length()
+
+    def __eq__(self, other):
+        if isinstance(other, BitSet):
+            return self.bits == other.bits
+        return NotImplemented
+
+    def __iter__(self):
+        """Yield the items of this bitset in increasing order.
+        Running time: O(n/8 + k) for a universe of n bits holding k items,
+        empty bytes are skipped without looking at their bits."""
+        offset = 0
+        for byte in self.bits.to_bytes((self.bits.bit_length() + 7) // 8,
+                                       'little'):
+            while byte:
+                low_bit = byte & -byte
+                yield offset + low_bit.bit_length() - 1
+                byte ^= low_bit
+            offset += 8
+
+    def __or__(self, other):
+        """Returns the Union of two bitsets"""
+        return BitSet._from_bits(self.bits | other.bits)
+
+    def __and__(self, other):
+        """Returns the Intersection of two bitsets"""
+        return BitSet._from_bits(self.bits & other.bits)
+
+    def __sub__(self, other):
+        """Returns the difference between two bitsets."""
+        return BitSet._from_bits(self.bits & ~other.bits)
+
+    def __add__(self, other):
+        return self | other
+
+    @property
+    def size(self):
+        """Number of items in this bitset, kept for parity with Set.size."""
+        return self.length()
+
+    def length(self):
+        """Return the number of items in this bitset.
+        Running time: O(n/64), a single popcount over the machine words."""
+        return self.bits.bit_count()
+
+    def keys(self):
+        """Return a list of all items in this bitset in increasing order."""
+        return list(self)
+
+    def contains(self, item):
+        """Return True if this bitset contains the given item, or False.
+        Running time: O(1), shift and mask a single bit."""
+        if item < 0:
+            return False
+        return (self.bits >> item) & 1 == 1
+
+    def set(self, item):
+        """Add the given non-negative integer to this bitset.
+        Running time: O(n/64), ints are immutable so the words are copied.
+        Use update() to add many items at once."""
+        if item < 0:
+            raise ValueError('BitSet items must be non-negative: {}'.format(item))
+        self.bits |= 1 << item
+
+    def update(self, iterable):
+        """Add all of the given non-negative integers to this bitset.
+        Running time: O(k + n/8), bits are gathered in a mutable bytearray and
+        converted to an int once instead of copying the int per item."""
+        items = list(iterable)
+        if not items:
+            return
+        if min(items) < 0:
+            raise ValueError('BitSet items must be non-negative: {}'.format(
+                min(items)))
+        buffer = bytearray(max(items) // 8 + 1)
+        for item in items:
+            buffer[item >> 3] |= 1 << (item & 7)
+        self.bits |= int.from_bytes(buffer, 'little')
+
+    def delete(self, item):
+        """Remove the given item from this bitset, or raise KeyError."""
+        if not self.contains(item):
+            raise KeyError('Key not found: {}'.format(item))
+        self.bits ^= 1 << item
@@ -0,0 +1,76 @@
+from bitset import BitSet
+import unittest
+
+
+class BitSetTest(unittest.TestCase):
+
+    def test_init(self):
+        mySet = BitSet()
+
+        assert len(mySet) == 0
+        assert mySet.size == 0
+
+    def test_init_with_list_duplicates(self):
+        mySet = BitSet([3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5])
+
+        assert len(mySet) == 7
+        assert list(mySet) == [1, 2, 3, 4, 5, 6, 9]
+
+    def test_add_and_contains(self):
+        mySet = BitSet()
+
+        mySet.set(0)
+        mySet.set(1000)
+        assert len(mySet) == 2
+        assert 0 in mySet
+        assert 1000 in mySet
+        assert 999 not in mySet
+        assert -1 not in mySet
+
+    def test_add_negative(self):
+        with self.assertRaises(ValueError):
+            BitSet().set(-1)
+        with self.assertRaises(ValueError):
+            BitSet([1, -2])
+
+    def test_delete(self):
+        mySet = BitSet([10, 20])
+
+        mySet.delete(10)
+        assert len(mySet) == 1
+        assert 10 not in mySet
+
+        with self.assertRaises(KeyError):
+            mySet.delete(10)
+
+    def test_union(self):
+        union = BitSet([1, 2, 3]) | BitSet([3, 4, 500])
+
+        assert list(union) == [1, 2, 3, 4, 500]
+
+    def test_intersection(self):
+        intersection = BitSet([1, 2, 3, 500]) & BitSet([3, 4, 500])
+
+        assert list(intersection) == [3, 500]
+
+    def test_difference(self):
+        mySet = BitSet([1, 2, 3])
+        otherSet = BitSet([2, 3, 4])
+
+        assert list(mySet - otherSet) == [1]
+        assert list(otherSet - mySet) == [4]
+
+    def test_matches_builtin_set(self):
+        import random
+        items1 = [random.randint(0, 5000) for _ in range(1000)]
+        items2 = [random.randint(0, 5000) for _ in range(1000)]
+        set1, set2 = BitSet(items1), BitSet(items2)
+
+        assert list(set1 | set2) == sorted(set(items1) | set(items2))
+        assert list(set1 & set2) == sorted(set(items1) & set(items2))
+        assert list(set1 - set2) == sorted(set(items1) - set(items2))
+        assert len(set1) == len(set(items1))
+
+
+if __name__ == '__main__':
+    unittest.main()
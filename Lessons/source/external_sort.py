@@ -0,0 +1,111 @@
+#!python
+
+import heapq
+import os
+import sys
+import tempfile
+from sorting import sort
+
+# Default memory budget for the lines held while sorting a chunk
+DEFAULT_MEMORY_LIMIT = 64 * 2**20  # 64 MiB
+# Most sorted runs merged at once, each needs an open file and a read buffer
+MAX_MERGE_FAN_IN = 64
+
+
+def _read_chunks(lines, memory_limit):
+    """Yield lists of lines whose total in-memory size (as reported by
+    sys.getsizeof, so string object overhead is included) stays within
+    memory_limit. Every chunk has at least one line."""
+    chunk, chunk_size = [], 0
+    for line in lines:
+        if not line.endswith('\n'):
+            line += '\n'  # Last line of the file may have no newline
+        chunk.append(line)
+        chunk_size += sys.getsizeof(line)
+        if chunk_size >= memory_limit:
+            yield chunk
+            chunk, chunk_size = [], 0
+    if chunk:
+        yield chunk
+
+
+def _write_run(lines, temp_dir):
+    """Write lines to a new temporary file in temp_dir and return its path."""
+    descriptor, path = tempfile.mkstemp(suffix='.run', dir=temp_dir)
+    with open(descriptor, 'w') as run_file:
+        run_file.writelines(lines)
+    return path
+
+
+def _merge_runs(paths, output_file, key, reverse, buffer_size):
+    """Merge the sorted run files at paths into output_file with a heap of
+    one line per run, reading each run through a buffer of buffer_size."""
+    run_files = [open(path, buffering=buffer_size) for path in paths]
+    try:
+        output_file.writelines(heapq.merge(*run_files, key=key, reverse=reverse))
+    finally:
+        for run_file in run_files:
+            run_file.close()
+        for path in paths:
+            os.remove(path)
+
+
+def external_sort(input_path, output_path, memory_limit=DEFAULT_MEMORY_LIMIT,
+                  key=None, reverse=False, temp_dir=None):
+    """Sort the lines of the file at input_path into the file at output_path
+    using at most about memory_limit bytes for lines, however large the file.
+    Chunks that fit in memory are sorted with sorting.sort and spilled to
+    temporary run files, then the runs are merged with a k-way heap merge,
+    in several passes if there are more than MAX_MERGE_FAN_IN of them.
+    key and reverse are as for sorting.sort and are applied to whole lines,
+    newline included. The sort is stable.
+    Running time: O(n log n) comparisons, and O(n log_k r) I/O for r runs
+    merged k at a time.
+    Memory usage: O(memory_limit), independent of the input size."""
+    with tempfile.TemporaryDirectory(dir=temp_dir) as run_dir:
+        runs = []
+        with open(input_path) as input_file:
+            for chunk in _read_chunks(input_file, memory_limit):
+                sort(chunk, key=key, reverse=reverse)
+                runs.append(_write_run(chunk, run_dir))
+                del chunk  # Free the lines before reading the next chunk
+
+        # Each run file gets an equal share of the budget as a read buffer
+        buffer_size = max(2**16, memory_limit // (MAX_MERGE_FAN_IN + 1))
+        # Merge groups of runs into longer runs until one pass can finish.
+        # Runs stay in input order, so equal lines keep their order (stable).
+        while len(runs) > MAX_MERGE_FAN_IN:
+            merged_runs = []
+            for start in range(0, len(runs), MAX_MERGE_FAN_IN):
+                group = runs[start:start + MAX_MERGE_FAN_IN]
+                descriptor, path = tempfile.mkstemp(suffix='.run', dir=run_dir)
+                with open(descriptor, 'w', buffering=buffer_size) as run_file:
+                    _merge_runs(group, run_file, key, reverse, buffer_size)
+                merged_runs.append(path)
+            runs = merged_runs
+
+        with open(output_path, 'w', buffering=buffer_size) as output_file:
+            _merge_runs(runs, output_file, key, reverse, buffer_size)
+
+
+def main():
+    """Read command-line arguments and sort the lines of a file."""
+    args = sys.argv[1:]  # Ignore script file name
+    if len(args) not in (2, 3):
+        script = sys.argv[0]
+        print('Usage: {} input output [memory_mb]'.format(script))
+        print('Sorts the lines of input into output using at most about')
+        print('memory_mb megabytes of memory (default 64), however large')
+        print('\nExample: {} route-costs-10000000.txt sorted.txt 256'.format(
+            script))
+        return
+    try:
+        memory_mb = float(args[2]) if len(args) == 3 else 64
+    except ValueError:
+        print('Number required for `memory_mb` command-line argument')
+        return
+    external_sort(args[0], args[1], int(memory_mb * 2**20))
+
+
+if __name__ == '__main__':
+    main()
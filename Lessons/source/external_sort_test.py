@@ -0,0 +1,72 @@
+#!python
+
+import external_sort
+from external_sort import external_sort as sort_file
+from sorting import random_ints
+import os
+import tempfile
+import unittest
+
+
+class ExternalSortTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.temp_dir.name, 'input.txt')
+        self.output_path = os.path.join(self.temp_dir.name, 'output.txt')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_input(self, lines):
+        with open(self.input_path, 'w') as input_file:
+            input_file.write('\n'.join(lines))  # No newline after last line
+
+    def read_output(self):
+        with open(self.output_path) as output_file:
+            return output_file.read().split('\n')[:-1]
+
+    def test_sort_in_memory(self):
+        self.write_input(['+1512', '+1415', '+44', '+1'])
+        sort_file(self.input_path, self.output_path)
+        assert self.read_output() == ['+1', '+1415', '+1512', '+44']
+
+    def test_sort_empty_file(self):
+        self.write_input([])
+        sort_file(self.input_path, self.output_path)
+        assert self.read_output() == []
+
+    def test_sort_many_runs(self):
+        lines = ['+{},0.0{}'.format(number, number % 10)
+                 for number in random_ints(3000, 10**10, 10**11)]
+        self.write_input(lines)
+        # About 60 bytes per line in memory, so roughly 30 lines per run
+        sort_file(self.input_path, self.output_path, memory_limit=2000)
+        assert self.read_output() == sorted(lines)
+
+    def test_sort_multiple_merge_passes(self):
+        lines = [str(number) for number in random_ints(2000, 1, 10**6)]
+        self.write_input(lines)
+        fan_in = external_sort.MAX_MERGE_FAN_IN
+        external_sort.MAX_MERGE_FAN_IN = 4
+        try:
+            sort_file(self.input_path, self.output_path, memory_limit=1000)
+        finally:
+            external_sort.MAX_MERGE_FAN_IN = fan_in
+        assert self.read_output() == sorted(lines)
+
+    def test_sort_with_key_and_reverse_is_stable(self):
+        lines = ['+{},0.0{}'.format(index, cost)
+                 for index, cost in enumerate(random_ints(1000, 1, 5))]
+        self.write_input(lines)
+
+        def cost(line):
+            return float(line.split(',')[1])
+
+        sort_file(self.input_path, self.output_path, memory_limit=2000,
+                  key=cost, reverse=True)
+        assert self.read_output() == sorted(lines, key=cost, reverse=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,291 @@
+#!python
+
+from array import array
+from math import ceil, log
+
+# Mixed into every key so filter hashes differ from the HashTable bucket hashes
+_SEED = 0x5bd1e995
+_MASK32 = 0xffffffff
+
+
+def _hash_pair(item):
+    """Return two 32-bit hashes of item built on Python's hash(), the same
+    hashing HashTable uses. Hashing a tuple mixes the bits, so small ints
+    (whose hash is themselves) still spread across the whole range."""
+    h = hash((item, _SEED))
+    return h & _MASK32, ((h >> 32) & _MASK32) | 1  # Odd step visits all slots
+
+
+class BloomFilter(object):
+    """Probabilistic set that answers "definitely not present" or "probably
+    present" using a fixed array of bits. False positives happen at about
+    the configured error rate, false negatives never happen. Items can not
+    be deleted, use CuckooFilter when deletion is needed. A miss costs about
+    half a miss in a chained Set, so it pays off as a pre-check in front of
+    one when most lookups miss."""
+
+    def __init__(self, iterable=None, capacity=1000, error_rate=0.01):
+        """Initialize this filter sized for capacity items at the given false
+        positive rate, and add the given items, if any."""
+        assert 0 < error_rate < 1, 'error rate is out of range: {}'.format(
+            error_rate)
+        if iterable is not None:
+            iterable = list(iterable)
+            capacity = max(capacity, len(iterable))
+        capacity = max(capacity, 1)
+        # Optimal number of bits and hash functions for capacity and error rate
+        self.num_bits = max(8, ceil(-capacity * log(error_rate) / log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.size = 0  # Number of items added, duplicates included
+        if iterable is not None:
+            for item in iterable:
+                self.set(item)
+
+    def __repr__(self):
+        """Return a string representation of this filter."""
+        return 'BloomFilter({} items, {} bits, {} hashes)'.format(
+            self.size, self.num_bits, self.num_hashes)
+
+    def __contains__(self, item):
+        return self.contains(item)
+
+    def __len__(self):
+        return self.size
+
+    def _indexes(self, item):
+        """Yield the bit index of each of the hash functions for item, using
+        double hashing to derive all of them from one hash() call."""
+        h1, h2 = _hash_pair(item)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def set(self, item):
+        """Add the given item to this filter.
+        Running time: O(k) for k hash functions."""
+        bits = self.bits
+        for index in self._indexes(item):
+            bits[index >> 3] |= 1 << (index & 7)
+        self.size += 1
+
+    def contains(self, item):
+        """Return False if item was definitely never added, or True if it
+        probably was. Running time: O(k), stops at the first unset bit,
+        which for an item never added is the first one half the time."""
+        # Same indexes as _indexes with _hash_pair inlined, and the first
+        # probe before the loop, since that's where most misses stop
+        h = hash((item, _SEED))
+        bits, num_bits = self.bits, self.num_bits
+        h1 = h & _MASK32
+        index = h1 % num_bits
+        if not bits[index >> 3] >> (index & 7) & 1:
+            return False
+        h2 = ((h >> 32) & _MASK32) | 1
+        for _ in range(1, self.num_hashes):
+            h1 += h2
+            index = h1 % num_bits
+            if not bits[index >> 3] >> (index & 7) & 1:
+                return False
+        return True
+
+
+class CuckooFilter(object):
+    """Probabilistic set storing a small fingerprint of each item in one of
+    two candidate buckets. Like BloomFilter it has no false negatives, but
+    it also supports deleting items that were previously added. A miss
+    compares eight fingerprints and costs about as much as a miss in a
+    chained Set, so it is no faster as a pre-check in front of one; use it
+    when items must be deleted, or in place of a set that isn't kept."""
+
+    bucket_size = 4  # Fingerprints per bucket, contains compares all inline
+    max_kicks = 500  # Evictions to try before reporting the filter full
+
+    def __init__(self, iterable=None, capacity=1000, error_rate=0.01):
+        """Initialize this filter sized for capacity items at the given false
+        positive rate, and add the given items, if any."""
+        assert 0 < error_rate < 1, 'error rate is out of range: {}'.format(
+            error_rate)
+        if iterable is not None:
+            iterable = list(iterable)
+            capacity = max(capacity, len(iterable))
+        # Bucket count must be a power of two for the XOR alternate index,
+        # and leave some headroom since cuckoo tables fill up near 95% load
+        num_buckets = 1
+        while num_buckets * self.bucket_size * 0.9 < capacity:
+            num_buckets *= 2
+        self.num_buckets = num_buckets
+        # Each lookup checks 2 * bucket_size fingerprints
+        self.fingerprint_bits = max(
+            4, ceil(log(2 * self.bucket_size / error_rate, 2)))
+        self.fingerprint_mask = (1 << self.fingerprint_bits) - 1
+        typecode = 'H' if self.fingerprint_bits <= 16 else 'L'
+        self.slots = array(typecode, bytes(
+            array(typecode).itemsize * num_buckets * self.bucket_size))
+        self.size = 0
+        if iterable is not None:
+            for item in iterable:
+                self.set(item)
+
+    def __repr__(self):
+        """Return a string representation of this filter."""
+        return 'CuckooFilter({} items, {} buckets, {}-bit fingerprints)'.format(
+            self.size, self.num_buckets, self.fingerprint_bits)
+
+    def __contains__(self, item):
+        return self.contains(item)
+
+    def __len__(self):
+        return self.size
+
+    def _fingerprint_and_index(self, item):
+        """Return the nonzero fingerprint of item and its primary bucket."""
+        h = hash((item, _SEED))
+        # Zero marks empty slots
+        fingerprint = (h >> 32) & self.fingerprint_mask or 1
+        return fingerprint, h & (self.num_buckets - 1)
+
+    def _alternate_index(self, index, fingerprint):
+        """Return the other bucket for fingerprint, computable from either
+        bucket alone so entries can be moved without the original item."""
+        return (index ^ hash((fingerprint, _SEED))) & (self.num_buckets - 1)
+
+    def _insert_into_bucket(self, index, fingerprint):
+        """Store fingerprint in an empty slot of bucket index if one exists."""
+        start = index * self.bucket_size
+        for slot in range(start, start + self.bucket_size):
+            if self.slots[slot] == 0:
+                self.slots[slot] = fingerprint
+                return True
+        return False
+
+    def _find_in_bucket(self, index, fingerprint):
+        """Return the slot holding fingerprint in bucket index, or None."""
+        start = index * self.bucket_size
+        for slot in range(start, start + self.bucket_size):
+            if self.slots[slot] == fingerprint:
+                return slot
+        return None
+
+    def set(self, item):
+        """Add the given item to this filter, or raise ValueError if it is
+        full. Running time: O(1) amortized, evictions are rare below 90% load.
+        """
+        fingerprint, index1 = self._fingerprint_and_index(item)
+        index2 = self._alternate_index(index1, fingerprint)
+        if (self._insert_into_bucket(index1, fingerprint)
+                or self._insert_into_bucket(index2, fingerprint)):
+            self.size += 1
+            return
+        # Both buckets are full: evict fingerprints along a cuckoo path,
+        # remembering every swap so a failed insert leaves the filter intact
+        import random
+        index = random.choice((index1, index2))
+        swaps = []
+        for _ in range(self.max_kicks):
+            slot = index * self.bucket_size + random.randrange(self.bucket_size)
+            fingerprint, self.slots[slot] = self.slots[slot], fingerprint
+            swaps.append(slot)
+            index = self._alternate_index(index, fingerprint)
+            if self._insert_into_bucket(index, fingerprint):
+                self.size += 1
+                return
+        for slot in reversed(swaps):
+            fingerprint, self.slots[slot] = self.slots[slot], fingerprint
+        raise ValueError('CuckooFilter is full: {} items'.format(self.size))
+
+    def contains(self, item):
+        """Return False if item is definitely not present, or True if it
+        probably is. Running time: O(1), checks at most two buckets."""
+        # Inlined _fingerprint_and_index and _alternate_index, comparing the
+        # slots of each bucket in place rather than slicing copies of them
+        h = hash((item, _SEED))
+        fingerprint = (h >> 32) & self.fingerprint_mask or 1
+        slots, mask = self.slots, self.num_buckets - 1
+        index = h & mask
+        start = index * 4
+        if (slots[start] == fingerprint or slots[start + 1] == fingerprint or
+                slots[start + 2] == fingerprint or
+                slots[start + 3] == fingerprint):
+            return True
+        start = ((index ^ hash((fingerprint, _SEED))) & mask) * 4
+        return (slots[start] == fingerprint or slots[start + 1] == fingerprint
+                or slots[start + 2] == fingerprint or
+                slots[start + 3] == fingerprint)
+
+    def delete(self, item):
+        """Delete one copy of the given item, or raise KeyError. Only delete
+        items that were added, or a colliding item may be removed instead."""
+        fingerprint, index1 = self._fingerprint_and_index(item)
+        slot = self._find_in_bucket(index1, fingerprint)
+        if slot is None:
+            index2 = self._alternate_index(index1, fingerprint)
+            slot = self._find_in_bucket(index2, fingerprint)
+        if slot is None:
+            raise KeyError('Key not found: {}'.format(item))
+        self.slots[slot] = 0
+        self.size -= 1
+
+
+def random_words(count, length=8):
+    """Return a list of `count` random lowercase words of the given length."""
+    import random
+    import string
+    letters = string.ascii_lowercase
+    return [''.join(random.choice(letters) for _ in range(length))
+            for _ in range(count)]
+
+
+def benchmark(num_words=200000, num_queries=100000, error_rate=0.01):
+    """Time miss-path membership checks against a dictionary Set with and
+    without a filter in front of it, and print the speedups."""
+    from timeit import default_timer as timer
+    from sets import Set
+
+    words = random_words(num_words)
+    misses = random_words(num_queries, length=9)  # Never in the dictionary
+    dictionary = Set(words)
+    bloom = BloomFilter(words, error_rate=error_rate)
+    cuckoo = CuckooFilter(words, error_rate=error_rate)
+
+    def time_lookups(check, contains=None, repeat=5):
+        """Return the best time of repeat runs of looking up every missing
+        word with check, then with contains if check passes, if given, and
+        the number of words that check passed."""
+        best = float('inf')
+        for _ in range(repeat):
+            start = timer()
+            if contains is None:
+                found = sum(1 for word in misses if check(word))
+            else:
+                found = sum(1 for word in misses
+                            if check(word) and contains(word))
+            best = min(best, timer() - start)
+        return best, found
+
+    baseline, _ = time_lookups(dictionary.contains)
+    print('{} words, {} missing queries'.format(num_words, num_queries))
+    print('Set only:          {:.3f}s'.format(baseline))
+    for name, word_filter in [('BloomFilter', bloom), ('CuckooFilter', cuckoo)]:
+        elapsed, false_positives = time_lookups(word_filter.contains)
+        guarded, _ = time_lookups(word_filter.contains, dictionary.contains)
+        print('{:18} {:.3f}s alone, {:.3f}s in front of Set ({:.1f}x), '
+              '{:.2%} false positives'.format(
+                  name + ':', elapsed, guarded, baseline / guarded,
+                  false_positives / num_queries))
+
+
+def main():
+    """Read command-line arguments and benchmark the membership filters."""
+    import sys
+    args = sys.argv[1:]  # Ignore script file name
+    try:
+        num_words = int(args[0]) if len(args) >= 1 else 200000
+        num_queries = int(args[1]) if len(args) >= 2 else 100000
+    except ValueError:
+        print('Usage: {} [num_words] [num_queries]'.format(sys.argv[0]))
+        return
+    benchmark(num_words, num_queries)
+
+
+if __name__ == '__main__':
+    main()
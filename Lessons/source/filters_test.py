@@ -0,0 +1,70 @@
+from filters import BloomFilter, CuckooFilter, random_words
+import unittest
+
+
+class BloomFilterTest(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        words = random_words(2000)
+        bloom = BloomFilter(words, error_rate=0.01)
+
+        assert len(bloom) == 2000
+        for word in words:
+            assert word in bloom
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(random_words(5000), error_rate=0.01)
+        misses = random_words(5000, length=9)
+
+        false_positives = sum(1 for word in misses if word in bloom)
+        assert false_positives < 5000 * 0.03
+
+    def test_integers(self):
+        bloom = BloomFilter(range(0, 1000, 2), capacity=500)
+
+        assert all(number in bloom for number in range(0, 1000, 2))
+        assert sum(1 for number in range(1, 1000, 2) if number in bloom) < 50
+
+
+class CuckooFilterTest(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        words = random_words(2000)
+        cuckoo = CuckooFilter(words, error_rate=0.01)
+
+        assert len(cuckoo) == 2000
+        for word in words:
+            assert word in cuckoo
+
+    def test_false_positive_rate(self):
+        cuckoo = CuckooFilter(random_words(5000), error_rate=0.01)
+        misses = random_words(5000, length=9)
+
+        false_positives = sum(1 for word in misses if word in cuckoo)
+        assert false_positives < 5000 * 0.03
+
+    def test_delete(self):
+        cuckoo = CuckooFilter(['hello', 'there'], capacity=100)
+
+        cuckoo.delete('hello')
+        assert len(cuckoo) == 1
+        assert 'hello' not in cuckoo
+        assert 'there' in cuckoo
+
+        with self.assertRaises(KeyError):
+            cuckoo.delete('hello')
+
+    def test_full(self):
+        cuckoo = CuckooFilter(capacity=8)
+        items = range(1000)
+
+        with self.assertRaises(ValueError):
+            for item in items:
+                cuckoo.set(item)
+        # A failed insert must not lose any previously added item
+        for item in range(len(cuckoo)):
+            assert item in cuckoo
+
+
+if __name__ == '__main__':
+    unittest.main()
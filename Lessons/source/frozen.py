@@ -0,0 +1,227 @@
+#!python
+
+from array import array
+
+_MASK64 = 0xffffffffffffffff
+# Odd 64-bit multiplier (2**64 / golden ratio) that mixes a seed into a hash
+_MULTIPLIER = 0x9e3779b97f4a7c15
+
+
+def _mix(h, seed):
+    """Return hash h scrambled by seed, to place the keys of a bucket."""
+    return ((h ^ seed) * _MULTIPLIER & _MASK64) >> 32
+
+
+class FrozenHashTable(object):
+    """Immutable hash table built once over a fixed set of keys using a
+    minimal perfect hash (hash, displace and compress) over the keys' hash()
+    values. Every key owns exactly one slot, so lookups take one probe with
+    no collision chains. Keys whose hash() equals an earlier key's (like -1
+    and -2) can't get a slot of their own and are kept in a small dict.
+    hash() of strings differs between processes, so a pickled table stores
+    only its keys and values and rebuilds the slots when unpickled."""
+
+    def __init__(self, items=()):
+        """Build this table from the given (key, value) pairs. Later pairs
+        with a duplicate key replace earlier ones, as with HashTable.set.
+        Running time: O(n) expected, bucket displacements are found greedily
+        from the largest bucket down."""
+        entries = {}
+        for key, value in items:
+            entries[key] = value
+        self._build(list(entries), list(entries.values()))
+
+    def _build(self, keys, values):
+        """Find a displacement for every bucket so all keys with distinct
+        hashes land in distinct slots of a table with exactly one slot per
+        key, and keep the other keys in the overflow dict."""
+        self._overflow = {}
+        hashes, unique = [], {}
+        for index, key in enumerate(keys):
+            h = hash(key)
+            if h in unique:
+                self._overflow[key] = None if values is None else values[index]
+            else:
+                unique[h] = index
+                hashes.append(h)
+        if self._overflow:
+            indexes = list(unique.values())
+            keys = [keys[index] for index in indexes]
+            if values is not None:
+                values = [values[index] for index in indexes]
+        size = len(keys)
+        self._keys = [None] * size
+        self._values = None if values is None else [None] * size
+        # Each bucket stores either a seed d >= 1, used as _mix(h, d) % size,
+        # or a direct slot s encoded as -s - 1 for single-key buckets
+        self._displacements = array('q', bytes(8 * size))
+        if size == 0:
+            return
+
+        buckets = [[] for _ in range(size)]
+        for index, h in enumerate(hashes):
+            buckets[h % size].append(index)
+        order = sorted(range(size), key=lambda b: len(buckets[b]), reverse=True)
+
+        occupied = bytearray(size)
+
+        def place(slot, index):
+            occupied[slot] = 1
+            self._keys[slot] = keys[index]
+            if values is not None:
+                self._values[slot] = values[index]
+
+        position = 0
+        for position, bucket_index in enumerate(order):
+            bucket = buckets[bucket_index]
+            if len(bucket) <= 1:
+                break
+            seed = 1
+            while True:
+                slots = {_mix(hashes[index], seed) % size for index in bucket}
+                if (len(slots) == len(bucket)
+                        and not any(occupied[slot] for slot in slots)):
+                    break
+                seed += 1
+            self._displacements[bucket_index] = seed
+            for index in bucket:
+                place(_mix(hashes[index], seed) % size, index)
+        else:
+            position = size
+
+        # Single-key buckets go straight into the remaining free slots
+        free_slots = (slot for slot in range(size) if not occupied[slot])
+        for bucket_index in order[position:]:
+            bucket = buckets[bucket_index]
+            if not bucket:
+                break
+            slot = next(free_slots)
+            self._displacements[bucket_index] = -slot - 1
+            place(slot, bucket[0])
+
+    def __getstate__(self):
+        """Return the keys and values to pickle, the slots are rebuilt from
+        them, since hash() of strings differs in another process."""
+        keys = self._keys + list(self._overflow)
+        if self._values is None:
+            return keys, None
+        return keys, self._values + list(self._overflow.values())
+
+    def __setstate__(self, state):
+        self._build(*state)
+
+    def __str__(self):
+        """Return a formatted string representation of this hash table."""
+        items = ['{!r}: {!r}'.format(key, val) for key, val in self.items()]
+        return '{' + ', '.join(items) + '}'
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'FrozenHashTable({!r})'.format(self.items())
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __len__(self):
+        return len(self._keys) + len(self._overflow)
+
+    def keys(self):
+        """Return a list of all keys in this hash table."""
+        return self._keys + list(self._overflow)
+
+    def values(self):
+        """Return a list of all values in this hash table."""
+        return self._values + list(self._overflow.values())
+
+    def items(self):
+        """Return a list of all entries (key-value pairs) in this hash table."""
+        return list(zip(self._keys, self._values)) + \
+            list(self._overflow.items())
+
+    def length(self):
+        """Return the number of key-value entries in this hash table."""
+        return len(self)
+
+    def contains(self, key):
+        """Return True if this hash table contains the given key, or False.
+        Running time: O(1), exactly one slot is compared (and the overflow
+        dict, if any keys share a hash)."""
+        keys = self._keys
+        if keys:  # The only slot where key could be stored
+            h = hash(key)
+            slot = self._displacements[h % len(keys)]
+            slot = -slot - 1 if slot < 0 else _mix(h, slot) % len(keys)
+            if keys[slot] == key:
+                return True
+        return bool(self._overflow) and key in self._overflow
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError.
+        Running time: O(1), exactly one slot is compared (and the overflow
+        dict, if any keys share a hash)."""
+        keys = self._keys
+        if keys:  # The only slot where key could be stored
+            h = hash(key)
+            slot = self._displacements[h % len(keys)]
+            slot = -slot - 1 if slot < 0 else _mix(h, slot) % len(keys)
+            if keys[slot] == key:
+                return self._values[slot]
+        if key in self._overflow:
+            return self._overflow[key]
+        raise KeyError('Key not found: {}'.format(key))
+
+    def set(self, key, value):
+        raise TypeError('{} is immutable'.format(type(self).__name__))
+
+    def delete(self, key):
+        raise TypeError('{} is immutable'.format(type(self).__name__))
+
+    def freeze(self):
+        """Return this table, it is already frozen."""
+        return self
+
+
+class FrozenSet(FrozenHashTable):
+    """Immutable set with one-probe membership tests, see FrozenHashTable."""
+
+    def __init__(self, iterable=()):
+        """Build this set from the given items, ignoring duplicates."""
+        self._build(list(dict.fromkeys(iterable)), None)
+
+    def __str__(self):
+        """Return a formatted string representation of this set."""
+        return '{' + ', '.join(repr(key) for key in self.keys()) + '}'
+
+    def __repr__(self):
+        """Return a string representation of this set."""
+        return f"FrozenSet({self})"
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __or__(self, other):
+        """Returns the Union of two sets"""
+        return FrozenSet(list(self) + list(other))
+
+    def __and__(self, other):
+        """Returns the Intersection of two sets"""
+        return FrozenSet(item for item in self if item in other)
+
+    def __sub__(self, other):
+        """Returns the difference between two sets."""
+        return FrozenSet(item for item in self if item not in other)
+
+    def __add__(self, other):
+        return self | other
+
+    def values(self):
+        raise TypeError('FrozenSet has no values')
+
+    def items(self):
+        raise TypeError('FrozenSet has no values')
+
+    def get(self, key):
+        raise TypeError('FrozenSet has no values')
+
+    def set(self, item):
+        raise TypeError('FrozenSet is immutable')
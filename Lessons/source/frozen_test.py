@@ -0,0 +1,153 @@
+from frozen import FrozenHashTable, FrozenSet
+from hashtable import HashTable
+from sets import Set
+import pickle
+import unittest
+
+
+class FrozenHashTableTest(unittest.TestCase):
+
+    def test_freeze(self):
+        ht = HashTable()
+        for i, word in enumerate('one two three four five six seven'.split()):
+            ht.set(word, i)
+        frozen = ht.freeze()
+
+        assert len(frozen) == 7
+        assert sorted(frozen.items()) == sorted(ht.items())
+        assert frozen.get('one') == 0
+        assert frozen.get('seven') == 6
+        assert 'three' in frozen
+        assert 'eight' not in frozen
+        with self.assertRaises(KeyError):
+            frozen.get('eight')
+
+    def test_empty(self):
+        frozen = HashTable().freeze()
+
+        assert len(frozen) == 0
+        assert 'anything' not in frozen
+        with self.assertRaises(KeyError):
+            frozen.get('anything')
+
+    def test_duplicate_keys_keep_last_value(self):
+        frozen = FrozenHashTable([('A', 1), ('B', 2), ('A', 3)])
+
+        assert len(frozen) == 2
+        assert frozen.get('A') == 3
+
+    def test_immutable(self):
+        frozen = FrozenHashTable([('A', 1)])
+
+        with self.assertRaises(TypeError):
+            frozen.set('B', 2)
+        with self.assertRaises(TypeError):
+            frozen.delete('A')
+
+    def test_many_keys(self):
+        items = [(number, str(number)) for number in range(0, 30000, 3)]
+        items += [('key{}'.format(number), number) for number in range(10000)]
+        frozen = FrozenHashTable(items)
+
+        assert len(frozen) == len(items)
+        for key, value in items:
+            assert frozen.get(key) == value
+        for number in range(1, 3000, 3):
+            assert number not in frozen
+
+    def test_pickle_to_another_process(self):
+        import os
+        import subprocess
+        import sys
+        items = [('route{}'.format(i), i) for i in range(500)]
+        items += [(('tuple', i, None), i) for i in range(500)]
+        frozen = FrozenHashTable(items)
+        script = ('import pickle, sys; t = pickle.load(sys.stdin.buffer); '
+                  'print(sum(t.get("route{}".format(i)) + '
+                  't.get(("tuple", i, None)) for i in range(500)))')
+        # A different hash seed must not change where string keys are stored
+        output = subprocess.run(
+            [sys.executable, '-c', script], input=pickle.dumps(frozen),
+            capture_output=True, env={'PYTHONHASHSEED': '12345'}, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)))
+        assert int(output.stdout) == 2 * sum(range(500))
+
+    def test_keys_with_equal_builtin_hashes(self):
+        # hash(-1) == hash(-2) and hash(0) == hash(2**61 - 1)
+        ht = HashTable()
+        for key in [-1, -2, 0, 2**61 - 1, 2**61, 1]:
+            ht.set(key, str(key))
+        frozen = ht.freeze()
+
+        for key in [-1, -2, 0, 2**61 - 1, 2**61, 1]:
+            assert frozen.get(key) == str(key)
+        assert frozen.get(1.0) == '1'
+        assert frozen.get(True) == '1'
+        assert 2 not in frozen
+
+    def test_composite_keys(self):
+        frozen = FrozenHashTable([(('a', 1), 1), ((None, b'b'), 2),
+                                  (frozenset(['x', 'y']), 3), (None, 4),
+                                  (2.5, 5)])
+
+        assert frozen.get(('a', 1)) == 1
+        assert frozen.get((None, b'b')) == 2
+        assert frozen.get(frozenset(['y', 'x'])) == 3
+        assert frozen.get(None) == 4
+        assert frozen.get(2.5) == 5
+        assert ('a', 2) not in frozen
+
+    def test_any_hashable_keys(self):
+        from decimal import Decimal
+        marker = object()
+        frozen = FrozenHashTable([(marker, 1), (Decimal('2.5'), 2)])
+
+        assert frozen.get(marker) == 1
+        assert frozen.get(Decimal('2.5')) == 2
+        assert object() not in frozen
+        assert Decimal('3.5') not in frozen
+        assert 'marker' not in frozen
+        assert object() not in Set(['a', 'b']).freeze()
+        assert object() not in FrozenSet()
+
+    def test_pickle_with_shared_hashes(self):
+        frozen = FrozenHashTable([(-1, 'a'), (-2, 'b'), ('c', 3)])
+        copy = pickle.loads(pickle.dumps(frozen))
+
+        assert len(copy) == 3
+        assert sorted(copy.items(), key=repr) == \
+            sorted(frozen.items(), key=repr)
+        assert copy.get(-2) == 'b'
+
+
+class FrozenSetTest(unittest.TestCase):
+
+    def test_freeze(self):
+        frozen = Set(['hello', 'there', 'my', 'name', 'is', 'ikey']).freeze()
+
+        assert len(frozen) == 6
+        assert 'ikey' in frozen
+        assert 'nobody' not in frozen
+        with self.assertRaises(TypeError):
+            frozen.set('nobody')
+
+    def test_set_operations(self):
+        mySet = FrozenSet(['hello', 'there', 'ikey'])
+        otherSet = FrozenSet(['other', 'my', 'hello', 'there'])
+
+        assert sorted(mySet | otherSet) == [
+            'hello', 'ikey', 'my', 'other', 'there']
+        assert sorted(mySet & otherSet) == ['hello', 'there']
+        assert sorted(mySet - otherSet) == ['ikey']
+
+    def test_pickle(self):
+        frozen = FrozenSet(range(1000))
+        copy = pickle.loads(pickle.dumps(frozen))
+
+        assert len(copy) == 1000
+        assert all(number in copy for number in range(1000))
+        assert 1000 not in copy
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 #!python
 
 from linkedlist import LinkedList
+from frozen import FrozenHashTable
 
 
 class HashTable(object):
@@ -136,6 +137,11 @@ class HashTable(object):
         else:  # Not found
             raise KeyError('Key not found: {}'.format(key))
 
+    def freeze(self):
+        """Return an immutable FrozenHashTable snapshot of this hash table.
+        Running time: O(n) expected, builds a minimal perfect hash over keys."""
+        return FrozenHashTable(self.items())
+
     def _resize(self, new_size=None):
         """Resize this hash table's buckets and rehash all key-value entries.
         Should be called automatically when load factor exceeds a threshold
@@ -150,10 +156,10 @@ class HashTable(object):
             new_size = len(self.buckets) / 2  # Half size
 
         curr_elements = self.items()
-        self.__init__(new_size)  # Thanks Mr. Cahill
+        HashTable.__init__(self, new_size, self.max_load_factor)  # Thanks Mr. Cahill
 
         for key, value in curr_elements:
-            self.set(key, value)
+            HashTable.set(self, key, value)
 
         return self
 
@@ -0,0 +1,92 @@
+#!python
+
+import parallel_sort
+from parallel_sort import parallel_sort as sort, _int64_typecode, _sort_bucket
+from pool_testing import RecordingPool
+from sorting import random_ints
+from array import array
+import os
+import subprocess
+import sys
+import unittest
+
+
+class ParallelSortTest(unittest.TestCase):
+
+    def setUp(self):
+        # Use the parallel path even for small test lists
+        self.threshold = parallel_sort.PARALLEL_SORT_THRESHOLD
+        parallel_sort.PARALLEL_SORT_THRESHOLD = 0
+
+    def tearDown(self):
+        parallel_sort.PARALLEL_SORT_THRESHOLD = self.threshold
+
+    def test_sort_integers(self):
+        items = random_ints(5000, -10**12, 10**12)
+        sorted_items = sorted(items)
+        sort(items, workers=3)
+        assert items == sorted_items
+
+    def test_sort_strings(self):
+        items = [str(number) for number in random_ints(5000, 1, 10**6)]
+        sorted_items = sorted(items)
+        sort(items, workers=2)
+        assert items == sorted_items
+
+    def test_sort_few_unique(self):
+        items = random_ints(5000, 1, 3)
+        sorted_items = sorted(items)
+        sort(items, workers=4)
+        assert items == sorted_items
+
+    def test_sort_serially(self):
+        items = random_ints(100, 1, 100)
+        sorted_items = sorted(items)
+        sort(items, workers=1)
+        assert items == sorted_items
+
+    def test_int64_typecode(self):
+        assert _int64_typecode([1, -2, 3]) == 'q'
+        assert _int64_typecode([]) == 'q'
+        assert _int64_typecode([1, 2**63]) is None
+        assert _int64_typecode([1, 2.5]) is None
+        assert _int64_typecode(['1']) is None
+
+    def test_sort_bucket(self):
+        assert _sort_bucket(array('q', [3, 1, 2])) == array('q', [1, 2, 3])
+        assert _sort_bucket(['b', 'c', 'a']) == ['a', 'b', 'c']
+
+
+class ParallelSortPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.threshold = parallel_sort.PARALLEL_SORT_THRESHOLD
+        parallel_sort.PARALLEL_SORT_THRESHOLD = 0
+
+    def tearDown(self):
+        parallel_sort.PARALLEL_SORT_THRESHOLD = self.threshold
+
+    def test_sort_in_worker_processes(self):
+        for items in [random_ints(20000, -10**12, 10**12),
+                      [number / 7 for number in random_ints(5000, 1, 10**6)],
+                      array('q', random_ints(5000, 1, 10**6)),
+                      [str(number) for number in random_ints(5000, 1, 10**6)],
+                      [2**70 + number for number in random_ints(5000, 1, 9)]]:
+            expected = sorted(items)
+            with RecordingPool() as calls:
+                sort(items, workers=3)
+            assert list(items) == expected
+            assert calls == [('_sort_bucket', None)]
+
+    def test_command_line_starts_pool(self):
+        # A script's own directory comes first on the path, before the stdlib
+        source = os.path.dirname(os.path.abspath(__file__))
+        output = subprocess.run(
+            [sys.executable, 'parallel_sort.py', '2', '2000'], cwd=source,
+            capture_output=True, text=True, timeout=120, check=True)
+        assert 'unavailable' not in output.stdout
+        assert output.stdout.split()[4] == '2000'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+#!python
+
+import parallel_sort
+
+
+class RecordingPool(object):
+    """Context manager for tests of code that runs work in a process pool
+    from parallel_sort.process_pool_executor: while active, that returns a
+    ProcessPoolExecutor subclass that records the name of each function run
+    with map or submit, and for submit its arguments, in the calls list."""
+
+    def __enter__(self):
+        self.executor = parallel_sort.process_pool_executor
+        pool_executor = self.executor()
+        assert pool_executor is not None, 'process pools are unavailable'
+        self.calls = calls = []
+
+        class RecordingExecutor(pool_executor):
+
+            def map(self, function, *iterables, **kwargs):
+                calls.append((function.__name__, None))
+                return super().map(function, *iterables, **kwargs)
+
+            def submit(self, function, *args, **kwargs):
+                # map submits chunks through partial objects, not recorded
+                if hasattr(function, '__name__'):
+                    calls.append((function.__name__, args))
+                return super().submit(function, *args, **kwargs)
+
+        parallel_sort.process_pool_executor = lambda: RecordingExecutor
+        return calls
+
+    def __exit__(self, *exception):
+        parallel_sort.process_pool_executor = self.executor
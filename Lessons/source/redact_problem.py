@@ -1,5 +1,6 @@
 import unittest
 from sets import Set
+from aho_corasick import automaton
 
 
 class RedactTest(unittest.TestCase):
@@ -22,9 +23,44 @@ class RedactTest(unittest.TestCase):
 
         assert redact_words(words, banned) == words
 
+    def test_redact_text(self):
+        text = "These words, these WORDS! Sword and swords are fine."
+        banned = ["these", "words", "word"]
+
+        assert redact_text(text, banned) == \
+            "***** *****, ***** *****! Sword and swords are fine."
+        assert redact_text(text, []) == text
+        assert redact_text("", banned) == ""
+
+    def test_redact_text_phrases(self):
+        text = "a bagel with cream cheese, cream and cheese"
+        banned = ["cream cheese", "bagel"]
+
+        assert redact_text(text, banned, mask="#") == \
+            "a ##### with ############, cream and cheese"
+
 
 def redact_words(sentence: list, prohibited: list) -> list:
 
     prohibited = set(word.lower() for word in prohibited)
 
     return list(filter(lambda word: word.lower() not in prohibited, sentence))
+
+
+def redact_text(text: str, prohibited: list, mask: str = "*") -> str:
+    """Return text with every whole-word occurrence of a prohibited word or
+    phrase, ignoring case, replaced by as many mask characters. All the
+    prohibited words are found in one pass over text by an Aho-Corasick
+    automaton, which is cached so redacting many documents against the same
+    list builds it once."""
+    if not prohibited:
+        return text
+    redacted = list(text)
+    for start, word in automaton(prohibited, ignore_case=True).search(text):
+        end = start + len(word)
+        if start > 0 and text[start - 1].isalnum():
+            continue  # Ends another word, like "word" in "sword"
+        if end < len(text) and text[end].isalnum():
+            continue  # Starts another word, like "word" in "words"
+        redacted[start:end] = mask * len(word)
+    return "".join(redacted)
@@ -1,15 +1,41 @@
 #!python
 
+import bisect as _bisect
+from array import array as _array
+try:
+    import numpy
+except ImportError:  # NumPy is optional, only used to scan NumPy arrays
+    numpy = None
+
+# Sorted arrays at least this long are searched faster through an Eytzinger
+# layout than with binary search, once the layout is built
+EYTZINGER_THRESHOLD = 2**18
+# Items compared per NumPy vectorized block in a linear scan, so a match near
+# the front stops the scan early instead of comparing the whole array
+LINEAR_SEARCH_CHUNK = 2**16
+# Arrays shorter than this are scanned faster in one process than it takes to
+# start worker processes and ship the items to them
+PARALLEL_SEARCH_THRESHOLD = 10**7
+
 
 def linear_search(array, item):
     """return the first index of item in array or None if item is not found"""
-    # implement linear_search_iterative and linear_search_recursive below, then
-    # change this to call your implementation to verify it passes all tests
-    # return linear_search_iterative(array, item)
-    return linear_search_recursive(array, item)
+    return linear_search_iterative(array, item)
 
 
 def linear_search_iterative(array, item):
+    """Return the first index of item in array or None if item is not found.
+    Lists, tuples and array.array scan with their index method, in C; NumPy
+    arrays compare a block of LINEAR_SEARCH_CHUNK items at a time.
+    Running time: O(n), O(i) if item is at index i.
+    Memory usage: O(1), O(LINEAR_SEARCH_CHUNK) for NumPy arrays."""
+    if isinstance(array, (list, tuple, _array)):
+        try:
+            return array.index(item)
+        except ValueError:
+            return None
+    if numpy is not None and isinstance(array, numpy.ndarray):
+        return next(_numpy_find_all(array, item), None)
     # loop over all array values until item is found
     for index, value in enumerate(array):
         if item == value:
@@ -17,6 +43,90 @@ def linear_search_iterative(array, item):
     return None  # not found
 
 
+def _numpy_find_all(array, item):
+    """Yield the indexes of item in a one-dimensional NumPy array, comparing
+    one block of LINEAR_SEARCH_CHUNK items at a time."""
+    for start in range(0, len(array), LINEAR_SEARCH_CHUNK):
+        block = array[start:start + LINEAR_SEARCH_CHUNK]
+        matches = block == item
+        if not isinstance(matches, numpy.ndarray):
+            return  # Item can't be compared with the array's dtype
+        for index in numpy.flatnonzero(matches).tolist():
+            yield start + index
+
+
+def find_all(array, item):
+    """Yield every index of item in array, in increasing order.
+    Running time: O(n), lists, tuples and array.array skip ahead between
+    matches with their index method, in C.
+    Memory usage: O(1), O(LINEAR_SEARCH_CHUNK) for NumPy arrays."""
+    if isinstance(array, (list, tuple, _array)):
+        index = -1
+        while True:
+            try:
+                index = array.index(item, index + 1)
+            except ValueError:
+                return
+            yield index
+    elif numpy is not None and isinstance(array, numpy.ndarray):
+        yield from _numpy_find_all(array, item)
+    else:
+        for index, value in enumerate(array):
+            if item == value:
+                yield index
+
+
+def _search_chunk(chunk, item):
+    """Return the first index of item in chunk, in a worker process."""
+    return linear_search_iterative(chunk, item)
+
+
+def parallel_linear_search(array, item, workers=None):
+    """Return the first index of item in array or None if item is not found,
+    scanning equal slices of array in parallel worker processes. Slices are
+    submitted in order, a few per worker at a time, and their results are
+    checked in order, so the first match overall is returned and no slice
+    past it is copied or shipped to a worker. Below PARALLEL_SEARCH_THRESHOLD
+    items, with a single worker, or when no process pool can be started,
+    array is scanned serially. Workers get copies of the slices, so this only
+    pays off when comparing items costs more than shipping them (big or
+    slow-to-compare items) or for very large arrays.
+    Running time: O(n/p) per worker for p workers, plus O(n) to ship slices.
+    Memory usage: O(n/p) for the copies of the slices in flight."""
+    import os
+    from collections import deque
+    from parallel_sort import process_pool_executor
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 2 or len(array) < PARALLEL_SEARCH_THRESHOLD:
+        return linear_search_iterative(array, item)
+    executor = process_pool_executor()
+    if executor is None:
+        return linear_search_iterative(array, item)
+
+    # A few slices per worker, so early slices finish and can stop the scan
+    size = -(-len(array) // (workers * 4))
+    starts = iter(range(0, len(array), size))
+    pending = deque()  # (start, future) of slices in flight, in order
+    pool = executor(workers)
+    try:
+        while True:
+            # Keep two slices per worker in flight
+            for start in starts:
+                pending.append((start, pool.submit(
+                    _search_chunk, array[start:start + size], item)))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                return None
+            start, future = pending.popleft()
+            index = future.result()
+            if index is not None:
+                return start + index
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
 def linear_search_recursive(array, item, index=0):
 
     # Check for index-range error
@@ -36,58 +146,316 @@ def binary_search(array, item):
     """return the index of item in sorted array or None if item is not found"""
     # implement binary_search_iterative and binary_search_recursive below, then
     # change this to call your implementation to verify it passes all tests
-    # return binary_search_iterative(array, item)
-    return binary_search_recursive(array, item)
+    return binary_search_iterative(array, item)
 
 
 def binary_search_iterative(array, item):
-        # Set initial search bounds
-    start, stop = 0, len(array) - 1
+    # Set initial search bounds
+    left, right = 0, len(array) - 1
 
-    midpoint = (start + stop) // 2
-
-    # While item not found and range is still valid
-    while array[midpoint] is not item and start < stop:
+    # While the range [left...right] is not empty
+    while left <= right:
+        midpoint = (left + right) // 2
+        # Compare with ==, not `is`, so equal but distinct objects match
+        if array[midpoint] == item:
+            return midpoint
         if array[midpoint] < item:
-            start = midpoint + 1
+            left = midpoint + 1
         else:
-            stop = midpoint - 1
-        midpoint = (start + stop) // 2
-
-    if array[midpoint] is item:
-        return midpoint
+            right = midpoint - 1
 
     return None
 
 
 def binary_search_recursive(array, item, left=0, right=None):
-    if not right:
+    # Only a missing bound is unset, right=0 is a valid one item range
+    if right is None:
         right = len(array) - 1
 
+    if left > right:
+        return None
+
     midpoint = (right + left) // 2
 
     if array[midpoint] == item:
         return midpoint
 
-    if left >= right:
-        return None
-
     if array[midpoint] > item:
-        return binary_search_recursive(array, item, left, midpoint)
-    # +1 because we floor the midpoint
-    return binary_search_recursive(array, item, midpoint+1, right)
+        return binary_search_recursive(array, item, left, midpoint - 1)
+    return binary_search_recursive(array, item, midpoint + 1, right)
+
+
+def bisect_left(array, item, low=0, high=None, key=None):
+    """Return the index where item would be inserted into sorted array to keep
+    it sorted, before any equal items: every array[:i] is less than item and
+    no array[i:] is. If key is given, array is sorted by key and item is a
+    key value to compare with key(array[i]). Calls the stdlib bisect module,
+    which is written in C.
+    Running time: O(log n) comparisons (and key calls).
+    Memory usage: O(1), the search is iterative."""
+    return _bisect.bisect_left(array, item, low, high, key=key)
 
 
-# EXAMPLE:
+def bisect_right(array, item, low=0, high=None, key=None):
+    """Return the index where item would be inserted into sorted array to keep
+    it sorted, after any equal items: no array[:i] is greater than item and
+    every array[i:] is. key works as for bisect_left.
+    Running time: O(log n) comparisons (and key calls).
+    Memory usage: O(1), the search is iterative."""
+    return _bisect.bisect_right(array, item, low, high, key=key)
+
+
+def galloping_search(array, item, start=0, key=None):
+    """Return bisect_left(array, item) for sorted array, searching forward
+    from index start: probe start, start+2, start+6, start+14, ... doubling
+    the step until passing item, then binary search the last step. The array
+    only needs to support indexing, so its length can be unknown or
+    unbounded, as long as indexing past the end raises IndexError.
+    Running time: O(log d) for an answer d positions after start, which
+    beats binary search when answers are close, like in sorted batches.
+    Memory usage: O(1)."""
+    low, step = start, 1
+    while True:
+        probe = low + step - 1
+        try:
+            value = array[probe] if key is None else key(array[probe])
+        except IndexError:
+            high = probe  # Past the end, the answer is at most the length
+            break
+        if not value < item:
+            high = probe
+            break
+        low = probe + 1
+        step *= 2
+    # Answer is in [low...high], and array[high] may not exist
+    while low < high:
+        midpoint = (low + high) // 2
+        try:
+            value = array[midpoint] if key is None else key(array[midpoint])
+        except IndexError:
+            high = midpoint
+            continue
+        if value < item:
+            low = midpoint + 1
+        else:
+            high = midpoint
+    return low
+
+
+def search_many(array, queries, key=None):
+    """Return a list with the index of each query in sorted array, or None for
+    queries that are not found, in the same order as queries. The queries are
+    sorted first, then found in one sweep over array where each search
+    gallops forward from where the previous one ended, instead of starting a
+    full binary search over array for every query.
+    Running time: O(m log m + m log(n/m)) for m queries in n items, close
+    to linear when there are many queries.
+    Memory usage: O(m) for the sorted query order and the results."""
+    from sorting import argsort
+    results = [None] * len(queries)
+    position = 0
+    for query_index in argsort(queries):
+        query = queries[query_index]
+        position = galloping_search(array, query, position, key)
+        if position == len(array):
+            break  # This query and all larger ones are past the end
+        value = array[position] if key is None else key(array[position])
+        if value == query:
+            results[query_index] = position
+    return results
+
+
+# EXAMPLE (binary_search_recursive):
 #   array = [1,2,3,4,5,6], item = 2
 #
 #   left | right | midpoint | array[midpoint]
 #     0  |   5   |    2     |       3
-#     0  |   2   |    1     |       2    == item -> return midpoint (1)
+#     0  |   1   |    0     |       1
+#     1  |   1   |    1     |       2    == item -> return midpoint (1)
 #
 #   array = [1,2,3,4,5,6], item = 6
 #   left | right | midpoint | array[midpoint]
 #     0  |   5   |    2     |       3
-#     2  |   5   |    3     |       4
 #     3  |   5   |    4     |       5
-#     4  |   5   |    4
+#     5  |   5   |    5     |       6    == item -> return midpoint (5)
+
+
+def interpolation_search(array, item):
+    """Return the index of item in sorted array of numbers or None if item is
+    not found, probing where item would be if the values grew linearly from
+    array[low] to array[high] instead of always probing the middle. Uniform
+    values need about log log n probes, so after twice that many (skewed
+    values), or once the range is down to a few items, the rest of the range
+    is finished with binary search.
+    Running time: O(log log n) on uniformly distributed values, O(log n)
+    worst case thanks to the binary search fallback.
+    Memory usage: O(1)."""
+    low, high = 0, len(array) - 1
+    probes_left = 2 * max(1, high + 1).bit_length().bit_length()
+    while high - low > 16 and probes_left:
+        low_value, high_value = array[low], array[high]
+        if not low_value <= item <= high_value:
+            return None
+        if low_value == high_value:
+            return low  # Whole range equals item, since it lies between them
+        probes_left -= 1
+        position = low + int((item - low_value) * (high - low) //
+                             (high_value - low_value))
+        value = array[position]
+        if value == item:
+            return position
+        if value < item:
+            low = position + 1
+        else:
+            high = position - 1
+    index = bisect_left(array, item, low, high + 1)
+    return index if index <= high and array[index] == item else None
+
+
+class EytzingerArray(object):
+    """Sorted items stored in breadth-first (Eytzinger) order of an implicit
+    balanced binary search tree: the root at index 1 and the children of k at
+    2k and 2k+1. A search walks down the tree touching nearby slots on the
+    first levels, which stay cached across repeated searches, instead of
+    jumping around the array as binary search does. Numbers are kept in a
+    compact array.array when they fit one."""
+
+    def __init__(self, sorted_items):
+        """Build the layout from items that are already in sorted order.
+        Running time: O(n), one in-order walk of the implicit tree.
+        Memory usage: O(n) for the layout and the sorted indexes."""
+        from array import array
+        size = len(sorted_items)
+        layout = [None] * (size + 1)  # Slot 0 is unused
+        ranks = array('l', bytes(array('l').itemsize * (size + 1)))
+        # In-order walk of the implicit tree hands out items in sorted order
+        rank, stack, node = 0, [], 1
+        while stack or node <= size:
+            while node <= size:
+                stack.append(node)
+                node *= 2
+            node = stack.pop()
+            layout[node] = sorted_items[rank]
+            ranks[node] = rank
+            rank += 1
+            node = 2 * node + 1
+        self.size = size
+        self.ranks = ranks
+        self.layout = layout
+        if size and all(type(item) is float for item in sorted_items):
+            self.layout = array('d', [0.0] + layout[1:])
+        elif size and all(type(item) is int for item in sorted_items):
+            if -2**63 <= sorted_items[0] and sorted_items[-1] < 2**63:
+                self.layout = array('q', [0] + layout[1:])
+
+    def __len__(self):
+        return self.size
+
+    def bisect_left(self, item):
+        """Return the index bisect_left would return on the sorted items.
+        Running time: O(log n)."""
+        layout, size, node = self.layout, self.size, 1
+        while node <= size:
+            # Go right when the node is less than item, left otherwise
+            node = 2 * node + (layout[node] < item)
+        # Undo the trailing right turns and the last left turn: the node where
+        # we last went left is the first one not less than item
+        node >>= ((~node) & (node + 1)).bit_length()
+        return self.ranks[node] if node else size
+
+    def search(self, item):
+        """Return the index of item in the sorted items or None if not found.
+        Running time: O(log n)."""
+        layout, size, node = self.layout, self.size, 1
+        while node <= size:
+            node = 2 * node + (layout[node] < item)
+        node >>= ((~node) & (node + 1)).bit_length()
+        if node and layout[node] == item:
+            return self.ranks[node]
+        return None
+
+
+def is_uniform(array, samples=64, tolerance=0.02):
+    """Return True if array is a sorted array of numbers whose values grow
+    close to linearly with their index, checked at evenly spaced samples:
+    each sample's value must be within tolerance (as a fraction of the whole
+    value range) of the straight line from the first to the last value."""
+    if len(array) < 2:
+        return False
+    first, last = array[0], array[-1]
+    if not isinstance(first, (int, float)) or not isinstance(last, (int, float)):
+        return False
+    span = last - first
+    if span <= 0:
+        return False
+    step = max(1, (len(array) - 1) // samples)
+    for index in range(0, len(array), step):
+        value = array[index]
+        if not isinstance(value, (int, float)):
+            return False
+        expected = first + span * index / (len(array) - 1)
+        if abs(value - expected) > tolerance * span:
+            return False
+    return True
+
+
+def make_searcher(array):
+    """Return a function that finds items in the sorted array, as
+    binary_search does, using the engine that suits the array. Small arrays
+    (below EYTZINGER_THRESHOLD items) fit in cache and plain binary search is
+    fastest. Larger uniformly distributed numbers use interpolation search,
+    which needs no extra memory; anything else gets an Eytzinger layout, built
+    once since a searcher is meant for repeated queries."""
+    if len(array) < EYTZINGER_THRESHOLD:
+        return lambda item: binary_search_iterative(array, item)
+    if is_uniform(array):
+        return lambda item: interpolation_search(array, item)
+    return EytzingerArray(array).search
+
+
+def benchmark(size=10**6, queries=10**5):
+    """Time binary_search_iterative against interpolation search and the
+    Eytzinger layout on uniformly and on exponentially distributed sorted
+    ints, and print seconds per query batch."""
+    import random
+    from timeit import default_timer as timer
+    arrays = {
+        'uniform': sorted(random.sample(range(size * 10), size)),
+        'exponential': sorted(int(random.expovariate(1.0 / size))
+                              for _ in range(size)),
+    }
+    print('{:12} {:>10} {:>14} {:>10} {:>10}'.format(
+        'values', 'binary', 'interpolation', 'eytzinger', 'auto'))
+    for name, array in arrays.items():
+        items = [random.choice(array) for _ in range(queries)]
+        eytzinger = EytzingerArray(array)
+        engines = [lambda item: binary_search_iterative(array, item),
+                   lambda item: interpolation_search(array, item),
+                   eytzinger.search, make_searcher(array)]
+        times = []
+        for engine in engines:
+            start = timer()
+            for item in items:
+                engine(item)
+            times.append(timer() - start)
+        print('{:12} {:>9.3f}s {:>13.3f}s {:>9.3f}s {:>9.3f}s'.format(
+            name, *times))
+
+
+def main():
+    """Read command-line arguments and benchmark the search algorithms."""
+    import sys
+    args = sys.argv[1:]  # Ignore script file name
+    try:
+        size = int(float(args[0])) if len(args) >= 1 else 10**6
+        queries = int(float(args[1])) if len(args) >= 2 else 10**5
+    except ValueError:
+        print('Usage: {} [size] [queries]'.format(sys.argv[0]))
+        print('Benchmarks searching sorted arrays of random integers')
+        print('\nExample: {} 1e6 1e5'.format(sys.argv[0]))
+        return
+    benchmark(size, queries)
+
+
+if __name__ == '__main__':
+    main()
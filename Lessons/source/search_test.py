@@ -1,6 +1,13 @@
 #!python
 
-from search import linear_search, binary_search
+from search import (linear_search, binary_search, binary_search_iterative,
+                    binary_search_recursive, bisect_left, bisect_right,
+                    galloping_search, search_many, interpolation_search,
+                    EytzingerArray, is_uniform, make_searcher, find_all,
+                    parallel_linear_search)
+from array import array
+from pool_testing import RecordingPool
+import search
 import unittest
 
 
@@ -24,6 +31,76 @@ class SearchTest(unittest.TestCase):
         assert linear_search(names, 'Jeremy') is None
         assert linear_search(names, 'nobody') is None
 
+    def test_linear_search_long_list(self):
+        # Deeper than the recursion limit, so this needs an iterative search
+        numbers = list(range(100000))
+        assert linear_search(numbers, 99999) == 99999
+        assert linear_search(numbers, -1) is None
+        assert linear_search(tuple(numbers), 500) == 500
+        assert linear_search(array('l', numbers), 70000) == 70000
+        assert linear_search(array('l', numbers), 'nope') is None
+        assert linear_search(range(10), 9) == 9  # Scanned with a loop
+        assert linear_search('lox', 'o') == 1
+        assert linear_search('lox', 'ox') is None  # Items, not substrings
+
+    def test_find_all(self):
+        numbers = [3, 1, 3, 3, 2, 1, 3]
+        assert list(find_all(numbers, 3)) == [0, 2, 3, 6]
+        assert list(find_all(numbers, 4)) == []
+        assert list(find_all(tuple(numbers), 1)) == [1, 5]
+        assert list(find_all(array('b', numbers), 2)) == [4]
+        assert list(find_all(range(5), 4)) == [4]
+        assert list(find_all([], 1)) == []
+        # Lazy: stops at the first match without scanning the rest
+        assert next(find_all(numbers * 100000, 3)) == 0
+
+    @unittest.skipIf(search.numpy is None, 'NumPy is not installed')
+    def test_linear_search_numpy(self):
+        numpy = search.numpy
+        chunk = search.LINEAR_SEARCH_CHUNK
+        search.LINEAR_SEARCH_CHUNK = 10
+        try:
+            numbers = numpy.arange(100) % 7
+            assert linear_search(numbers, 6) == 6
+            assert linear_search(numbers, 7) is None
+            assert linear_search(numbers, 'seven') is None
+            assert list(find_all(numbers, 0)) == list(range(0, 100, 7))
+        finally:
+            search.LINEAR_SEARCH_CHUNK = chunk
+
+    def test_parallel_linear_search(self):
+        numbers = list(range(1000)) * 3
+        threshold = search.PARALLEL_SEARCH_THRESHOLD
+        search.PARALLEL_SEARCH_THRESHOLD = 100
+        try:
+            # Falls back to a serial scan where process pools are unavailable
+            assert parallel_linear_search(numbers, 999, workers=2) == 999
+            assert parallel_linear_search(numbers, 0, workers=2) == 0
+            assert parallel_linear_search(numbers, -1, workers=2) is None
+            assert parallel_linear_search(numbers, 5, workers=1) == 5
+        finally:
+            search.PARALLEL_SEARCH_THRESHOLD = threshold
+
+    def test_parallel_linear_search_in_worker_processes(self):
+        numbers = list(range(1000)) * 3
+        threshold = search.PARALLEL_SEARCH_THRESHOLD
+        search.PARALLEL_SEARCH_THRESHOLD = 0
+        try:
+            # 3000 items in 8 slices of 375, 4 in flight: a match in the
+            # first slice ships only the first 4, one in the third ships 2
+            # more as the first two come back empty, and a miss ships every
+            # slice once
+            for item, expected, slices in [(5, 5, 4), (999, 999, 6),
+                                           (-1, None, 8)]:
+                with RecordingPool() as calls:
+                    index = parallel_linear_search(numbers, item, workers=2)
+                assert index == expected
+                names = [name for name, _ in calls]
+                assert names == ['_search_chunk'] * slices
+                assert [len(args[0]) for _, args in calls] == [375] * slices
+        finally:
+            search.PARALLEL_SEARCH_THRESHOLD = threshold
+
     def test_binary_search_with_items_in_list(self):
         # binary search requires list values to be in sorted order
         names = ['Alex', 'Brian', 'Julia', 'Kojin', 'Nabil', 'Nick', 'Winnie']
@@ -44,5 +121,140 @@ class SearchTest(unittest.TestCase):
         assert binary_search(names, 'nobody') is None
 
 
+    def test_binary_search_with_equal_but_distinct_items(self):
+        # Large ints built at runtime are equal but not the same object
+        numbers = [int(str(10**12 + n)) for n in range(0, 100, 3)]
+        for index, number in enumerate(numbers):
+            query = int(str(number))
+            assert binary_search_iterative(numbers, query) == index
+            assert binary_search_recursive(numbers, query) == index
+        assert binary_search_iterative(numbers, 10**12 + 1) is None
+        assert binary_search_iterative([], 5) is None
+
+    def test_binary_search_recursive_with_bounds(self):
+        names = ['Alex', 'Brian', 'Julia', 'Kojin']
+        # right=0 is the one item range [0...0], not a missing bound
+        assert binary_search_recursive(names, 'Alex', 0, 0) == 0
+        assert binary_search_recursive(names, 'Brian', 0, 0) is None
+        assert binary_search_recursive(names, 'Julia', 2, 3) == 2
+
+    def test_bisect(self):
+        numbers = [1, 3, 3, 3, 5, 8]
+        assert bisect_left(numbers, 3) == 1
+        assert bisect_right(numbers, 3) == 4
+        assert bisect_left(numbers, 0) == 0
+        assert bisect_right(numbers, 9) == 6
+        assert bisect_left(numbers, 4) == bisect_right(numbers, 4) == 4
+        assert bisect_left(numbers, 3, 2) == 2
+        assert bisect_left([], 3) == 0
+
+    def test_bisect_with_key(self):
+        routes = [('+1', 0.01), ('+44', 0.02), ('+1415', 0.02), ('+49', 0.05)]
+
+        def cost(route):
+            return route[1]
+
+        assert bisect_left(routes, 0.02, key=cost) == 1
+        assert bisect_right(routes, 0.02, key=cost) == 3
+        assert bisect_right(routes, 0.10, key=cost) == 4
+
+    def test_galloping_search(self):
+        import random
+        numbers = sorted(random.randrange(1000) for _ in range(500))
+        for item in range(-1, 1002, 7):
+            expected = bisect_left(numbers, item)
+            assert galloping_search(numbers, item) == expected
+            assert galloping_search(numbers, item, expected // 2) == expected
+
+    def test_galloping_search_without_length(self):
+        class Squares(object):
+            """Unbounded sorted sequence without a length."""
+
+            def __getitem__(self, index):
+                return index * index
+
+        assert galloping_search(Squares(), 10**10) == 10**5
+        assert galloping_search(Squares(), 10**10 + 1) == 10**5 + 1
+
+    def test_search_many(self):
+        numbers = list(range(0, 1000, 5))
+        queries = [995, 3, 0, 500, 500, 1000, -5, 20]
+        assert search_many(numbers, queries) == [
+            199, None, 0, 100, 100, None, None, 4]
+        assert search_many([], [1, 2]) == [None, None]
+        assert search_many(numbers, []) == []
+
+    def test_search_many_matches_binary_search(self):
+        import random
+        numbers = sorted(random.sample(range(10**6), 5000))
+        queries = [random.randrange(10**6) for _ in range(2000)]
+        queries += random.sample(numbers, 1000)
+        assert search_many(numbers, queries) == [
+            binary_search(numbers, query) for query in queries]
+
+    def test_interpolation_search(self):
+        numbers = list(range(0, 1000, 5))
+        assert interpolation_search(numbers, 0) == 0
+        assert interpolation_search(numbers, 500) == 100
+        assert interpolation_search(numbers, 995) == 199
+        assert interpolation_search(numbers, 3) is None
+        assert interpolation_search(numbers, -5) is None
+        assert interpolation_search(numbers, 1000) is None
+        assert interpolation_search([], 1) is None
+        assert interpolation_search([7] * 50, 7) is not None
+        assert interpolation_search([0.5, 1.5, 2.25], 2.25) == 2
+
+    def test_interpolation_search_on_skewed_numbers(self):
+        # Exponentially growing values defeat interpolation, the binary search
+        # fallback must still find every item
+        numbers = [2**exponent for exponent in range(200)]
+        for index, number in enumerate(numbers):
+            assert interpolation_search(numbers, number) == index
+            if index > 0:  # 1 + 1 is in the list, other successors aren't
+                assert interpolation_search(numbers, number + 1) is None
+
+    def test_eytzinger_array(self):
+        import random
+        for size in [0, 1, 2, 7, 8, 100, 1023, 1024]:
+            numbers = sorted(random.sample(range(10 * size + 1), size))
+            eytzinger = EytzingerArray(numbers)
+            assert len(eytzinger) == size
+            for query in range(-1, 10 * size + 2):
+                assert eytzinger.bisect_left(query) == \
+                    bisect_left(numbers, query)
+                index = eytzinger.search(query)
+                assert index == binary_search(numbers, query)
+
+    def test_eytzinger_array_with_strings_and_big_ints(self):
+        words = sorted(['fish', 'lox', 'bagel', 'cream', 'caper'])
+        eytzinger = EytzingerArray(words)
+        assert eytzinger.search('lox') == 4
+        assert eytzinger.search('pickle') is None
+        numbers = [-2**70, 0, 2**64, 2**64 + 1]
+        eytzinger = EytzingerArray(numbers)
+        assert eytzinger.search(2**64 + 1) == 3
+        assert eytzinger.search(2**64 + 2) is None
+
+    def test_is_uniform(self):
+        assert is_uniform(list(range(0, 10000, 3)))
+        assert not is_uniform([2**exponent for exponent in range(100)])
+        assert not is_uniform([5] * 100)
+        assert not is_uniform(['a', 'b', 'c'])
+        assert not is_uniform([1])
+
+    def test_make_searcher(self):
+        threshold = search.EYTZINGER_THRESHOLD
+        search.EYTZINGER_THRESHOLD = 100
+        try:
+            for numbers in [list(range(0, 3000, 3)),
+                            [exponent ** 4 for exponent in range(1000)],
+                            list(range(50))]:
+                find = make_searcher(numbers)
+                for query in range(-1, 3001, 7):
+                    assert find(query) == binary_search(numbers, query)
+        finally:
+            search.EYTZINGER_THRESHOLD = threshold
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,5 @@
 from hashtable import HashTable
+from frozen import FrozenSet
 
 
 class Set(HashTable):
@@ -58,3 +59,7 @@ class Set(HashTable):
         """Overrides the HashTable set() method, setting value to None."""
 
         super().set(item, None)
+
+    def freeze(self) -> FrozenSet:
+        """Returns an immutable FrozenSet snapshot of this set."""
+        return FrozenSet(self)
@@ -29,6 +29,19 @@ class SetsTest(unittest.TestCase):
         mySet.set("yooo")
         assert len(mySet) == 1
 
+    def test_add_past_resize(self):
+        # The initial 8 buckets resize once 7 items exceed the load factor
+        words = ['word{}'.format(number) for number in range(100)]
+        mySet = Set(words)
+
+        assert len(mySet) == 100
+        assert len(mySet.buckets) > 8
+        for word in words:
+            assert word in mySet
+        assert 'word100' not in mySet
+        mySet.set('word0')
+        assert len(mySet) == 100
+
     def test_delete(self):
         mySet = Set(["hello", "there"])
 
@@ -1,123 +1,940 @@
 #!python
 
+import inspect
+import operator
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import wraps
+from itertools import islice
+from math import log2
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, every function works without it
+    numpy = None
+
+# Ranges at most this long are finished with insertion sort
+SMALL_SORT = 16
+# Numeric sequences at least this long are handed to NumPy when available
+NUMPY_THRESHOLD = 1000
+# array.array typecodes NumPy understands as the same machine type
+_NUMPY_TYPECODES = set('bBhHiIlLqQfd')
+
+
+def _numeric_array(items):
+    """Return a NumPy array holding items if NumPy is installed and items is a
+    long enough array.array of numbers, or list of only ints (fitting in 64
+    bits) or only floats; otherwise return None to take the pure Python path.
+    An array.array is wrapped without copying, so sorting the NumPy array in
+    place sorts items too."""
+    if numpy is None or len(items) < NUMPY_THRESHOLD:
+        return None
+    if isinstance(items, array):
+        if items.typecode not in _NUMPY_TYPECODES:
+            return None
+        return numpy.frombuffer(items, dtype=items.typecode)
+    if not isinstance(items, list):
+        return None
+    item_type = _homogeneous_type(items)
+    if item_type is float:
+        return numpy.array(items, dtype=numpy.float64)
+    if item_type is int and -2**63 <= min(items) and max(items) < 2**63:
+        return numpy.array(items, dtype=numpy.int64)
+    return None
+
+
+def _write_back(items, values):
+    """Overwrite items in place with the NumPy array of sorted values."""
+    if isinstance(items, array):
+        if values.base is not None and numpy.shares_memory(values, items):
+            return  # Already sorted in place through the view
+        items[:] = array(items.typecode, values.astype(items.typecode).tobytes())
+    else:
+        items[:] = values.tolist()
+
+
+def _keyed(sort_function=None, distribution=False):
+    """Decorate a function that sorts items in place with `<` to also accept
+    key and reverse arguments like list.sort, stably. Each key is computed
+    once, then the keys are sorted while tracking where each came from and
+    the resulting permutation is applied to items in one pass.
+    Comparison sorts sort (key, index) pairs, which also makes every entry
+    distinct so even unstable algorithms give stable results. Distribution
+    sorts (distribution=True) instead sort each distinct key once and put
+    the indexes of equal keys together, since they can't sort pairs."""
+    if sort_function is None:
+        return lambda sort_function: _keyed(sort_function, distribution)
+
+    signature = inspect.signature(sort_function)
+
+    @wraps(sort_function)
+    def keyed_sort(items, *args, key=None, reverse=False, **kwargs):
+        if key is None and not reverse:
+            return sort_function(items, *args, **kwargs)
+        keys = list(items) if key is None else [key(item) for item in items]
+        if distribution:
+            order = _grouped_argsort(
+                keys, reverse, lambda keys: sort_function(keys, *args, **kwargs))
+        else:
+            # Sorts like quick_sort may be given a range `[low...high]`
+            bound = signature.bind(items, *args, **kwargs).arguments
+            low, high = bound.get('low'), bound.get('high')
+            order = _decorated_argsort(
+                keys, reverse, lambda pairs: sort_function(pairs, *args, **kwargs),
+                0 if low is None else low, len(keys) - 1 if high is None else high)
+        _apply_permutation(items, order)
+    return keyed_sort
+
+
+def _decorated_argsort(keys, reverse, sort_pairs, low=0, high=None):
+    """Return the stable sorting permutation of keys by sorting (key, index)
+    pairs with sort_pairs, which sorts range `[low...high]` of the pairs.
+    Indexes are negated when reversing so that equal keys keep their original
+    order after the sorted range of pairs is reversed."""
+    sign = -1 if reverse else 1
+    pairs = list(zip(keys, range(0, sign * len(keys), sign)))
+    sort_pairs(pairs)
+    if reverse:
+        if high is None:
+            high = len(pairs) - 1
+        pairs[low:high + 1] = pairs[low:high + 1][::-1]
+    return [sign * index for _, index in pairs]
+
+
+def _grouped_argsort(keys, reverse, sort_keys):
+    """Return the stable sorting permutation of (hashable) keys by grouping
+    indexes of equal keys, sorting the distinct keys with sort_keys and
+    concatenating the groups in that order."""
+    groups = {}
+    for index, key in enumerate(keys):
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [index]
+        else:
+            group.append(index)
+    distinct_keys = list(groups)
+    sort_keys(distinct_keys)
+    if reverse:
+        distinct_keys.reverse()
+    order = []
+    for key in distinct_keys:
+        order.extend(groups[key])
+    return order
 
-def is_sorted(items):
-    """Return a boolean indicating whether given items are in sorted order.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Check that all adjacent items are in order, return early if not
+
+def _apply_permutation(items, order):
+    """Rearrange items in place so items[i] becomes the old items[order[i]]."""
+    permuted = [items[index] for index in order]
+    items[:] = array(items.typecode, permuted) if isinstance(items, array) \
+        else permuted
 
 
+def is_sorted(items):
+    """Return a boolean indicating whether given items are in sorted order.
+    Running time: O(n) worst case when items are sorted, every adjacent pair
+    is compared once; O(1) best case when the first pair is out of order.
+    Memory usage: O(1), pairs are compared by map in C as they are made. A
+    long array.array is compared by NumPy through a view, without a copy
+    (and without stopping early, it compares all pairs at once)."""
+    if isinstance(items, array):
+        values = _numeric_array(items)
+        if values is not None:
+            return not numpy.any(values[1:] < values[:-1])
+    # Check that no item is less than the one before it, stopping at the
+    # first that is
+    return not any(map(operator.lt, islice(items, 1, None), items))
+
+
+@_keyed
 def bubble_sort(items):
     """Sort given items by swapping adjacent items that are out of order, and
     repeating until all items are in sorted order.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Repeat until all items are in sorted order
-    # TODO: Swap adjacent items that are out of order
-
-
+    Running time: O(n^2) average and worst case, each pass bubbles one item
+    into place; O(n) best case when items are already sorted (one pass).
+    Memory usage: O(1), items are swapped in place."""
+    end = len(items)
+    swapped = True
+    # Repeat until a pass makes no swaps, then all items are in sorted order
+    while swapped:
+        swapped = False
+        for index in range(1, end):
+            # Swap adjacent items that are out of order
+            if items[index] < items[index - 1]:
+                items[index - 1], items[index] = items[index], items[index - 1]
+                swapped = True
+        end -= 1  # Largest unsorted item has bubbled to the end
+
+
+@_keyed
 def selection_sort(items):
     """Sort given items by finding minimum item, swapping it with first
     unsorted item, and repeating until all items are in sorted order.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Repeat until all items are in sorted order
-    # TODO: Find minimum item in unsorted items
-    # TODO: Swap it with first unsorted item
-
-
+    Running time: O(n^2) in every case, each pass scans all unsorted items.
+    Memory usage: O(1), items are swapped in place."""
+    for first_unsorted in range(len(items) - 1):
+        # Find minimum item in unsorted items
+        min_index = first_unsorted
+        for index in range(first_unsorted + 1, len(items)):
+            if items[index] < items[min_index]:
+                min_index = index
+        # Swap it with first unsorted item
+        items[first_unsorted], items[min_index] = \
+            items[min_index], items[first_unsorted]
+
+
+@_keyed
 def insertion_sort(items):
     """Sort given items by taking first unsorted item, inserting it in sorted
     order in front of items, and repeating until all items are in order.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Repeat until all items are in sorted order
-    # TODO: Take first unsorted item
-    # TODO: Insert it in sorted order in front of items
+    Running time: O(n^2) average and worst case (reversed items), each item
+    shifts past all sorted items; O(n) best case when items are sorted.
+    Memory usage: O(1), items are shifted in place."""
+    for first_unsorted in range(1, len(items)):
+        # Take first unsorted item
+        item = items[first_unsorted]
+        # Shift larger sorted items right, then insert it in sorted order
+        index = first_unsorted
+        while index > 0 and item < items[index - 1]:
+            items[index] = items[index - 1]
+            index -= 1
+        items[index] = item
+
+
+def _binary_insertion_sort(items, low, high, start):
+    """Sort items in range `[low...high)` in place, given that the prefix
+    `[low...start)` is already sorted. Binary search finds each insertion
+    point, and slice assignment shifts the larger items in one C-level move.
+    Running time: O(n log n) comparisons, O(n^2) moves for n = high - low.
+    Memory usage: O(1) beyond the shifted slice."""
+    for index in range(max(start, low + 1), high):
+        item = items[index]
+        position = bisect_right(items, item, low, index)  # Keeps it stable
+        if position < index:
+            items[position + 1:index + 1] = items[position:index]
+            items[position] = item
 
 
 def merge(items1, items2):
     """Merge given lists of items, each assumed to already be in sorted order,
     and return a new list containing all items in sorted order.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Repeat until one list is empty
-    # TODO: Find minimum item in both lists and append it to new list
-    # TODO: Append remaining items in non-empty list to new list
+    Running time: O(n + m), each item is compared and appended once.
+    Memory usage: O(n + m) for the new merged list."""
+    values1, values2 = _numeric_array(items1), _numeric_array(items2)
+    # Mixed dtypes would be promoted (ints to floats, losing precision)
+    if (values1 is not None and values2 is not None
+            and values1.dtype == values2.dtype):
+        # Stable sort finds the two runs and merges them in linear time,
+        # keeping items1 first on ties
+        values = numpy.concatenate((values1, values2))
+        return numpy.sort(values, kind='stable').tolist()
+    merged = []
+    index1, index2 = 0, 0
+    # Repeat until one list is empty
+    while index1 < len(items1) and index2 < len(items2):
+        # Find minimum item in both lists and append it to new list, taking
+        # from items1 on ties so equal items keep their order (stable)
+        if items2[index2] < items1[index1]:
+            merged.append(items2[index2])
+            index2 += 1
+        else:
+            merged.append(items1[index1])
+            index1 += 1
+    # Append remaining items in non-empty list to new list
+    merged.extend(items1[index1:])
+    merged.extend(items2[index2:])
+    return merged
 
 
+@_keyed
 def split_sort_merge(items):
     """Sort given items by splitting list into two approximately equal halves,
     sorting each with an iterative sorting algorithm, and merging results into
     a list in sorted order.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Split items list into approximately equal halves
-    # TODO: Sort each half using any other sorting algorithm
-    # TODO: Merge sorted halves into one list in sorted order
-
-
+    Running time: O(n^2), insertion sort on each half dominates the merge.
+    Memory usage: O(n) for the two halves and the merged list."""
+    # Split items list into approximately equal halves
+    middle = len(items) // 2
+    left, right = items[:middle], items[middle:]
+    # Sort each half using any other sorting algorithm
+    insertion_sort(left)
+    insertion_sort(right)
+    # Merge sorted halves into one list in sorted order
+    items[:] = merge(left, right)
+
+
+@_keyed
 def merge_sort(items):
-    """Sort given items by splitting list into two approximately equal halves,
-    sorting each recursively, and merging results into a list in sorted order.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Check if list is so small it's already sorted (base case)
-    # TODO: Split items list into approximately equal halves
-    # TODO: Sort each half by recursively calling merge sort
-    # TODO: Merge sorted halves into one list in sorted order
+    """Sort given items in place and stably by sorting small blocks with
+    insertion sort, then merging adjacent sorted ranges bottom-up, doubling
+    their width each pass, through one buffer allocated up front.
+    Running time: O(n log n) in every case, log n passes of O(n) merges;
+    O(n) on sorted items since ordered neighbours are not merged.
+    Memory usage: O(n/2), the only allocation is the shared merge buffer;
+    there is no recursion and no list slicing."""
+    n = len(items)
+    # Check if list is so small it's already sorted (base case)
+    if n < 2:
+        return
+    # Sort each block of SMALL_SORT items with insertion sort
+    width = SMALL_SORT
+    for low in range(0, n, width):
+        _binary_insertion_sort(items, low, min(low + width, n), low + 1)
+    # Merge pairs of adjacent sorted blocks until one block spans the list
+    buffer = [None] * (n // 2)
+    while width < n:
+        for low in range(0, n - width, 2 * width):
+            _merge_ranges(items, low, low + width, min(low + 2 * width, n),
+                          buffer)
+        width *= 2
+
+
+def _median_of_three(items, a, b, c):
+    """Return whichever index of a, b and c holds the median item."""
+    if items[a] < items[b]:
+        if items[b] < items[c]:
+            return b
+        return c if items[a] < items[c] else a
+    if items[a] < items[c]:
+        return a
+    return c if items[b] < items[c] else b
+
+
+def _choose_pivot(items, low, high):
+    """Return the index of a pivot for range `[low...high]`: the median of the
+    first, middle and last items, or for large ranges the ninther (median of
+    three medians of three), which resists organ-pipe and sawtooth inputs."""
+    middle = (low + high) // 2
+    if high - low < 128:
+        return _median_of_three(items, low, middle, high)
+    step = (high - low) // 8
+    return _median_of_three(
+        items,
+        _median_of_three(items, low, low + step, low + 2 * step),
+        _median_of_three(items, middle - step, middle, middle + step),
+        _median_of_three(items, high - 2 * step, high - step, high))
 
 
 def partition(items, low, high):
     """Return index `p` after in-place partitioning given items in range
-    `[low...high]` by choosing a pivot (TODO: document your method here) from
-    that range, moving pivot into index `p`, items less than pivot into range
-    `[low...p-1]`, and items greater than pivot into range `[p+1...high]`.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Choose a pivot any way and document your method in docstring above
-    # TODO: Loop through all items in range [low...high]
-    # TODO: Move items less than pivot into front of range [low...p-1]
-    # TODO: Move items greater than pivot into back of range [p+1...high]
-    # TODO: Move pivot item into final position [p] and return index p
+    `[low...high]` by choosing a pivot (see _choose_pivot: median of three,
+    or ninther for large ranges, so sorted and reversed ranges split evenly)
+    from that range, moving pivot into index `p`, items less than pivot into
+    range `[low...p-1]`, and items greater than pivot into range `[p+1...high]`.
+    Running time: O(n) for n = high - low + 1, each item is compared once.
+    Memory usage: O(1), items are swapped in place."""
+    # Choose a pivot and move it to the end of the range
+    pivot_index = _choose_pivot(items, low, high)
+    items[pivot_index], items[high] = items[high], items[pivot_index]
+    pivot = items[high]
+    # Loop through all items in range [low...high-1], moving items less than
+    # pivot into front of range [low...p-1] so the rest end up in [p...high-1]
+    p = low
+    for index in range(low, high):
+        if items[index] < pivot:
+            items[index], items[p] = items[p], items[index]
+            p += 1
+    # Move pivot item into final position [p] and return index p
+    items[p], items[high] = items[high], items[p]
+    return p
+
+
+def partition3(items, low, high):
+    """Return indexes `(lt, gt)` after in-place three-way partitioning given
+    items in range `[low...high]` around a pivot chosen as in partition, with
+    items less than pivot in `[low...lt-1]`, items equal to pivot in
+    `[lt...gt]` and items greater than pivot in `[gt+1...high]` (Dijkstra's
+    Dutch national flag). Runs of duplicates are finished in one pass instead
+    of being partitioned again and again.
+    Running time: O(n) for n = high - low + 1, at most two comparisons each.
+    Memory usage: O(1), items are swapped in place."""
+    pivot = items[_choose_pivot(items, low, high)]
+    lt, index, gt = low, low, high
+    while index <= gt:
+        item = items[index]
+        if item < pivot:
+            items[index] = items[lt]
+            items[lt] = item
+            lt += 1
+            index += 1
+        elif pivot < item:
+            items[index] = items[gt]
+            items[gt] = item
+            gt -= 1
+        else:
+            index += 1
+    return lt, gt
 
 
+@_keyed
 def quick_sort(items, low=None, high=None):
-    """Sort given items in place by partitioning items in range `[low...high]`
-    around a pivot item and recursively sorting each remaining sublist range.
-    TODO: Best case running time: ??? Why and under what conditions?
-    TODO: Worst case running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Check if high and low range bounds have default values (not given)
-    # TODO: Check if list or range is so small it's already sorted (base case)
-    # TODO: Partition items in-place around a pivot and get index of pivot
-    # TODO: Sort each sublist range by recursively calling quick sort
-
-
-def counting_sort(numbers):
-    """Sort given numbers (integers) by counting occurrences of each number,
-    then looping over counts and copying that many numbers into output list.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Find range of given numbers (minimum and maximum integer values)
-    # TODO: Create list of counts with a slot for each number in input range
-    # TODO: Loop over given numbers and increment each number's count
-    # TODO: Loop over counts and append that many numbers into output list
-    # FIXME: Improve this to mutate input instead of creating new output list
+    """Sort given items in place by three-way partitioning items in range
+    `[low...high]` around a pivot item and sorting each remaining sublist
+    range as an introsort: ranges of at most SMALL_SORT items are finished
+    with insertion sort, and ranges still unsorted after 2 log n partitions
+    are finished with heap sort.
+    Best case running time: O(n) when all items are equal, one partition
+    pass puts them all in place; O(n log n) when pivots split ranges evenly.
+    Worst case running time: O(n log n), the heap sort fallback caps the
+    cost of unlucky pivots that would make plain quick sort O(n^2).
+    Memory usage: O(log n) stack, only the smaller range is recursed on."""
+    # Check if high and low range bounds have default values (not given)
+    if low is None:
+        low = 0
+    if high is None:
+        high = len(items) - 1
+    # Check if list or range is so small it's already sorted (base case)
+    if low < high:
+        _introsort(items, low, high, 2 * int(log2(high - low + 1)))
+
+
+def _sift_down(items, offset, root, end):
+    """Move the item at heap index root down the max heap stored in
+    `items[offset...offset+end)` until both of its children are smaller."""
+    item = items[offset + root]
+    child = 2 * root + 1
+    while child < end:
+        if child + 1 < end and items[offset + child] < items[offset + child + 1]:
+            child += 1
+        if not item < items[offset + child]:
+            break
+        items[offset + root] = items[offset + child]
+        root = child
+        child = 2 * root + 1
+    items[offset + root] = item
+
+
+@_keyed
+def heap_sort(items, low=0, high=None):
+    """Sort given items in range `[low...high]` in place by building a max
+    heap and repeatedly swapping its largest item to the end of the range.
+    Running time: O(n log n) in every case, n sift downs of O(log n) each.
+    Memory usage: O(1), the heap lives in the items themselves."""
+    if high is None:
+        high = len(items) - 1
+    size = high - low + 1
+    for root in range(size // 2 - 1, -1, -1):
+        _sift_down(items, low, root, size)
+    for end in range(size - 1, 0, -1):
+        items[low], items[low + end] = items[low + end], items[low]
+        _sift_down(items, low, 0, end)
+
+
+def _introsort(items, low, high, depth):
+    """Quick sort range `[low...high]` in place, switching to heap sort once
+    depth partitions deep (so bad pivots can't go quadratic) and to insertion
+    sort for ranges of at most SMALL_SORT items."""
+    while high - low >= SMALL_SORT:
+        if depth == 0:
+            heap_sort(items, low, high)
+            return
+        depth -= 1
+        lt, gt = partition3(items, low, high)
+        # Recurse on the smaller sublist range and loop on the larger one
+        if lt - low < high - gt:
+            _introsort(items, low, lt - 1, depth)
+            low = gt + 1
+        else:
+            _introsort(items, gt + 1, high, depth)
+            high = lt - 1
+    _binary_insertion_sort(items, low, high + 1, low + 1)
 
 
+@_keyed(distribution=True)
+def counting_sort(numbers, max_range_factor=4):
+    """Sort given numbers (integers) by counting occurrences of each number,
+    then looping over counts and copying that many numbers into output list.
+    If the range of numbers is more than max_range_factor times their count
+    (plus a little slack for short lists), counting would cost more than it
+    saves, so numbers are sorted with quick_sort instead.
+    Running time: O(n + k) for k = max - min + 1, one pass to count and one
+    pass over the counts; O(n log n) when the range is too wide.
+    Memory usage: O(k) for an array of counts, numbers are overwritten in
+    place."""
+    if len(numbers) < 2:
+        return
+    values = _numeric_array(numbers)
+    if values is not None and values.dtype.kind not in 'iu':
+        values = None  # Floats can't be counted
+    # Find range of given numbers (minimum and maximum integer values)
+    if values is not None:
+        minimum, maximum = int(values.min()), int(values.max())
+    else:
+        minimum, maximum = min(numbers), max(numbers)
+    num_counts = maximum - minimum + 1
+    if num_counts > max_range_factor * len(numbers) + 1024:
+        if values is not None:
+            values.sort()
+            _write_back(numbers, values)
+        else:
+            quick_sort(numbers)
+        return
+    if values is not None:
+        counts = numpy.bincount(values - minimum, minlength=num_counts)
+        values = numpy.repeat(
+            numpy.arange(minimum, maximum + 1, dtype=values.dtype), counts)
+        _write_back(numbers, values)
+        return
+    if isinstance(numbers, array):
+        # Counts are written back as list slices, which arrays reject
+        copy = numbers.tolist()
+        counting_sort(copy, max_range_factor)
+        numbers[:] = array(numbers.typecode, copy)
+        return
+    # Create array of counts with a slot for each number in input range
+    counts = array('q', bytes(8 * num_counts))
+    # Loop over given numbers and increment each number's count
+    for number in numbers:
+        counts[number - minimum] += 1
+    # Loop over counts and write that many numbers back into the input list
+    index = 0
+    for offset, count in enumerate(counts):
+        if count:
+            numbers[index:index + count] = [minimum + offset] * count
+            index += count
+
+
+@_keyed(distribution=True)
 def bucket_sort(numbers, num_buckets=10):
     """Sort given numbers by distributing into buckets representing subranges,
     sorting each bucket, and combining contents of all buckets in sorted order.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Find range of given numbers (minimum and maximum integer values)
-    # TODO: Create list of buckets to store numbers in subranges of input range
-    # TODO: Loop over given numbers and place each item in appropriate bucket
-    # TODO: Sort each bucket using any sorting algorithm (recursive or another)
-    # TODO: Loop over buckets and append each bucket's numbers into output list
-    # FIXME: Improve this to mutate input instead of creating new output list
+    Running time: O(n + b) average when numbers are spread evenly over their
+    range; O(n log n) worst case when most numbers land in one bucket, since
+    buckets are sorted with the hybrid sort.
+    Memory usage: O(n + b) for the buckets, numbers are overwritten in place.
+    """
+    if len(numbers) < 2:
+        return
+    values = _numeric_array(numbers)
+    if values is not None:
+        # Distributing into buckets and sorting each gives exactly the sorted
+        # order, which NumPy's vectorized sort reaches directly
+        values.sort(kind='stable')
+        _write_back(numbers, values)
+        return
+    if isinstance(numbers, array):
+        # Buckets are written back as list slices, which arrays reject
+        copy = numbers.tolist()
+        bucket_sort(copy, num_buckets)
+        numbers[:] = array(numbers.typecode, copy)
+        return
+    # Find range of given numbers (minimum and maximum values)
+    minimum, maximum = min(numbers), max(numbers)
+    if minimum == maximum:
+        return
+    # Create list of buckets to store numbers in subranges of input range
+    buckets = [[] for _ in range(num_buckets)]
+    width = (maximum - minimum) / num_buckets
+    # Loop over given numbers and place each item in appropriate bucket
+    for number in numbers:
+        index = min(int((number - minimum) / width), num_buckets - 1)
+        buckets[index].append(number)
+    # Sort each bucket and write its numbers back into the input list
+    index = 0
+    for bucket in buckets:
+        _sort_ascending(bucket)
+        numbers[index:index + len(bucket)] = bucket
+        index += len(bucket)
+
+
+@_keyed(distribution=True)
+def radix_sort(numbers, digit_bits=8):
+    """Sort given non-negative integers in place with a least significant
+    digit first radix sort: one stable counting pass per digit of digit_bits
+    bits, from the lowest digit to the highest. Numbers are copied into
+    array.array buffers of unsigned 64-bit words when they fit, so a pass
+    moves machine integers rather than list slots. Passes whose digit is the
+    same for every number (like a shared country code) are skipped.
+    Running time: O(w/d * (n + 2^d)) for w-bit numbers, linear in n.
+    Memory usage: O(n + 2^d) for the two buffers and the digit counts."""
+    n = len(numbers)
+    if n < 2:
+        return
+    minimum, maximum = min(numbers), max(numbers)
+    assert minimum >= 0, 'number is negative: {}'.format(minimum)
+    typecode = 'Q' if maximum < 1 << 64 else None
+    if typecode is None:  # Python ints too wide for a machine word
+        source, target = list(numbers), [0] * n
+    else:
+        source, target = array(typecode, numbers), array(typecode, bytes(8 * n))
+    radix = 1 << digit_bits
+    mask = radix - 1
+    for shift in range(0, maximum.bit_length(), digit_bits):
+        counts = [0] * radix
+        for number in source:
+            counts[(number >> shift) & mask] += 1
+        if counts[(source[0] >> shift) & mask] == n:
+            continue  # Every number has the same digit here
+        # Turn counts into the starting position of each digit's numbers
+        position = 0
+        for digit in range(radix):
+            count = counts[digit]
+            counts[digit] = position
+            position += count
+        for number in source:
+            digit = (number >> shift) & mask
+            target[counts[digit]] = number
+            counts[digit] += 1
+        source, target = target, source
+    if isinstance(numbers, array):  # Arrays only accept arrays into slices
+        numbers[:] = array(numbers.typecode, source)
+    else:
+        numbers[:] = source if typecode is None else source.tolist()
+
+
+@_keyed(distribution=True)
+def msd_radix_sort(strings):
+    """Sort given strings (or bytes) in place with a most significant digit
+    first radix sort: distribute strings into buckets by their character at
+    the current position, then sort each bucket by the next position. Shorter
+    strings end their bucket first, so variable lengths sort correctly, and
+    small buckets are finished with insertion sort.
+    Running time: O(n * w) for strings of w characters, like fixed-width
+    phone numbers, and only the distinguishing prefix is ever examined.
+    Memory usage: O(n) for the buckets at one position, plus a stack of
+    pending ranges instead of recursion."""
+    stack = [(0, len(strings), 0)]  # Ranges of strings sharing a prefix
+    while stack:
+        low, high, position = stack.pop()
+        if high - low <= SMALL_SORT:
+            _binary_insertion_sort(strings, low, high, low + 1)
+            continue
+        buckets = {}
+        for index in range(low, high):
+            string = strings[index]
+            # Empty slice past the end sorts before every character
+            character = string[position:position + 1]
+            bucket = buckets.get(character)
+            if bucket is None:
+                buckets[character] = [string]
+            else:
+                bucket.append(string)
+        index = low
+        for character in sorted(buckets):
+            bucket = buckets[character]
+            strings[index:index + len(bucket)] = bucket
+            if character and len(bucket) > 1:
+                stack.append((index, index + len(bucket), position + 1))
+            index += len(bucket)
+
+
+def _min_run(n):
+    """Return the minimum run length for merging n items: between 16 and 32,
+    chosen so n / min_run is close to (and at most) a power of two, which
+    keeps the merges balanced."""
+    extra = 0
+    while n >= 32:
+        extra |= n & 1
+        n >>= 1
+    return n + extra
+
+
+def _count_run(items, low, high):
+    """Return the end of the natural run starting at low, reversing it in place
+    first if it is strictly descending (strictly, so reversing is stable)."""
+    end = low + 1
+    if end == high:
+        return end
+    if items[end] < items[low]:
+        while end + 1 < high and items[end + 1] < items[end]:
+            end += 1
+        items[low:end + 1] = items[low:end + 1][::-1]
+    else:
+        while end + 1 < high and not items[end + 1] < items[end]:
+            end += 1
+    return end + 1
+
+
+def _merge_ranges(items, low, middle, high, buffer):
+    """Stably merge the adjacent sorted ranges `[low...middle)` and
+    `[middle...high)` of items in place. Only the shorter range is copied, into
+    the given buffer, which must hold at least (high - low) // 2 items.
+    Running time: O(n) for n = high - low, less when the ranges overlap only
+    partly since items already in their final place are skipped.
+    Memory usage: O(1), the buffer is reused across merges."""
+    if not items[middle] < items[middle - 1]:
+        return  # Already in order, common for partially sorted data
+    # Left items smaller than the first right item and right items larger
+    # than the last left item are already in their final places
+    low = bisect_right(items, items[middle], low, middle)
+    high = bisect_left(items, items[middle - 1], middle, high)
+    if middle - low <= high - middle:
+        # Copy the left range out and merge forwards from the front
+        size = middle - low
+        for index in range(size):
+            buffer[index] = items[low + index]
+        left, right, index = 0, middle, low
+        while left < size and right < high:
+            if items[right] < buffer[left]:
+                items[index] = items[right]
+                right += 1
+            else:
+                items[index] = buffer[left]
+                left += 1
+            index += 1
+        # Remaining right items are already in place
+        while left < size:
+            items[index] = buffer[left]
+            left += 1
+            index += 1
+    else:
+        # Copy the right range out and merge backwards from the end
+        size = high - middle
+        for index in range(size):
+            buffer[index] = items[middle + index]
+        right, left, index = size - 1, middle - 1, high - 1
+        while right >= 0 and left >= low:
+            if buffer[right] < items[left]:
+                items[index] = items[left]
+                left -= 1
+            else:
+                items[index] = buffer[right]
+                right -= 1
+            index -= 1
+        # Remaining left items are already in place
+        while right >= 0:
+            items[index] = buffer[right]
+            right -= 1
+            index -= 1
+
+
+def _merge_runs(items):
+    """Stably sort items by finding natural runs, extending short runs to
+    min_run with insertion sort, and merging runs off a stack while keeping
+    run lengths balanced as in timsort.
+    Running time: O(n) on presorted or reversed items, O(n log n) worst case.
+    Memory usage: O(n/2) for the merge buffer shared by all merges."""
+    n = len(items)
+    min_run = _min_run(n)
+    runs = []  # Stack of (start, length) of the pending sorted runs
+    buffer = [None] * (n // 2)
+
+    def merge_at(i):
+        start, length = runs[i]
+        _, next_length = runs[i + 1]
+        _merge_ranges(items, start, start + length, start + length + next_length,
+                      buffer)
+        runs[i:i + 2] = [(start, length + next_length)]
+
+    low = 0
+    while low < n:
+        end = _count_run(items, low, n)
+        if end - low < min_run:
+            forced_end = min(low + min_run, n)
+            _binary_insertion_sort(items, low, forced_end, end)
+            end = forced_end
+        runs.append((low, end - low))
+        # Merge until every run is longer than the two above it combined
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if ((i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1]) or
+                    (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1])):
+                if runs[i - 1][1] < runs[i + 1][1]:
+                    i -= 1
+            elif runs[i][1] > runs[i + 1][1]:
+                break
+            merge_at(i)
+        low = end
+    while len(runs) > 1:
+        merge_at(len(runs) - 2)
+
+
+def _homogeneous_type(items):
+    """Return the exact type shared by all items, or None if they differ."""
+    item_type = type(items[0])
+    for item in items:
+        if type(item) is not item_type:
+            return None
+    return item_type
+
+
+def _sort_ascending(items):
+    """Sort items in place, choosing an algorithm from their size, presortedness
+    and type. The result is stable whenever equal items can be told apart."""
+    n = len(items)
+    if n <= SMALL_SORT:
+        _binary_insertion_sort(items, 0, n, 1)
+        return
+    item_type = _homogeneous_type(items)
+    if item_type is int:
+        minimum, maximum = min(items), max(items)
+        if maximum - minimum <= 2 * n:  # Dense integers: linear time
+            counting_sort(items)
+            return
+    if item_type in (int, str, bytes):
+        # Equal ints and strings are indistinguishable, so an unstable sort is
+        # safe. Use introsort unless the items look mostly ordered either way.
+        descents = ascents = 0
+        for index in range(1, n):
+            if items[index] < items[index - 1]:
+                descents += 1
+            elif items[index - 1] < items[index]:
+                ascents += 1
+        if min(descents, ascents) * _min_run(n) > n:
+            if item_type is int and minimum >= 0 and maximum.bit_length() <= 48:
+                radix_sort(items)  # At most 6 linear passes
+            elif item_type is int:
+                quick_sort(items)
+            else:
+                msd_radix_sort(items)
+            return
+    _merge_runs(items)
+
+
+def sort(items, key=None, reverse=False):
+    """Sort given items in place, like list.sort, with an adaptive hybrid of
+    the algorithms above: insertion sort for small inputs, counting sort for
+    dense integers, merging of natural runs for presorted data (and for any
+    items where stability is observable), and for shuffled items radix sort
+    on non-negative ints of at most 48 bits, introsort on other ints and MSD
+    radix sort on strings. Keys are computed once per item.
+    Running time: O(n) on sorted, reversed or dense integer items, O(n log n)
+    worst case.
+    Long numeric lists and array.arrays are sorted with NumPy when it is
+    installed, see _numeric_array.
+    Memory usage: O(n) worst case for merging, O(log n) for introsort."""
+    n = len(items)
+    if n < 2:
+        return
+    if key is None:
+        values = _numeric_array(items)
+        if values is not None:
+            # Sorting the reversed view reverses, sorts and reverses back
+            (values[::-1] if reverse else values).sort(kind='stable')
+            _write_back(items, values)
+            return
+    if isinstance(items, array):
+        # The pure Python sorts assign lists to slices, which arrays reject
+        copy = items.tolist()
+        sort(copy, key, reverse)
+        items[:] = array(items.typecode, copy)
+        return
+    if key is None:
+        if reverse:
+            # Reversing before and after a stable ascending sort gives a
+            # stable descending sort: equal items keep their original order
+            items.reverse()
+            _sort_ascending(items)
+            items.reverse()
+        else:
+            _sort_ascending(items)
+        return
+    _apply_permutation(items, argsort(items, key, reverse))
+
+
+def argsort(items, key=None, reverse=False):
+    """Return the list of indexes that would sort given items, so that
+    `[items[i] for i in argsort(items)]` is sorted, without changing items.
+    Use it to reorder several parallel columns the same way. Equal items keep
+    their original order (stable), also when reverse is True. Each key is
+    computed once and the keys are sorted with sort's adaptive choices:
+    NumPy for numeric keys when installed, counting or radix sort on the
+    distinct keys when they are all ints or strings, and sorting of
+    (key, index) pairs otherwise.
+    Running time: O(n log n) worst case, O(n) for dense integer keys.
+    Memory usage: O(n) for the keys and the permutation."""
+    keys = list(items) if key is None else [key(item) for item in items]
+    if not keys:
+        return []
+    values = _numeric_array(keys)
+    if values is not None:
+        if reverse:
+            # Reverse, stably sort, reverse back, then map indexes of the
+            # reversed keys back to indexes of the original keys
+            order = numpy.argsort(values[::-1], kind='stable')[::-1]
+            return (len(keys) - 1 - order).tolist()
+        return numpy.argsort(values, kind='stable').tolist()
+    if _homogeneous_type(keys) in (int, str, bytes):
+        return _grouped_argsort(keys, reverse, _sort_ascending)
+    return _decorated_argsort(keys, reverse, _sort_ascending)
+
+
+def nth_element(items, n, low=0, high=None):
+    """Rearrange given items in range `[low...high]` in place so that the item
+    at index `n` is the one that would be there if the range were sorted, with
+    no greater items before it and no smaller items after it, and return it.
+    This is quickselect: three-way partition around a pivot as in quick sort,
+    but only keep going in the part containing index n. Like introsort it
+    gives up on unlucky pivots after 2 log n partitions and sorts the part
+    left with heap sort.
+    Running time: O(n) expected, each partition shrinks the range by a
+    constant factor on average; O(n log n) worst case.
+    Memory usage: O(1), there is no recursion."""
+    if high is None:
+        high = len(items) - 1
+    assert low <= n <= high, 'index is out of range: {}'.format(n)
+    depth = 2 * int(log2(high - low + 1))
+    while high - low >= SMALL_SORT:
+        if depth == 0:
+            heap_sort(items, low, high)
+            return items[n]
+        depth -= 1
+        lt, gt = partition3(items, low, high)
+        if n < lt:
+            high = lt - 1
+        elif n > gt:
+            low = gt + 1
+        else:
+            return items[n]  # Index n holds a copy of the pivot
+    _binary_insertion_sort(items, low, high + 1, low + 1)
+    return items[n]
+
+
+def partial_sort(items, k, key=None, reverse=False):
+    """Rearrange given items in place so the first k are the k smallest items
+    in sorted order (or the k largest if reverse is True, and by key if one
+    is given); the order of the rest is unspecified. Use it instead of a
+    full sort when only a prefix is wanted, like the cheapest 10 routes.
+    Running time: O(n + k log k), selection then sorting only the prefix;
+    O(n log k) with a key or reverse, which select through top_k.
+    Memory usage: O(log k) for quick sort on the prefix; O(n) with a key."""
+    if key is not None or reverse:
+        # Pick the indexes of the best k keys stably, the rest keep their order
+        keys = list(items) if key is None else [key(item) for item in items]
+        best = top_k(range(len(items)), k, key=keys.__getitem__,
+                     reverse=reverse)
+        chosen = set(best)
+        best.extend(index for index in range(len(items))
+                    if index not in chosen)
+        _apply_permutation(items, best)
+        return
+    if k >= len(items):
+        sort(items)
+        return
+    if k <= 0:
+        return
+    nth_element(items, k - 1)
+    quick_sort(items, 0, k - 2)  # items[k - 1] is already in place
+
+
+def top_k(iterable, k, key=None, reverse=False):
+    """Return a sorted list of the k smallest items of the given iterable, or
+    the k largest if reverse is True, consuming it in a single pass so it can
+    be a stream of any length. A heap holds the best k items seen so far, and
+    each new item only has to beat the worst of them (the heap root).
+    Equal items are returned in the order they arrived (stable).
+    Running time: O(n log k), O(n) when few items beat the current top k.
+    Memory usage: O(k), only the heap is kept."""
+    import heapq
+    if reverse:
+        return heapq.nlargest(k, iterable, key=key)
+    return heapq.nsmallest(k, iterable, key=key)
+
+
+# Every sorting function that sorts a whole list in place, by name
+SORTS = {
+    'bubble_sort': bubble_sort,
+    'selection_sort': selection_sort,
+    'insertion_sort': insertion_sort,
+    'split_sort_merge': split_sort_merge,
+    'merge_sort': merge_sort,
+    'quick_sort': quick_sort,
+    'heap_sort': heap_sort,
+    'counting_sort': counting_sort,
+    'bucket_sort': bucket_sort,
+    'radix_sort': radix_sort,
+    'msd_radix_sort': msd_radix_sort,
+    'sort': sort,
+}
 
 
 def random_ints(count=20, min=1, max=50):
@@ -161,16 +978,14 @@ def main():
     # Get sort function by name
     if len(args) >= 1:
         sort_name = args[0]
-        # Terrible hack abusing globals
-        if sort_name in globals():
-            sort_function = globals()[sort_name]
+        if sort_name in SORTS:
+            sort_function = SORTS[sort_name]
         else:
             # Don't explode, just warn user and show list of sorting functions
             print('Sorting function {!r} does not exist'.format(sort_name))
             print('Available sorting functions:')
-            for name in globals():
-                if name.find('sort') >= 0:
-                    print('    {}'.format(name))
+            for name in SORTS:
+                print('    {}'.format(name))
             return
 
     # Get num_items and max_value, but don't explode if input is not an integer
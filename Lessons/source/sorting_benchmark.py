@@ -0,0 +1,243 @@
+#!python
+
+import csv
+import json
+import random
+from timeit import default_timer as timer
+from sorting import SORTS, is_sorted
+
+# Sizes swept by default, from where insertion sort wins to where it is hopeless
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+# Quadratic sorts are only run up to this size, past it they take minutes
+QUADRATIC_SORTS = {'bubble_sort', 'selection_sort', 'insertion_sort',
+                   'split_sort_merge'}
+QUADRATIC_MAX_SIZE = 2000
+
+
+def random_items(size, rng):
+    return [rng.randrange(size * 10) for _ in range(size)]
+
+
+def sorted_items(size, rng):
+    return list(range(size))
+
+
+def reversed_items(size, rng):
+    return list(range(size, 0, -1))
+
+
+def few_unique_items(size, rng):
+    return [rng.randrange(4) for _ in range(size)]
+
+
+def organ_pipe_items(size, rng):
+    """Ascending then descending, a classic bad case for naive pivots."""
+    half = size // 2
+    return list(range(half)) + list(range(size - half, 0, -1))
+
+
+def nearly_sorted_items(size, rng, swaps=None):
+    """Sorted items with k random pairs swapped, k = sqrt(size) by default."""
+    items = list(range(size))
+    for _ in range(int(size ** 0.5) if swaps is None else swaps):
+        i, j = rng.randrange(size), rng.randrange(size)
+        items[i], items[j] = items[j], items[i]
+    return items
+
+
+DISTRIBUTIONS = {
+    'random': random_items,
+    'sorted': sorted_items,
+    'reversed': reversed_items,
+    'few_unique': few_unique_items,
+    'organ_pipe': organ_pipe_items,
+    'nearly_sorted': nearly_sorted_items,
+}
+
+
+class CountedItem(object):
+    """Wraps an item and counts every comparison made between wrapped items.
+    Sorts that do arithmetic on their items (counting, bucket and radix sort)
+    can't sort these, so they report no comparison count."""
+
+    comparisons = 0
+    __slots__ = ['item']
+
+    def __init__(self, item):
+        self.item = item
+
+    def __lt__(self, other):
+        CountedItem.comparisons += 1
+        return self.item < other.item
+
+
+class CountedList(list):
+    """List that counts writes of items into it. A swap is two writes, and a
+    slice assignment counts one write per item assigned."""
+
+    def __init__(self, items):
+        super().__init__(items)
+        self.writes = 0
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self.writes += len(value)
+        else:
+            self.writes += 1
+        super().__setitem__(index, value)
+
+
+def measure(sort_function, items, repeat=3):
+    """Return the best wall time of sorting copies of items, the number of
+    comparisons made and items written while sorting another copy (both None
+    if sort_function can't sort instrumented items), or None if sort_function
+    can't sort items at all (like msd_radix_sort given ints)."""
+    best = None
+    for _ in range(repeat):
+        copy = list(items)
+        start = timer()
+        try:
+            sort_function(copy)
+        except TypeError:
+            return None
+        elapsed = timer() - start
+        assert is_sorted(copy), '{} failed'.format(sort_function.__name__)
+        best = elapsed if best is None else min(best, elapsed)
+
+    counted = CountedList(CountedItem(item) for item in items)
+    CountedItem.comparisons = 0
+    try:
+        sort_function(counted)
+    except TypeError:
+        return best, None, None
+    return best, CountedItem.comparisons, counted.writes
+
+
+def run_benchmarks(sorts=None, distributions=None, sizes=None, repeat=3,
+                   seed=0):
+    """Time every named sort on every named distribution at every size and
+    return a list of result dicts, one per run."""
+    sorts = sorts or list(SORTS)
+    distributions = distributions or list(DISTRIBUTIONS)
+    sizes = sizes or DEFAULT_SIZES
+    results = []
+    for distribution in distributions:
+        for size in sizes:
+            items = DISTRIBUTIONS[distribution](size, random.Random(seed))
+            for name in sorts:
+                if name in QUADRATIC_SORTS and size > QUADRATIC_MAX_SIZE:
+                    continue
+                measured = measure(SORTS[name], items, repeat)
+                if measured is None:
+                    continue
+                seconds, comparisons, writes = measured
+                results.append({
+                    'sort': name,
+                    'distribution': distribution,
+                    'size': size,
+                    'seconds': seconds,
+                    'comparisons': comparisons,
+                    'writes': writes,
+                })
+    return results
+
+
+def write_json(results, path):
+    with open(path, 'w') as json_file:
+        json.dump(results, json_file, indent=2)
+
+
+def write_csv(results, path):
+    fields = ['sort', 'distribution', 'size', 'seconds', 'comparisons',
+              'writes']
+    with open(path, 'w', newline='') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def write_plots(results, prefix):
+    """Save one log-log plot of time against size per distribution, with a
+    line per sort, as prefix-distribution.png. Needs matplotlib; returns the
+    list of files written, which is empty if matplotlib is not installed."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')  # Render to files, no display needed
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return []
+    paths = []
+    for distribution in dict.fromkeys(result['distribution']
+                                      for result in results):
+        figure, axes = plt.subplots()
+        runs = [result for result in results
+                if result['distribution'] == distribution]
+        for name in dict.fromkeys(result['sort'] for result in runs):
+            points = [(result['size'], result['seconds'])
+                      for result in runs if result['sort'] == name]
+            axes.plot(*zip(*points), marker='o', label=name)
+        axes.set_xscale('log')
+        axes.set_yscale('log')
+        axes.set_xlabel('items')
+        axes.set_ylabel('seconds')
+        axes.set_title('{} items'.format(distribution))
+        axes.legend(fontsize='small')
+        path = '{}-{}.png'.format(prefix, distribution)
+        figure.savefig(path)
+        plt.close(figure)
+        paths.append(path)
+    return paths
+
+
+def print_table(results):
+    print('{:16} {:14} {:>8} {:>11} {:>12} {:>12}'.format(
+        'sort', 'distribution', 'size', 'seconds', 'comparisons', 'writes'))
+    for result in results:
+        print('{sort:16} {distribution:14} {size:>8} {seconds:>11.6f} '
+              '{comparisons!s:>12} {writes!s:>12}'.format(**result))
+
+
+def main():
+    """Read command-line arguments and benchmark sorting algorithms."""
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Benchmark the sorting algorithms in sorting.py')
+    parser.add_argument('--sorts', help='comma separated sort names',
+                        default=','.join(SORTS))
+    parser.add_argument('--distributions', default=','.join(DISTRIBUTIONS),
+                        help='comma separated input distributions')
+    parser.add_argument('--sizes', help='comma separated input sizes',
+                        default=','.join(str(size) for size in DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per measurement, the best is kept')
+    parser.add_argument('--output', default='sorting_benchmark',
+                        help='prefix of the .json, .csv and .png result files')
+    args = parser.parse_args()
+
+    sorts = args.sorts.split(',')
+    distributions = args.distributions.split(',')
+    for name in sorts:
+        if name not in SORTS:
+            parser.error('unknown sort {!r}, choose from {}'.format(
+                name, ', '.join(SORTS)))
+    for name in distributions:
+        if name not in DISTRIBUTIONS:
+            parser.error('unknown distribution {!r}, choose from {}'.format(
+                name, ', '.join(DISTRIBUTIONS)))
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = run_benchmarks(sorts, distributions, sizes, args.repeat)
+    print_table(results)
+    write_json(results, args.output + '.json')
+    write_csv(results, args.output + '.csv')
+    print('Wrote {0}.json and {0}.csv'.format(args.output))
+    plots = write_plots(results, args.output)
+    if plots:
+        print('Wrote ' + ', '.join(plots))
+    else:
+        print('Install matplotlib to also plot the results')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!python
+
+from sorting_benchmark import (DISTRIBUTIONS, measure, run_benchmarks,
+                               write_csv, write_json)
+from sorting import insertion_sort, counting_sort, msd_radix_sort
+import csv
+import json
+import os
+import random
+import tempfile
+import unittest
+
+
+class SortingBenchmarkTest(unittest.TestCase):
+
+    def test_distributions(self):
+        for name, make_items in DISTRIBUTIONS.items():
+            items = make_items(101, random.Random(0))
+            assert len(items) == 101, name
+        assert DISTRIBUTIONS['sorted'](5, None) == [0, 1, 2, 3, 4]
+        assert DISTRIBUTIONS['reversed'](3, None) == [3, 2, 1]
+        assert DISTRIBUTIONS['organ_pipe'](6, None) == [0, 1, 2, 3, 2, 1]
+
+    def test_measure_counts_comparisons_and_writes(self):
+        seconds, comparisons, writes = measure(insertion_sort, [3, 2, 1], 1)
+        assert seconds >= 0
+        assert comparisons == 3
+        assert writes == 5  # Each shift and each insert is one write
+
+    def test_measure_non_comparison_sort(self):
+        seconds, comparisons, writes = measure(counting_sort, [3, 2, 1], 1)
+        assert comparisons is None
+        assert writes is None
+        assert measure(msd_radix_sort, list(range(50, 0, -1)), 1) is None
+
+    def test_run_and_write_results(self):
+        results = run_benchmarks(['insertion_sort', 'sort'],
+                                 ['random', 'nearly_sorted'], [10, 50], 1)
+        assert len(results) == 8
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_path = os.path.join(temp_dir, 'results.json')
+            csv_path = os.path.join(temp_dir, 'results.csv')
+            write_json(results, json_path)
+            write_csv(results, csv_path)
+            with open(json_path) as json_file:
+                assert json.load(json_file) == results
+            with open(csv_path) as csv_file:
+                rows = list(csv.DictReader(csv_file))
+            assert [row['sort'] for row in rows] == [
+                result['sort'] for result in results]
+
+
+if __name__ == '__main__':
+    unittest.main()
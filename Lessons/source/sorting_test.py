@@ -1,12 +1,16 @@
 #!python
 
 from sorting import (is_sorted, bubble_sort, selection_sort, insertion_sort,
-                     merge_sort, random_ints)
+                     split_sort_merge, merge_sort, quick_sort, heap_sort,
+                     partition, partition3, radix_sort, msd_radix_sort,
+                     counting_sort, bucket_sort, sort, random_ints, merge,
+                     nth_element, partial_sort, top_k, argsort, SORTS)
+import sorting
 import unittest
 
 
 # Change this variable to the sort function you want to test
-sort = bubble_sort
+default_sort = bubble_sort
 
 
 class IsSortedTest(unittest.TestCase):
@@ -80,23 +84,37 @@ class IsSortedTest(unittest.TestCase):
         # TODO: Write more negative test cases with assert is False statements
         # ...
 
+    def test_is_sorted_stops_at_first_unsorted_pair(self):
+        # Long lists are compared pair by pair, not converted to NumPy first
+        numeric_array = sorting._numeric_array
+        sorting._numeric_array = None  # Fails if called
+        try:
+            assert is_sorted([1, 0] + list(range(5000))) is False
+            assert is_sorted(list(range(5000))) is True
+            # Stops before the pair that can't be compared
+            assert is_sorted([2, 1, 'three']) is False
+        finally:
+            sorting._numeric_array = numeric_array
+
 
 class IntegerSortTest(unittest.TestCase):
 
+    sort = staticmethod(default_sort)
+
     def test_sort_on_empty_list(self):
         items = []
-        sort(items)
+        self.sort(items)
         assert items == []  # List should not be changed
 
     def test_sort_on_small_lists_of_integers(self):
         items1 = [3]
-        sort(items1)
+        self.sort(items1)
         assert items1 == [3]  # List should not be changed
         items2 = [5, 3]
-        sort(items2)
+        self.sort(items2)
         assert items2 == [3, 5]  # List should be in sorted order
         items3 = [5, 7, 3]
-        sort(items3)
+        self.sort(items3)
         assert items3 == [3, 5, 7]
         # TODO: Write more test cases with assert equal list statements
         # You'll need a lot more than this to test sorting algorithm robustness
@@ -104,16 +122,16 @@ class IntegerSortTest(unittest.TestCase):
 
     def test_sort_on_small_lists_of_integers_with_duplicates(self):
         items1 = [3, 3]
-        sort(items1)
+        self.sort(items1)
         assert items1 == [3, 3]  # List should not be changed
         items2 = [3, 5, 3]
-        sort(items2)
+        self.sort(items2)
         assert items2 == [3, 3, 5]  # List should be in sorted order
         items3 = [5, 5, 3, 5, 3]
-        sort(items3)
+        self.sort(items3)
         assert items3 == [3, 3, 5, 5, 5]
         items4 = [7, 5, 3, 7, 5, 7, 5, 3, 7]
-        sort(items4)
+        self.sort(items4)
         assert items4 == [3, 3, 5, 5, 5, 7, 7, 7, 7]
         # TODO: Create lists of integers with many duplicate values
         # TODO: Write more test cases with assert equal list statements
@@ -124,52 +142,54 @@ class IntegerSortTest(unittest.TestCase):
         # Generate list of 10 random integers from range [1...20]
         items1 = random_ints(10, 1, 20)
         sorted_items1 = sorted(items1)  # Create a copy of list in sorted order
-        sort(items1)  # Call mutative sort function to sort list items in place
+        self.sort(items1)  # Call mutative sort function to sort list items in place
         assert items1 == sorted_items1
 
         # Generate list of 20 random integers from range [1...50]
         items2 = random_ints(20, 1, 50)
         sorted_items2 = sorted(items2)  # Copy
-        sort(items2)  # Mutate
+        self.sort(items2)  # Mutate
         assert items2 == sorted_items2
 
         # Generate list of 30 random integers from range [1...100]
         items3 = random_ints(30, 1, 100)
         sorted_items3 = sorted(items3)  # Copy
-        sort(items3)  # Mutate
+        self.sort(items3)  # Mutate
         assert items3 == sorted_items3
 
     def test_sort_on_lists_of_random_integers_with_duplicates(self):
         # Generate list of 20 random integers from range [1...10]
         items1 = random_ints(20, 1, 10)
         sorted_items1 = sorted(items1)  # Create a copy of list in sorted order
-        sort(items1)  # Call mutative sort function to sort list items in place
+        self.sort(items1)  # Call mutative sort function to sort list items in place
         assert items1 == sorted_items1
 
         # Generate list of 50 random integers from range [1...20]
         items2 = random_ints(50, 1, 20)
         sorted_items2 = sorted(items2)  # Copy
-        sort(items2)  # Mutate
+        self.sort(items2)  # Mutate
         assert items2 == sorted_items2
 
         # Generate list of 100 random integers from range [1...30]
         items3 = random_ints(100, 1, 30)
         sorted_items3 = sorted(items3)  # Copy
-        sort(items3)  # Mutate
+        self.sort(items3)  # Mutate
         assert items3 == sorted_items3
 
 
 class StringSortTest(unittest.TestCase):
 
+    sort = staticmethod(default_sort)
+
     def test_sort_on_small_lists_of_strings(self):
         items1 = ['A']
-        sort(items1)
+        self.sort(items1)
         assert items1 == ['A']  # List should not be changed
         items2 = ['B', 'A']
-        sort(items2)
+        self.sort(items2)
         assert items2 == ['A', 'B']  # List should be in sorted order
         items3 = ['B', 'C', 'A']
-        sort(items3)
+        self.sort(items3)
         assert items3 == ['A', 'B', 'C']
         # TODO: Write more test cases with assert equal list statements
         # You'll need a lot more than this to test sorting algorithm robustness
@@ -178,15 +198,439 @@ class StringSortTest(unittest.TestCase):
     def test_sort_on_fish_book_title(self):
         items = 'one fish two fish red fish blue fish'.split()
         sorted_items = sorted(items)  # Create a copy of list in sorted order
-        sort(items)  # Call mutative sort function to sort list items in place
+        self.sort(items)  # Call mutative sort function to sort list items in place
         assert items == sorted_items
 
     def test_sort_on_seven_dwarf_names(self):
         items = 'Doc Grumpy Happy Sleepy Bashful Sneezy Dopey'.split()
         sorted_items = sorted(items)  # Copy
-        sort(items)  # Mutate
+        self.sort(items)  # Mutate
+        assert items == sorted_items
+
+
+class SelectionSortIntegerTest(IntegerSortTest):
+    sort = staticmethod(selection_sort)
+
+
+class SelectionSortStringTest(StringSortTest):
+    sort = staticmethod(selection_sort)
+
+
+class InsertionSortIntegerTest(IntegerSortTest):
+    sort = staticmethod(insertion_sort)
+
+
+class InsertionSortStringTest(StringSortTest):
+    sort = staticmethod(insertion_sort)
+
+
+class SplitSortMergeIntegerTest(IntegerSortTest):
+    sort = staticmethod(split_sort_merge)
+
+
+class SplitSortMergeStringTest(StringSortTest):
+    sort = staticmethod(split_sort_merge)
+
+
+class MergeSortIntegerTest(IntegerSortTest):
+    sort = staticmethod(merge_sort)
+
+
+class MergeSortStringTest(StringSortTest):
+    sort = staticmethod(merge_sort)
+
+
+class QuickSortIntegerTest(IntegerSortTest):
+    sort = staticmethod(quick_sort)
+
+
+class QuickSortStringTest(StringSortTest):
+    sort = staticmethod(quick_sort)
+
+
+class HeapSortIntegerTest(IntegerSortTest):
+    sort = staticmethod(heap_sort)
+
+
+class HeapSortStringTest(StringSortTest):
+    sort = staticmethod(heap_sort)
+
+
+class CountingSortIntegerTest(IntegerSortTest):
+    sort = staticmethod(counting_sort)
+
+
+class BucketSortIntegerTest(IntegerSortTest):
+    sort = staticmethod(bucket_sort)
+
+
+class HybridSortIntegerTest(IntegerSortTest):
+    sort = staticmethod(sort)
+
+
+class HybridSortStringTest(StringSortTest):
+    sort = staticmethod(sort)
+
+
+class HybridSortTest(unittest.TestCase):
+
+    def test_sort_on_presorted_integers(self):
+        items1 = list(range(1000))
+        sort(items1)
+        assert items1 == list(range(1000))
+        items2 = list(range(1000, 0, -1))
+        sort(items2)
+        assert items2 == list(range(1, 1001))
+        # Sorted runs with a few items swapped out of place
+        items3 = list(range(0, 10**6, 997)) * 3
+        items3[5], items3[500] = items3[500], items3[5]
+        sorted_items3 = sorted(items3)
+        sort(items3)
+        assert items3 == sorted_items3
+
+    def test_sort_on_large_lists_of_random_items(self):
+        import random
+        for items in [random_ints(5000, 1, 10**9), random_ints(5000, 1, 100),
+                      [random.random() for _ in range(5000)],
+                      [str(number) for number in random_ints(5000, 1, 10**6)]]:
+            sorted_items = sorted(items)
+            sort(items)
+            assert items == sorted_items
+
+    def test_sort_with_key_and_reverse(self):
+        items = 'one fish two fish red fish blue fish'.split()
+        sort(items, key=len)
+        assert items == ['one', 'two', 'red', 'fish', 'fish', 'fish', 'blue',
+                         'fish']
+        sort(items, key=len, reverse=True)
+        assert items == ['fish', 'fish', 'fish', 'blue', 'fish', 'one', 'two',
+                         'red']
+        items = random_ints(100, 1, 50)
+        sort(items, reverse=True)
+        assert items == sorted(items, reverse=True)
+
+    def test_sort_is_stable(self):
+        # Pairs compare equal on their first item only through the key
+        items = [(number, index) for index, number in
+                 enumerate(random_ints(2000, 1, 20))]
+        for reverse in [False, True]:
+            expected = sorted(items, key=lambda pair: pair[0], reverse=reverse)
+            actual = list(items)
+            sort(actual, key=lambda pair: pair[0], reverse=reverse)
+            assert actual == expected
+
+
+class Record(object):
+    """Item that compares by key only, so equal keys can be told apart."""
+
+    def __init__(self, key, index):
+        self.key = key
+        self.index = index
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+
+class MergeSortStabilityTest(unittest.TestCase):
+
+    def test_merge_sort_is_stable(self):
+        for num_items in [10, 100, 1000, 4097]:
+            records = [Record(key, index) for index, key in
+                       enumerate(random_ints(num_items, 1, 10))]
+            merge_sort(records)
+            pairs = [(record.key, record.index) for record in records]
+            assert pairs == sorted(pairs)
+
+    def test_sort_is_stable_without_key(self):
+        records = [Record(key, index) for index, key in
+                   enumerate(random_ints(3000, 1, 30))]
+        sort(records)
+        pairs = [(record.key, record.index) for record in records]
+        assert pairs == sorted(pairs)
+
+
+class QuickSortTest(unittest.TestCase):
+
+    def test_partition(self):
+        items = random_ints(200, 1, 50)
+        p = partition(items, 0, len(items) - 1)
+        assert all(item < items[p] for item in items[:p])
+        assert all(not item < items[p] for item in items[p + 1:])
+
+    def test_partition3(self):
+        items = random_ints(200, 1, 5)
+        lt, gt = partition3(items, 0, len(items) - 1)
+        pivot = items[lt]
+        assert all(item < pivot for item in items[:lt])
+        assert all(item == pivot for item in items[lt:gt + 1])
+        assert all(pivot < item for item in items[gt + 1:])
+
+    def test_quick_sort_on_duplicate_costs(self):
+        import random
+        items = [random.choice([0.01, 0.02, 0.03]) for _ in range(20000)]
+        sorted_items = sorted(items)
+        quick_sort(items)
+        assert items == sorted_items
+
+    def test_quick_sort_on_subrange(self):
+        items = [9, 8, 7, 6, 5, 4, 3, 2, 1]
+        quick_sort(items, 2, 6)
+        assert items == [9, 8, 3, 4, 5, 6, 7, 2, 1]
+
+    def test_quick_sort_on_adversarial_orders(self):
+        for items in [list(range(2000)), list(range(2000, 0, -1)),
+                      list(range(1000)) + list(range(1000, 0, -1)),
+                      list(range(0, 2000, 2)) + list(range(1, 2000, 2))]:
+            sorted_items = sorted(items)
+            quick_sort(items)
+            assert items == sorted_items
+
+
+class RadixSortIntegerTest(IntegerSortTest):
+    sort = staticmethod(radix_sort)
+
+
+class MSDRadixSortStringTest(StringSortTest):
+    sort = staticmethod(msd_radix_sort)
+
+
+class DistributionSortTest(unittest.TestCase):
+
+    def test_counting_sort_on_wide_range(self):
+        # Range is far wider than the count, so it falls back to quick sort
+        items = random_ints(100, -10**12, 10**12)
+        sorted_items = sorted(items)
+        counting_sort(items)
+        assert items == sorted_items
+
+    def test_radix_sort_on_phone_numbers(self):
+        items = random_ints(5000, 15120000000, 15129999999)
+        sorted_items = sorted(items)
+        radix_sort(items)
+        assert items == sorted_items
+
+    def test_radix_sort_on_huge_integers(self):
+        items = random_ints(500, 0, 2**100)
+        sorted_items = sorted(items)
+        radix_sort(items)
+        assert items == sorted_items
+
+    def test_msd_radix_sort_on_phone_number_strings(self):
+        items = ['+' + str(number)
+                 for number in random_ints(5000, 15120000000, 15129999999)]
+        items += ['+1512', '+1', '', '+44', '+4420']  # Variable lengths
+        sorted_items = sorted(items)
+        msd_radix_sort(items)
+        assert items == sorted_items
+
+    def test_msd_radix_sort_on_bytes(self):
+        items = [str(number).encode() for number in random_ints(1000, 1, 10**6)]
+        sorted_items = sorted(items)
+        msd_radix_sort(items)
+        assert items == sorted_items
+
+
+class ArraySortTest(unittest.TestCase):
+
+    def test_sort_array(self):
+        from array import array
+        numbers = random_ints(3000, -1000, 10**9)
+        items = array('q', numbers)
+        sort(items)
+        assert items == array('q', sorted(numbers))
+        sort(items, reverse=True)
+        assert items == array('q', sorted(numbers, reverse=True))
+        floats = array('d', [0.03, 0.01, 0.02])
+        sort(floats)
+        assert floats == array('d', [0.01, 0.02, 0.03])
+
+    def test_distribution_sorts_on_arrays(self):
+        from array import array
+        # Short enough to take the pure Python paths even with NumPy
+        numbers = random_ints(500, 0, 2000)
+        for sort_function in [counting_sort, bucket_sort, radix_sort]:
+            items = array('q', numbers)
+            sort_function(items)
+            assert items == array('q', sorted(numbers))
+        floats = array('d', [0.5, 0.25, 0.75, 0.125])
+        bucket_sort(floats)
+        assert floats == array('d', [0.125, 0.25, 0.5, 0.75])
+
+
+@unittest.skipIf(sorting.numpy is None, 'NumPy is not installed')
+class NumpySortTest(unittest.TestCase):
+
+    def test_numeric_lists_use_numpy(self):
+        assert sorting._numeric_array(random_ints(2000, 1, 10)) is not None
+        assert sorting._numeric_array([0.5] * 2000) is not None
+        assert sorting._numeric_array([1, 0.5] * 1000) is None  # Mixed
+        assert sorting._numeric_array([2**64] * 2000) is None  # Too wide
+        assert sorting._numeric_array(random_ints(10, 1, 10)) is None  # Short
+
+    def test_sort_numeric_lists(self):
+        import random
+        for items in [random_ints(5000, -10**12, 10**12),
+                      [random.random() for _ in range(5000)]]:
+            for reverse in [False, True]:
+                expected = sorted(items, reverse=reverse)
+                sort(items, reverse=reverse)
+                assert items == expected
+                assert all(type(item) is type(expected[0]) for item in items)
+
+    def test_sort_array_in_place(self):
+        from array import array
+        numbers = random_ints(5000, 1, 10**6)
+        items = array('l', numbers)
+        sort(items)
+        assert items.tolist() == sorted(numbers)
+
+    def test_is_sorted(self):
+        assert is_sorted(list(range(5000))) is True
+        assert is_sorted(list(range(5000)) + [0]) is False
+
+    def test_merge(self):
+        items1 = sorted(random_ints(2000, 1, 100))
+        items2 = sorted(random_ints(3000, 1, 100))
+        assert merge(items1, items2) == sorted(items1 + items2)
+
+    def test_merge_mixed_types(self):
+        ints, floats = [2**62 + 1] * 1000, [0.5] * 1000
+        merged = merge(floats, ints)
+        assert merged == floats + ints
+        assert all(type(item) is int for item in merged[1000:])
+
+    def test_counting_and_bucket_sort(self):
+        for sort_function in [counting_sort, bucket_sort]:
+            for items in [random_ints(5000, 1, 100),
+                          random_ints(5000, -10**12, 10**12)]:
+                expected = sorted(items)
+                sort_function(items)
+                assert items == expected
+
+
+class SelectionTest(unittest.TestCase):
+
+    def test_nth_element(self):
+        for num_items in [1, 10, 100, 1000]:
+            items = random_ints(num_items, 1, num_items // 2 + 1)
+            sorted_items = sorted(items)
+            for n in {0, num_items // 3, num_items - 1}:
+                assert nth_element(items, n) == sorted_items[n]
+                assert all(not items[n] < item for item in items[:n])
+                assert all(not item < items[n] for item in items[n + 1:])
+
+    def test_nth_element_on_adversarial_orders(self):
+        for items in [list(range(2000)), list(range(2000, 0, -1)),
+                      [0.01, 0.03] * 1000]:
+            assert nth_element(items, 1000) == sorted(items)[1000]
+
+    def test_partial_sort(self):
+        items = random_ints(1000, 1, 10**6)
+        sorted_items = sorted(items)
+        partial_sort(items, 10)
+        assert items[:10] == sorted_items[:10]
+        assert sorted(items) == sorted_items  # Same items, nothing lost
+        partial_sort(items, 5000)
         assert items == sorted_items
 
+    def test_top_k(self):
+        costs = [0.05, 0.01, 0.04, 0.01, 0.03, 0.02]
+        assert top_k(costs, 3) == [0.01, 0.01, 0.02]
+        assert top_k(costs, 2, reverse=True) == [0.05, 0.04]
+        assert top_k(costs, 10) == sorted(costs)
+        assert top_k(costs, 0) == []
+
+    def test_top_k_on_stream_with_key(self):
+        routes = ('+1{},0.0{}'.format(index, index % 7)
+                  for index in range(100000))  # Generator, never a list
+
+        def cost(route):
+            return float(route.split(',')[1])
+
+        cheapest = top_k(routes, 3, key=cost)
+        assert cheapest == ['+10,0.00', '+17,0.00', '+114,0.00']
+
+
+class KeySortTest(unittest.TestCase):
+
+    def setUp(self):
+        # (prefix, cost in hundredths) route pairs with many equal costs
+        self.routes = [('+1{}'.format(index), cost) for index, cost in
+                       enumerate(random_ints(300, 1, 9))]
+
+    def test_every_sort_with_key_and_reverse(self):
+        def cost(route):
+            return route[1]
+
+        def prefix(route):
+            return route[0]
+
+        for name, sort_function in SORTS.items():
+            key = prefix if name == 'msd_radix_sort' else cost
+            for reverse in [False, True]:
+                items = list(self.routes)
+                sort_function(items, key=key, reverse=reverse)
+                assert items == sorted(self.routes, key=key,
+                                       reverse=reverse), name
+
+    def test_every_sort_with_reverse(self):
+        for name, sort_function in SORTS.items():
+            numbers = random_ints(200, 1, 50)
+            items = [str(n) for n in numbers] if name == 'msd_radix_sort' \
+                else list(numbers)
+            expected = sorted(items, reverse=True)
+            sort_function(items, reverse=True)
+            assert items == expected, name
+
+    def test_key_is_computed_once_per_item(self):
+        calls = []
+
+        def cost(route):
+            calls.append(route)
+            return route[1]
+
+        sort(self.routes, key=cost)
+        assert len(calls) == len(self.routes)
+
+    def test_quick_sort_range_with_key_and_reverse(self):
+        items = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+        quick_sort(items, 2, 6, reverse=True)
+        assert items == [1, 2, 7, 6, 5, 4, 3, 8, 9]
+        quick_sort(items, low=0, high=3, key=lambda n: -n)
+        assert items == [7, 6, 2, 1, 5, 4, 3, 8, 9]
+
+    def test_argsort(self):
+        costs = [0.03, 0.01, 0.02, 0.01]
+        prefixes = ['+1415', '+1512', '+44', '+1']
+        order = argsort(costs)
+        assert order == [1, 3, 2, 0]
+        assert [prefixes[i] for i in order] == ['+1512', '+1', '+44', '+1415']
+        assert argsort(costs, reverse=True) == [0, 2, 1, 3]
+        assert argsort(prefixes, key=len) == [3, 2, 0, 1]
+        assert argsort(prefixes, key=len, reverse=True) == [0, 1, 2, 3]
+        assert argsort([]) == []
+
+    def test_argsort_matches_sorted(self):
+        import random
+        for items in [random_ints(3000, 1, 20), random_ints(3000, 1, 10**9),
+                      [random.random() for _ in range(3000)],
+                      [(n % 7, str(n)) for n in random_ints(3000, 1, 100)]]:
+            for reverse in [False, True]:
+                expected = sorted(range(len(items)), key=items.__getitem__,
+                                  reverse=reverse)
+                assert argsort(items, reverse=reverse) == expected
+
+    def test_partial_sort_with_key_and_reverse(self):
+        def cost(route):
+            return route[1]
+
+        for reverse in [False, True]:
+            items = list(self.routes)
+            partial_sort(items, 10, key=cost, reverse=reverse)
+            assert items[:10] == sorted(self.routes, key=cost,
+                                        reverse=reverse)[:10]
+            assert sorted(items) == sorted(self.routes)
+
 
 if __name__ == '__main__':
     unittest.main()
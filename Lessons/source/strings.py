@@ -1,5 +1,20 @@
 #!python
 
+import heapq
+import mmap
+import os
+import re
+from collections import defaultdict
+from functools import lru_cache
+from itertools import islice
+
+# Patterns at least this long are searched with Boyer-Moore-Horspool, which
+# skips more text the longer the pattern; shorter ones with KMP
+HORSPOOL_MIN_LENGTH = 4
+# Rabin-Karp hashes are polynomials in this odd base, modulo 2**64
+ROLLING_HASH_BASE = 0x100000001b3
+ROLLING_HASH_MASK = 2**64 - 1
+
 
 def contains(text, pattern):
     """Returns a boolean indicating whether pattern occurs in text."""
@@ -17,36 +32,304 @@ def find_index(text, pattern, start=0):
 
     if len(pattern) == 0:
         return 0
-    if len(pattern) > len(text):
-        return None
-
-    for i in range(start, len(text) - len(pattern)+1):
-        if text[i] == pattern[0]:
-            if text[i: i+len(pattern)] == pattern:
-                return i
-
-    return None
+    return matcher(pattern).find(text, start)
 
 
 def find_all_indexes(text, pattern):
     """Return a list of starting indexes of all occurrences of pattern in text,
     or an empty list if not found."""
+    return list(iter_indexes(text, pattern))
+
+
+def find_all_indexes_many(text, patterns):
+    """Return a dict mapping each of the given patterns to the list of
+    starting indexes of its occurrences in text. Rather than one scan of text
+    per pattern, patterns of the same length are found together in one
+    Rabin-Karp pass, so many patterns of few distinct lengths (like
+    fixed-length number prefixes) cost a few passes in all."""
+    assert isinstance(text, str), 'text is not a string: {}'.format(text)
+    indexes = {pattern: [] for pattern in patterns}
+    if '' in indexes:
+        indexes[''] = find_all_indexes(text, '')
+    for index, pattern in RabinKarpMatcher(indexes).search(text):
+        indexes[pattern].append(index)
+    return indexes
+
+
+def iter_indexes(text, pattern):
+    """Yield the starting index of every occurrence of pattern in text,
+    overlapping ones included, in one pass over text."""
     assert isinstance(text, str), 'text is not a string: {}'.format(text)
     assert isinstance(pattern, str), 'pattern is not a string: {}'.format(text)
 
     if len(pattern) == 0:
-        return [index for index in range(len(text))]
-    if len(pattern) > len(text):
-        return []
+        return iter(range(len(text)))
+    return matcher(pattern).search(text)
 
-    indices = []
-    index = find_index(text, pattern)
 
-    while index != None:
-        indices.append(index)
-        index = find_index(text, pattern, index + 1)
+class KMPMatcher(object):
+    """Knuth-Morris-Pratt search for one pattern. The failure table holds, for
+    each prefix of pattern, the length of its longest proper prefix that is
+    also a suffix, so after a mismatch the search continues from there
+    instead of going back in the text. Build once, search many texts."""
+
+    def __init__(self, pattern):
+        """Running time: O(m) for a pattern of length m.
+        Memory usage: O(m) for the failure table."""
+        self.pattern = pattern
+        self.failure = failure = [0] * len(pattern)
+        length = 0  # Of the current prefix that is also a suffix
+        for index in range(1, len(pattern)):
+            while length and pattern[index] != pattern[length]:
+                length = failure[length - 1]
+            if pattern[index] == pattern[length]:
+                length += 1
+            failure[index] = length
+
+    def search(self, text, start=0):
+        """Yield the index of every occurrence of pattern in text at or after
+        start, overlapping ones included.
+        Running time: O(n) for n characters of text, each compared at most
+        twice on average.
+        Memory usage: O(1)."""
+        pattern, failure = self.pattern, self.failure
+        last = len(pattern) - 1
+        matched = 0  # Characters of pattern matched so far
+        for index in range(start, len(text)):
+            char = text[index]
+            while matched and char != pattern[matched]:
+                matched = failure[matched - 1]
+            if char == pattern[matched]:
+                if matched == last:
+                    yield index - last
+                    matched = failure[last]
+                else:
+                    matched += 1
+
+    def find(self, text, start=0):
+        """Return the index of the first occurrence at or after start, or
+        None if pattern does not occur there."""
+        return next(self.search(text, start), None)
+
+
+class HorspoolMatcher(object):
+    """Boyer-Moore-Horspool search for one pattern. Each window of text is
+    checked from its last character, and the shift table says how far the
+    window can slide so that character lines up with its rightmost earlier
+    occurrence in pattern, the whole pattern length if it doesn't occur.
+    Long patterns skip most of the text. Build once, search many texts."""
+
+    def __init__(self, pattern):
+        """Running time: O(m) for a pattern of length m.
+        Memory usage: O(k) for k distinct characters in pattern."""
+        self.pattern = pattern
+        self.shifts = {char: len(pattern) - 1 - index
+                       for index, char in enumerate(pattern[:-1])}
+
+    def search(self, text, start=0):
+        """Yield the index of every occurrence of pattern in text at or after
+        start, overlapping ones included.
+        Running time: O(n / m) windows on typical text, O(n * m) worst case.
+        Memory usage: O(1)."""
+        pattern, shifts = self.pattern, self.shifts
+        length = len(pattern)
+        last_char = pattern[-1]
+        index = start + length - 1  # Of the last character of the window
+        while index < len(text):
+            char = text[index]
+            # Compare the rest in place, without slicing out the window
+            if char == last_char and text.startswith(pattern,
+                                                     index - length + 1):
+                yield index - length + 1
+            index += shifts.get(char, length)
+
+    def find(self, text, start=0):
+        """Return the index of the first occurrence at or after start, or
+        None if pattern does not occur there."""
+        return next(self.search(text, start), None)
+
+
+def _buffer(data):
+    """Return data if it has a find method (bytes, bytearray and mmap do),
+    or else a flat memoryview of its bytes, which shares its memory."""
+    if hasattr(data, 'find'):
+        return data
+    return memoryview(data).cast('B')
+
+
+@lru_cache(maxsize=128)
+def _overlapping_regex(pattern):
+    """Return a compiled regex matching the empty string before every
+    occurrence of pattern, so finditer reports overlapping ones too."""
+    return re.compile(b'(?=' + re.escape(pattern) + b')')
+
+
+def find_index_bytes(data, pattern, start=0):
+    """Return the starting index of the first occurrence of bytes pattern in
+    data at or after start, or None if not found. data can be bytes,
+    bytearray, memoryview, mmap or any other buffer, and is searched where it
+    is, without copying: with its own find method if it has one, else with a
+    regular expression, which reads buffers in place."""
+    pattern = bytes(pattern)
+    if len(pattern) == 0:
+        return 0
+    data = _buffer(data)
+    if isinstance(data, memoryview):
+        match = _overlapping_regex(pattern).search(data, start)
+        return match.start() if match else None
+    index = data.find(pattern, start)
+    return index if index >= 0 else None
+
+
+def contains_bytes(data, pattern):
+    """Return a boolean indicating whether bytes pattern occurs in data, which
+    can be any buffer, see find_index_bytes."""
+    return find_index_bytes(data, pattern) is not None
+
+
+def iter_indexes_bytes(data, pattern):
+    """Yield the starting index of every occurrence of bytes pattern in data,
+    overlapping ones included, without copying data, see find_index_bytes.
+    Running time: O(n), the scanning between matches is done in C.
+    Memory usage: O(1)."""
+    pattern = bytes(pattern)
+    data = _buffer(data)
+    if len(pattern) == 0:
+        yield from range(len(data))
+    elif isinstance(data, memoryview):
+        for match in _overlapping_regex(pattern).finditer(data):
+            yield match.start()
+    else:
+        index = data.find(pattern)
+        while index >= 0:
+            yield index
+            index = data.find(pattern, index + 1)
+
+
+def find_all_indexes_bytes(data, pattern):
+    """Return a list of starting indexes of all occurrences of bytes pattern
+    in data, which can be any buffer, see find_index_bytes."""
+    return list(iter_indexes_bytes(data, pattern))
+
+
+def grep_file(path, pattern):
+    """Yield the byte offset of every occurrence of pattern (bytes, or str to
+    search for its UTF-8 encoding) in the file at path, overlapping ones
+    included. The file is memory-mapped, not read, so memory use stays
+    constant however large the file: the operating system pages it in as the
+    search moves along and can drop the pages already searched."""
+    if isinstance(pattern, str):
+        pattern = pattern.encode('utf-8')
+    with open(path, 'rb') as data_file:
+        if os.fstat(data_file.fileno()).st_size == 0:
+            return  # Empty files can't be mapped, and contain no matches
+        with mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from iter_indexes_bytes(data, pattern)
+
+
+def _codes(text):
+    """Return an iterator over the integer codes of the characters of text,
+    or of the bytes of a bytes-like text."""
+    if isinstance(text, str):
+        return map(ord, text)
+    return iter(memoryview(text).cast('B'))
+
+
+class RabinKarpMatcher(object):
+    """Rabin-Karp search for many patterns at once. A window of each pattern
+    length slides over the text, its polynomial hash updated in O(1) per
+    character as one character leaves the window and another enters, and
+    only windows whose hash is in the set of pattern hashes are compared
+    with the patterns. One pass over the text per distinct pattern length,
+    whatever the number of patterns."""
+
+    def __init__(self, patterns):
+        """Build the hash tables for patterns, all str or all bytes.
+        Running time: O(m) for m pattern characters in all.
+        Memory usage: O(p) for p patterns."""
+        self.patterns = {}  # Patterns by hash, for each pattern length
+        for pattern in patterns:
+            if not pattern:
+                continue  # Found everywhere, not by hashing
+            by_hash = self.patterns.setdefault(len(pattern), defaultdict(list))
+            candidates = by_hash[self._hash(pattern)]
+            if pattern not in candidates:
+                candidates.append(pattern)
+        # Weight of the character leaving a window of each length
+        self.leading = {length: pow(ROLLING_HASH_BASE, length - 1,
+                                    ROLLING_HASH_MASK + 1)
+                        for length in self.patterns}
+        self.longest = max(self.patterns, default=0)
+
+    @staticmethod
+    def _hash(text):
+        value = 0
+        for code in _codes(text):
+            value = (value * ROLLING_HASH_BASE + code) & ROLLING_HASH_MASK
+        return value
+
+    def _search_length(self, text, length):
+        """Yield (index, pattern) for every occurrence in text of a pattern
+        of the given length, in order of index."""
+        by_hash = self.patterns[length]
+        hashes = set(by_hash)  # Set lookups are the fast path for misses
+        leading = self.leading[length]
+        base, mask = ROLLING_HASH_BASE, ROLLING_HASH_MASK
+        if len(text) < length:
+            return
+        value = self._hash(text[:length])
+        if value in hashes:
+            for pattern in by_hash[value]:
+                if text.startswith(pattern):
+                    yield 0, pattern
+        for index, (outgoing, incoming) in enumerate(
+                zip(_codes(text), islice(_codes(text), length, None)), 1):
+            value = ((value - outgoing * leading) * base + incoming) & mask
+            if value in hashes:
+                for pattern in by_hash[value]:
+                    if text.startswith(pattern, index):
+                        yield index, pattern
+
+    def search(self, text):
+        """Yield (index, pattern) for every occurrence of every pattern in
+        text, overlapping ones included, in order of index.
+        Running time: O(n * l + k) for l distinct pattern lengths and k
+        matches, if hash collisions are rare.
+        Memory usage: O(l) for one generator per length."""
+        return heapq.merge(*(self._search_length(text, length)
+                             for length in self.patterns))
+
+    def stream(self, chunks):
+        """Yield (index, pattern) for every match in the text made of the
+        given chunks (say, blocks read from a file), with indexes counted from
+        the start of the first chunk, in order of index within each chunk.
+        The last characters of each chunk are kept and searched again with
+        the next one, so matches that span chunk boundaries are found, and
+        each match is reported once.
+        Running time: O(n * l + k) as for search.
+        Memory usage: O(c + m) for chunks of length c and the longest
+        pattern length m."""
+        carry, offset = None, 0  # offset is where carry starts in the text
+        for chunk in chunks:
+            window = chunk if carry is None else carry + chunk
+            for index, pattern in self.search(window):
+                # Matches within carry were reported with the last chunk
+                if carry is None or index + len(pattern) > len(carry):
+                    yield offset + index, pattern
+            keep = min(len(window), self.longest - 1)
+            offset += len(window) - keep
+            carry = window[len(window) - keep:]
+
 
-    return indices
+@lru_cache(maxsize=128)
+def matcher(pattern):
+    """Return a matcher for pattern, reused while it is among the 128 most
+    recently used. Patterns shorter than HORSPOOL_MIN_LENGTH get KMPMatcher,
+    whose linear worst case wins when there is little to skip; longer ones
+    get HorspoolMatcher, which skips ahead up to the pattern length."""
+    if len(pattern) < HORSPOOL_MIN_LENGTH:
+        return KMPMatcher(pattern)
+    return HorspoolMatcher(pattern)
 
 
 def test_string_algorithms(text, pattern):
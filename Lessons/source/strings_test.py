@@ -1,6 +1,14 @@
 #!python
 
-from strings import contains, find_index, find_all_indexes
+from strings import (contains, find_index, find_all_indexes, iter_indexes,
+                     KMPMatcher, HorspoolMatcher, matcher, RabinKarpMatcher,
+                     find_all_indexes_many, find_index_bytes, contains_bytes,
+                     find_all_indexes_bytes, iter_indexes_bytes, grep_file)
+from array import array
+import mmap
+import os
+import random
+import tempfile
 import unittest
 
 
@@ -134,5 +142,152 @@ class StringsTest(unittest.TestCase):
         assert find_all_indexes('abcdefg', 'fgh') == []
 
 
+def brute_force_indexes(text, pattern):
+    return [index for index in range(len(text) - len(pattern) + 1)
+            if text[index:index + len(pattern)] == pattern]
+
+
+class MatcherTest(unittest.TestCase):
+
+    def test_matchers_agree_with_brute_force(self):
+        rng = random.Random(1415)
+        for _ in range(200):
+            text = ''.join(rng.choice('ab ') for _ in range(rng.randint(0, 60)))
+            pattern = ''.join(rng.choice('ab')
+                              for _ in range(rng.randint(1, 8)))
+            expected = brute_force_indexes(text, pattern)
+            assert list(KMPMatcher(pattern).search(text)) == expected
+            assert list(HorspoolMatcher(pattern).search(text)) == expected
+            assert find_all_indexes(text, pattern) == expected
+
+    def test_search_from_start(self):
+        for engine in [KMPMatcher, HorspoolMatcher]:
+            search = engine('abra')
+            assert search.find('abra cadabra', 1) == 8
+            assert search.find('abra cadabra', 9) is None
+            assert list(search.search('abra cadabra abra', 4)) == [8, 13]
+
+    def test_matchers_are_reused(self):
+        assert matcher('abra') is matcher('abra')
+        assert isinstance(matcher('ab'), KMPMatcher)
+        assert isinstance(matcher('abracadabra'), HorspoolMatcher)
+        # One matcher searches any number of texts
+        search = matcher('ana')
+        assert list(search.search('banana')) == [1, 3]
+        assert list(search.search('canal')) == [1]
+
+    def test_iter_indexes_is_lazy(self):
+        text = 'a' * 10**6
+        indexes = iter_indexes(text, 'aaaa')
+        assert next(indexes) == 0
+        assert next(indexes) == 1  # Overlapping matches
+        assert list(iter_indexes('abc', '')) == [0, 1, 2]
+        assert list(iter_indexes('abc', 'abcd')) == []
+
+    def test_worst_case_pattern(self):
+        text = 'a' * 5000
+        pattern = 'a' * 999 + 'b'
+        assert find_index(text, pattern) is None
+        assert find_all_indexes(text + 'b', pattern) == [4001]
+
+
+class RabinKarpTest(unittest.TestCase):
+
+    def test_search(self):
+        search = RabinKarpMatcher(['abra', 'cad', 'a', 'zzz'])
+        assert list(search.search('abra cadabra')) == [
+            (0, 'a'), (0, 'abra'), (3, 'a'), (5, 'cad'), (6, 'a'),
+            (8, 'a'), (8, 'abra'), (11, 'a')]
+        assert list(search.search('')) == []
+        assert list(RabinKarpMatcher([]).search('abc')) == []
+
+    def test_matches_brute_force(self):
+        rng = random.Random(1512)
+        for _ in range(100):
+            text = ''.join(rng.choice('ab') for _ in range(rng.randint(0, 60)))
+            patterns = set(''.join(rng.choice('ab')
+                                   for _ in range(rng.randint(1, 6)))
+                           for _ in range(8))
+            expected = sorted((index, pattern) for pattern in patterns
+                              for index in brute_force_indexes(text, pattern))
+            matches = list(RabinKarpMatcher(patterns).search(text))
+            assert sorted(matches) == expected
+            assert [index for index, _ in matches] == \
+                [index for index, _ in expected]
+
+    def test_bytes(self):
+        search = RabinKarpMatcher([b'\x00\xff', b'GAT'])
+        assert list(search.search(b'GATTACA\x00\xff')) == [
+            (0, b'GAT'), (7, b'\x00\xff')]
+
+    def test_stream(self):
+        text = '+1512 +1415 +1512-555 +44 ' * 30
+        patterns = ['+1512', '+44', '15', '555']
+        search = RabinKarpMatcher(patterns)
+        expected = sorted(search.search(text))
+        for size in [1, 2, 4, 5, 13, len(text)]:
+            chunks = [text[start:start + size]
+                      for start in range(0, len(text), size)]
+            assert sorted(search.stream(chunks)) == expected
+
+    def test_find_all_indexes_many(self):
+        text = '+15125550100 +14155550199 +15125550123'
+        prefixes = ['+1512', '+1415', '+4420', '']
+        assert find_all_indexes_many(text, prefixes) == {
+            '+1512': [0, 26], '+1415': [13], '+4420': [],
+            '': find_all_indexes(text, '')}
+        assert find_all_indexes_many(text, []) == {}
+
+
+class BytesSearchTest(unittest.TestCase):
+
+    def test_buffers(self):
+        data = b'abra cadabra'
+        for buffer in [data, bytearray(data), memoryview(data),
+                       memoryview(bytearray(data))[2:]]:
+            offset = 2 if len(buffer) < len(data) else 0
+            assert contains_bytes(buffer, b'cad')
+            assert not contains_bytes(buffer, b'zebra')
+            assert find_index_bytes(buffer, b'abra') == (6 if offset else 0)
+            assert find_index_bytes(buffer, b'abra', 1) == 8 - offset
+            assert find_index_bytes(buffer, b'a', 4 - offset) == 6 - offset
+            assert find_index_bytes(buffer, b'') == 0
+            assert find_all_indexes_bytes(buffer, b'bra') == [
+                index - offset for index in [1, 9] if index >= offset]
+
+    def test_overlapping_matches(self):
+        for buffer in [b'aaaa', memoryview(b'aaaa')]:
+            assert find_all_indexes_bytes(buffer, b'aa') == [0, 1, 2]
+            assert find_all_indexes_bytes(buffer, bytearray(b'a')) == [
+                0, 1, 2, 3]
+            assert find_all_indexes_bytes(buffer, b'') == [0, 1, 2, 3]
+        # Patterns with regular expression syntax are matched literally
+        assert find_all_indexes_bytes(memoryview(b'a.b a+b'), b'a+b') == [4]
+
+    def test_other_buffers(self):
+        numbers = array('H', [1, 2, 3, 2, 3])
+        assert find_all_indexes_bytes(numbers, bytes(array('H', [2, 3]))) \
+            == [2, 6]
+        with tempfile.TemporaryFile() as data_file:
+            data_file.write(b'GATTACA GATTACA')
+            data_file.flush()
+            with mmap.mmap(data_file.fileno(), 0) as mapped:
+                assert find_all_indexes_bytes(mapped, b'TTA') == [2, 10]
+        assert list(iter_indexes_bytes(b'', b'a')) == []
+
+    def test_grep_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'calls.log')
+            with open(path, 'wb') as log_file:
+                log_file.write('+1512 ✓\n+1415 ✗\n+1512 ✓\n'.encode('utf-8'))
+            assert list(grep_file(path, b'+1512')) == [0, 20]
+            assert list(grep_file(path, '✓')) == [6, 26]
+            assert list(grep_file(path, b'+44')) == []
+            with open(path, 'wb'):
+                pass  # Empty the file
+            assert list(grep_file(path, b'+1512')) == []
+            assert list(grep_file(path, b'')) == []
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,426 @@
+#!python
+
+import mmap
+import struct
+from array import array
+from sorting import sort
+
+# File header: magic, text length, bytes per index, text kind, encoded length
+_HEADER = struct.Struct('<8sQBBQ')
+_MAGIC = b'SUFFIXAR'
+_STR, _BYTES = 0, 1
+# FM-index file header: magic, text length, bytes per count, text kind,
+# encoded transform length, step, primary row, alphabet size, sample count
+_FM_HEADER = struct.Struct('<8sQBBQQQQQ')
+_FM_MAGIC = b'FMINDEX\x00'
+
+
+def _typecode(size):
+    """Return the smallest array typecode that can index size items."""
+    return 'i' if size < 2**31 else 'q'
+
+
+def _suffix_array(text):
+    """Return the list of starting indexes of the suffixes of text in sorted
+    order, by prefix doubling: sort suffixes by their first character, then
+    by their first 2, 4, 8... characters, using the ranks from the previous
+    round as sort keys, until every rank is distinct.
+    Running time: O(n log n) per round, O(log n) rounds at most, and as
+    many rounds as the longest repeated substring needs in practice.
+    Memory usage: O(n) for the ranks and keys."""
+    size = len(text)
+    alphabet = {char: rank for rank, char in enumerate(sorted(set(text)))}
+    rank = [alphabet[char] for char in text]
+    suffixes = list(range(size))
+    sort(suffixes, key=rank.__getitem__)
+    length = 1
+    while size and rank[suffixes[-1]] < size - 1:
+        # Pair each suffix's rank with the rank length characters later,
+        # 0 past the end so shorter suffixes sort first
+        keys = [first * (size + 1) + second + 1 for first, second
+                in zip(rank, rank[length:])] + \
+               [first * (size + 1) for first in rank[size - length:]]
+        sort(suffixes, key=keys.__getitem__)
+        rank = [0] * size
+        current, previous_key = 0, keys[suffixes[0]]
+        for suffix in suffixes:  # Suffixes with equal keys share a rank
+            key = keys[suffix]
+            if key != previous_key:
+                current += 1
+                previous_key = key
+            rank[suffix] = current
+        length *= 2
+    return suffixes
+
+
+def _lcp_array(text, suffixes):
+    """Return the array of longest common prefix lengths of each suffix and
+    the one before it in sorted order (0 for the first), by Kasai's method:
+    walking suffixes in text order, each LCP is at least one less than the
+    last, so comparisons never go back.
+    Running time: O(n).
+    Memory usage: O(n) for the inverse suffix array."""
+    size = len(text)
+    rank = [0] * size
+    for position, suffix in enumerate(suffixes):
+        rank[suffix] = position
+    lcp = [0] * size
+    common = 0
+    for suffix in range(size):
+        position = rank[suffix]
+        if position == 0:
+            common = 0
+            continue
+        previous = suffixes[position - 1]
+        while (suffix + common < size and previous + common < size and
+               text[suffix + common] == text[previous + common]):
+            common += 1
+        lcp[position] = common
+        if common:
+            common -= 1
+    return lcp
+
+
+class SuffixArray(object):
+    """Index over a fixed text (str or bytes) that answers substring queries
+    without rescanning the text: the starting indexes of all suffixes of the
+    text in sorted order, so the suffixes that start with a pattern form one
+    contiguous range found by binary search. Also keeps the LCP array of
+    common prefix lengths of neighbouring suffixes."""
+
+    def __init__(self, text):
+        """Build the index for text.
+        Running time: O(n log^2 n) worst case, see _suffix_array.
+        Memory usage: O(n) for the suffix and LCP arrays."""
+        self.text = text
+        suffixes = _suffix_array(text)
+        lcp = _lcp_array(text, suffixes)
+        typecode = _typecode(len(text))
+        self.suffixes = array(typecode, suffixes)
+        self.lcp = array(typecode, lcp)
+        self._mmap = None
+
+    def __len__(self):
+        return len(self.text)
+
+    def _range(self, pattern):
+        """Return (start, stop) such that suffixes[start:stop] are the
+        suffixes that start with pattern.
+        Running time: O(m log n) for a pattern of length m.
+        Memory usage: O(m) for the prefix compared at each step."""
+        text, suffixes, length = self.text, self.suffixes, len(pattern)
+        low, high = 0, len(suffixes)
+        while low < high:  # First suffix whose prefix is not below pattern
+            middle = (low + high) // 2
+            suffix = suffixes[middle]
+            if text[suffix:suffix + length] < pattern:
+                low = middle + 1
+            else:
+                high = middle
+        start, high = low, len(suffixes)
+        while low < high:  # First suffix whose prefix is above pattern
+            middle = (low + high) // 2
+            suffix = suffixes[middle]
+            if text[suffix:suffix + length] == pattern:
+                low = middle + 1
+            else:
+                high = middle
+        return start, low
+
+    def contains(self, pattern):
+        """Return True if pattern occurs in the text. O(m log n)."""
+        start, stop = self._range(pattern)
+        return start < stop
+
+    def count(self, pattern):
+        """Return the number of (possibly overlapping) occurrences of pattern
+        in the text. O(m log n)."""
+        start, stop = self._range(pattern)
+        return stop - start
+
+    def find_all_indexes(self, pattern):
+        """Return a sorted list of the starting indexes of all occurrences of
+        pattern in the text. O(m log n + k log k) for k occurrences."""
+        start, stop = self._range(pattern)
+        indexes = self.suffixes[start:stop].tolist()  # array or memoryview
+        sort(indexes)
+        return indexes
+
+    def longest_repeated_substring(self):
+        """Return the longest substring that occurs at least twice in the
+        text, read off the LCP array. O(n)."""
+        if not self.lcp:
+            return self.text[:0]
+        position = max(range(len(self.lcp)), key=self.lcp.__getitem__)
+        suffix = self.suffixes[position]
+        return self.text[suffix:suffix + self.lcp[position]]
+
+    def save(self, path):
+        """Write the index to the file at path, where load can map it."""
+        kind = _STR if isinstance(self.text, str) else _BYTES
+        encoded = self.text.encode('utf-8') if kind == _STR else \
+            bytes(self.text)
+        itemsize = array(_typecode(len(self.text))).itemsize
+        with open(path, 'wb') as index_file:
+            index_file.write(_HEADER.pack(_MAGIC, len(self.text), itemsize,
+                                          kind, len(encoded)))
+            index_file.write(encoded)
+            # Pad so the arrays start at an offset aligned for their items
+            index_file.write(bytes(-index_file.tell() % 8))
+            index_file.write(bytes(self.suffixes))
+            index_file.write(bytes(self.lcp))
+
+    @classmethod
+    def load(cls, path):
+        """Return the index saved at path. The suffix and LCP arrays are
+        memory-mapped, not read, so loading takes O(text) time and memory
+        and the operating system pages the arrays in as queries touch them.
+        Call close, or use the index in a with statement, when done."""
+        with open(path, 'rb') as index_file:
+            mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size, itemsize, kind, encoded_size = \
+            _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC:
+            mapped.close()
+            raise ValueError('{} is not a suffix array file'.format(path))
+        offset = _HEADER.size
+        encoded = mapped[offset:offset + encoded_size]
+        offset += encoded_size
+        offset += -offset % 8
+        index = cls.__new__(cls)
+        index.text = encoded.decode('utf-8') if kind == _STR else encoded
+        typecode = 'i' if itemsize == 4 else 'q'
+        view = memoryview(mapped)
+        index.suffixes = view[offset:offset + size * itemsize].cast(typecode)
+        offset += size * itemsize
+        index.lcp = view[offset:offset + size * itemsize].cast(typecode)
+        view.release()
+        index._mmap = mapped
+        return index
+
+    def close(self):
+        """Unmap the arrays of an index returned by load."""
+        if self._mmap is not None:
+            self.suffixes.release()
+            self.lcp.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+class FMIndex(object):
+    """Compressed index over a fixed text (str or bytes): the Burrows-Wheeler
+    transform of the text, counts of each character at every step-th
+    position of it, and one suffix array entry per sample_rate text
+    positions, instead of a whole suffix array. A pattern is matched
+    backwards one character at a time (backward search), each step
+    narrowing a range of sorted suffixes with two counts."""
+
+    def __init__(self, text, step=64, sample_rate=32):
+        """Build the index for text.
+        Running time: O(n log^2 n) to sort suffixes, then O(n).
+        Memory usage: the transform, O(n * k / step) counts for k distinct
+        characters and O(n / sample_rate) suffix array samples."""
+        self.is_bytes = not isinstance(text, str)
+        if self.is_bytes:
+            text = bytes(text).decode('latin-1')  # One char per byte
+        self.size = len(text)
+        self.step = step
+        # Row 0 is the empty suffix, which sorts before all the others
+        suffixes = [self.size] + _suffix_array(text)
+        # Character before each sorted suffix, the row of the whole text has
+        # none and holds a placeholder that counts ignore
+        self.primary = suffixes.index(0)
+        self.bwt = ''.join(text[suffix - 1] if suffix else text[:1]
+                           for suffix in suffixes)
+        self.first = {}  # Row of the first suffix starting with each char
+        total = 1
+        for char in sorted(set(text)):
+            self.first[char] = total
+            total += text.count(char)
+        self.checkpoints = {}
+        for char in self.first:
+            counts = array(_typecode(len(self.bwt) + 1), [0])
+            for start in range(0, len(self.bwt), step):
+                counts.append(counts[-1] +
+                              self.bwt.count(char, start, start + step))
+            self.checkpoints[char] = counts
+        self.samples = {row: suffix for row, suffix in enumerate(suffixes)
+                        if suffix % sample_rate == 0}
+        self._mmap = None
+
+    def __len__(self):
+        return self.size
+
+    def _occurrences(self, char, row):
+        """Return how many times char occurs in bwt[:row]."""
+        block = row // self.step
+        count = self.checkpoints[char][block] + \
+            self.bwt.count(char, block * self.step, row)
+        if self.primary < row and char == self.bwt[self.primary]:
+            count -= 1  # The placeholder isn't a real character
+        return count
+
+    def _range(self, pattern):
+        """Return (start, stop), the rows of the suffixes that start with
+        pattern, by backward search. O(m * step)."""
+        if self.is_bytes:
+            pattern = bytes(pattern).decode('latin-1')
+        if not pattern:
+            # Every row but 0, the empty suffix, so the empty pattern matches
+            # at every index but the end, like SuffixArray and strings
+            return 1, self.size + 1
+        start, stop = 0, self.size + 1
+        for char in reversed(pattern):
+            first = self.first.get(char)
+            if first is None:
+                return 0, 0
+            start = first + self._occurrences(char, start)
+            stop = first + self._occurrences(char, stop)
+            if start >= stop:
+                return 0, 0
+        return start, stop
+
+    def _locate(self, row):
+        """Return the text index of the suffix in row, stepping back through
+        the text one character at a time until a sampled row is reached."""
+        steps = 0
+        while row not in self.samples:
+            char = self.bwt[row]
+            row = self.first[char] + self._occurrences(char, row)
+            steps += 1
+        return self.samples[row] + steps
+
+    def contains(self, pattern):
+        """Return True if pattern occurs in the text."""
+        start, stop = self._range(pattern)
+        return start < stop
+
+    def count(self, pattern):
+        """Return the number of (possibly overlapping) occurrences of pattern
+        in the text."""
+        start, stop = self._range(pattern)
+        return stop - start
+
+    def find_all_indexes(self, pattern):
+        """Return a sorted list of the starting indexes of all occurrences of
+        pattern in the text. O(m * step + k * sample_rate * step) for k
+        occurrences."""
+        start, stop = self._range(pattern)
+        indexes = [self._locate(row) for row in range(start, stop)]
+        sort(indexes)
+        return indexes
+
+    def save(self, path):
+        """Write the index to the file at path, where load can map it: the
+        transform, then one array of the alphabet's code points, the first
+        rows, the checkpoints of each char and the sample rows and suffixes.
+        """
+        kind = _BYTES if self.is_bytes else _STR
+        encoded = self.bwt.encode('latin-1' if self.is_bytes else 'utf-8')
+        typecode = _typecode(self.size + 2)
+        alphabet = sorted(self.first)
+        rows = sorted(self.samples)
+        with open(path, 'wb') as index_file:
+            index_file.write(_FM_HEADER.pack(
+                _FM_MAGIC, self.size, array(typecode).itemsize, kind,
+                len(encoded), self.step, self.primary, len(alphabet),
+                len(rows)))
+            index_file.write(encoded)
+            # Pad so the arrays start at an offset aligned for their items
+            index_file.write(bytes(-index_file.tell() % 8))
+            index_file.write(bytes(array(typecode, map(ord, alphabet))))
+            index_file.write(bytes(array(typecode, map(self.first.get,
+                                                         alphabet))))
+            for char in alphabet:
+                index_file.write(bytes(array(typecode,
+                                             self.checkpoints[char])))
+            index_file.write(bytes(array(typecode, rows)))
+            index_file.write(bytes(array(typecode, map(self.samples.get,
+                                                         rows))))
+
+    @classmethod
+    def load(cls, path):
+        """Return the index saved at path. The checkpoints, the largest part
+        of the index for small steps, are memory-mapped, not read; loading
+        decodes the transform and rebuilds the samples dict, so it takes
+        O(n + n / sample_rate) time and memory. Call close, or use the index
+        in a with statement, when done."""
+        with open(path, 'rb') as index_file:
+            mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(_FM_MAGIC)] != _FM_MAGIC:
+            mapped.close()
+            raise ValueError('{} is not an FM-index file'.format(path))
+        (magic, size, itemsize, kind, encoded_size, step, primary,
+         alphabet_size, sample_count) = _FM_HEADER.unpack_from(mapped, 0)
+        offset = _FM_HEADER.size
+        encoded = mapped[offset:offset + encoded_size]
+        offset += encoded_size
+        offset += -offset % 8
+        index = cls.__new__(cls)
+        index.is_bytes = kind == _BYTES
+        index.bwt = encoded.decode('latin-1' if index.is_bytes else 'utf-8')
+        index.size, index.step, index.primary = size, step, primary
+        typecode = 'i' if itemsize == 4 else 'q'
+        view = memoryview(mapped)
+
+        def take(count):
+            nonlocal offset
+            items = view[offset:offset + count * itemsize].cast(typecode)
+            offset += count * itemsize
+            return items
+
+        alphabet = [chr(code) for code in take(alphabet_size)]
+        index.first = dict(zip(alphabet, take(alphabet_size)))
+        blocks = len(range(0, len(index.bwt), step)) + 1
+        index.checkpoints = {char: take(blocks) for char in alphabet}
+        rows = take(sample_count)
+        suffixes = take(sample_count)
+        index.samples = dict(zip(rows, suffixes))
+        rows.release()
+        suffixes.release()
+        view.release()
+        index._mmap = mapped
+        return index
+
+    def close(self):
+        """Unmap the checkpoints of an index returned by load."""
+        if self._mmap is not None:
+            for counts in self.checkpoints.values():
+                counts.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+def main():
+    """Read command-line arguments and query a suffix array of a file."""
+    import sys
+    args = sys.argv[1:]  # Ignore script file name
+    if len(args) < 2:
+        script = sys.argv[0]
+        print('Usage: {} file pattern [pattern ...]'.format(script))
+        print('Indexes the text of file once, then counts and locates each')
+        print('pattern in it')
+        print("\nExample: {} strings.py pattern text".format(script))
+        return
+    with open(args[0]) as text_file:
+        index = SuffixArray(text_file.read())
+    for pattern in args[1:]:
+        indexes = index.find_all_indexes(pattern)
+        print('{!r}: {} occurrences {}'.format(pattern, len(indexes),
+                                                indexes[:10]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!python
+
+from suffix_array import SuffixArray, FMIndex
+import os
+import random
+import tempfile
+import unittest
+
+
+def brute_force_indexes(text, pattern):
+    return [index for index in range(len(text) - len(pattern) + 1)
+            if text[index:index + len(pattern)] == pattern]
+
+
+class SuffixArrayTest(unittest.TestCase):
+
+    def test_suffix_and_lcp_arrays(self):
+        index = SuffixArray('banana')
+        assert list(index.suffixes) == [5, 3, 1, 0, 4, 2]
+        assert list(index.lcp) == [0, 1, 3, 0, 0, 2]
+        assert index.longest_repeated_substring() == 'ana'
+        assert SuffixArray('').longest_repeated_substring() == ''
+
+    def test_queries(self):
+        index = SuffixArray('abra cadabra')
+        assert len(index) == 12
+        assert index.contains('cad')
+        assert not index.contains('dab ')
+        assert index.count('abra') == 2
+        assert index.count('a') == 5
+        assert index.count('') == 12
+        assert index.find_all_indexes('abra') == [0, 8]
+        assert index.find_all_indexes('bra') == [1, 9]
+        assert index.find_all_indexes('zebra') == []
+
+    def test_matches_brute_force(self):
+        rng = random.Random(1512)
+        for _ in range(100):
+            text = ''.join(rng.choice('ab') for _ in range(rng.randint(0, 50)))
+            suffixes = SuffixArray(text).suffixes
+            assert list(suffixes) == sorted(range(len(text)),
+                                            key=lambda index: text[index:])
+            index = SuffixArray(text)
+            for pattern in ['a', 'b', 'ab', 'bab', 'aaa', 'abba']:
+                expected = brute_force_indexes(text, pattern)
+                assert index.find_all_indexes(pattern) == expected
+                assert index.count(pattern) == len(expected)
+
+    def test_bytes(self):
+        index = SuffixArray(b'GATTACA GATTACA')
+        assert index.find_all_indexes(b'TTA') == [2, 10]
+        assert index.count(b'A') == 6
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for text in ['abra cadabra ünïcode', b'\x00\xffbytes\x00', '']:
+                path = os.path.join(temp_dir, 'index.sa')
+                saved = SuffixArray(text)
+                saved.save(path)
+                with SuffixArray.load(path) as loaded:
+                    assert loaded.text == text
+                    assert list(loaded.suffixes) == list(saved.suffixes)
+                    assert list(loaded.lcp) == list(saved.lcp)
+                    pattern = text[2:4]
+                    assert loaded.find_all_indexes(pattern) == \
+                        saved.find_all_indexes(pattern)
+
+    def test_load_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'not-an-index')
+            with open(path, 'wb') as other_file:
+                other_file.write(bytes(64))
+            with self.assertRaises(ValueError):
+                SuffixArray.load(path)
+
+
+class FMIndexTest(unittest.TestCase):
+
+    def test_queries(self):
+        index = FMIndex('abra cadabra', step=4, sample_rate=3)
+        assert len(index) == 12
+        assert index.contains('cad')
+        assert not index.contains('dab ')
+        assert not index.contains('z')
+        assert index.count('abra') == 2
+        assert index.find_all_indexes('abra') == [0, 8]
+        assert index.find_all_indexes('a') == [0, 3, 6, 8, 11]
+
+    def test_empty_pattern(self):
+        from strings import find_all_indexes
+        for text in ['abc', 'a', '']:
+            index = FMIndex(text)
+            assert index.find_all_indexes('') == find_all_indexes(text, '')
+            assert index.count('') == len(text)
+            assert index.contains('') == bool(text)
+
+    def test_matches_suffix_array(self):
+        rng = random.Random(1415)
+        for _ in range(100):
+            text = ''.join(rng.choice('abc') for _ in range(rng.randint(1, 80)))
+            fm_index = FMIndex(text, step=8, sample_rate=4)
+            suffix_array = SuffixArray(text)
+            for pattern in ['', 'a', 'c', 'ab', 'cab', 'aaa', 'abca']:
+                assert fm_index.find_all_indexes(pattern) == \
+                    suffix_array.find_all_indexes(pattern)
+                assert fm_index.count(pattern) == suffix_array.count(pattern)
+
+    def test_bytes(self):
+        index = FMIndex(b'GATTACA GATTACA\xff')
+        assert index.find_all_indexes(b'TTA') == [2, 10]
+        assert index.count(b'\xff') == 1
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for text in ['abra cadabra ünïcode', b'\x00\xffbytes\x00', 'a',
+                         '']:
+                path = os.path.join(temp_dir, 'index.fm')
+                saved = FMIndex(text, step=4, sample_rate=3)
+                saved.save(path)
+                with FMIndex.load(path) as loaded:
+                    assert len(loaded) == len(text)
+                    assert loaded.bwt == saved.bwt
+                    assert loaded.first == saved.first
+                    assert loaded.samples == saved.samples
+                    for char, counts in saved.checkpoints.items():
+                        assert list(loaded.checkpoints[char]) == list(counts)
+                    for pattern in [text[2:4], text[:1], text[-3:], text[:0]]:
+                        assert loaded.find_all_indexes(pattern) == \
+                            saved.find_all_indexes(pattern)
+
+    def test_load_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'index.sa')
+            SuffixArray('abc').save(path)
+            with self.assertRaises(ValueError):
+                FMIndex.load(path)
+
+
+if __name__ == '__main__':
+    unittest.main()